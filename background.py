@@ -0,0 +1,41 @@
+import threading
+
+
+class BackgroundJob:
+    """
+    Work that runs on a daemon thread of its own, so the caller never waits on it.
+
+    start(*args) runs `_run(*args)` on a new thread named THREAD_NAME, cancel() sets
+    `_cancelled` for `_run` to poll, and wait() joins the thread. Callbacks a subclass makes
+    from `_run` come from that thread.
+    """
+
+    THREAD_NAME = "background"
+
+    def __init__(self):
+        self._cancelled = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def start(self, *args):
+        self._cancelled.clear()
+        self._thread = threading.Thread(target=self._run, args=args, name=self.THREAD_NAME, daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def wait(self, timeout=None):
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _run(self, *args):
+        raise NotImplementedError
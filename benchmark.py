@@ -0,0 +1,347 @@
+"""
+Headless benchmarks for the launcher's hot paths.
+
+    QT_QPA_PLATFORM=offscreen python benchmark.py [--sizes 100 1000 10000] [--output results.json]
+    python benchmark.py --compare baseline.json results.json [--threshold 0.2]
+
+Every scenario (catalog size, with or without icon files, widget grid or virtualized view)
+runs in its own process, on a synthetic catalog written to a temporary folder, so memory
+high-water marks are per scenario and the user's settings and caches are never touched.
+Launching is timed up to the dispatch to the launch engine; no process is actually started.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+DEFAULT_SIZES = (100, 1000, 10000)
+# One widget per entry, or the virtualized view painting from the icon atlas; pinned per
+# scenario so "auto" never switches between them from one catalog size to the next
+VIEW_MODES = ("grid", "virtual")
+# Catalogs larger than this are not run with one widget per entry ("auto" switches at 500)
+GRID_MAX_SIZE = 1000
+QUERY = "applicat"
+
+
+def max_rss_kb():
+    """The process's memory high-water mark in KiB, if the platform reports it."""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux KiB
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+def summarize(samples):
+    return {
+        "runs": len(samples),
+        "min": round(min(samples), 3),
+        "median": round(statistics.median(samples), 3),
+        "mean": round(statistics.mean(samples), 3),
+        "max": round(max(samples), 3),
+    }
+
+
+def make_catalog(directory, size, with_icons):
+    """Write `size` executable stubs (and icons) under `directory`; returns the app entries."""
+    from PyQt5.QtGui import QColor, QImage
+
+    bin_dir = os.path.join(directory, "bin")
+    icon_dir = os.path.join(directory, "icons")
+    os.makedirs(bin_dir)
+    os.makedirs(icon_dir)
+    apps = []
+    for i in range(size):
+        command = os.path.join(bin_dir, f"app{i}")
+        with open(command, "w") as f:
+            f.write("#!/bin/sh\n")
+        os.chmod(command, 0o755)
+        icon = ""
+        if with_icons:
+            icon = os.path.join(icon_dir, f"app{i}.png")
+            image = QImage(128, 128, QImage.Format_ARGB32)
+            image.fill(QColor.fromHsv(i * 37 % 360, 200, 220))
+            image.save(icon, "PNG")
+        apps.append({"name": f"Application {i} {['Editor', 'Game', 'Tool', 'Viewer'][i % 4]}",
+                     "command": command, "icon": icon, "tags": [f"group{i % 10}"]})
+    return apps
+
+
+class NullLaunchEngine:
+    """Stands in for the launch engine: records the dispatch, starts nothing."""
+
+    def __init__(self):
+        self.launched = 0
+
+    def launch(self, app_info, executable, on_spawned=None, on_exited=None):
+        self.launched += 1
+
+
+def run_scenario(size, with_icons, view_mode, repeat):
+    """Time the hot paths on one synthetic catalog shown in `view_mode`; runs in a fresh process."""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    work_dir = tempfile.mkdtemp(prefix="flexilaunch-bench-")
+    # The icon atlas and glyphs go to a throwaway cache
+    os.environ["XDG_CACHE_HOME"] = os.path.join(work_dir, "cache")
+
+    from PyQt5.QtWidgets import QApplication
+    from PyQt5.QtCore import QThreadPool
+
+    qt_app = QApplication.instance() or QApplication([])
+    import main
+    import icons
+
+    timings = {}
+    memory = {"baseline": max_rss_kb()}
+
+    def measure(phase, action, runs=repeat):
+        samples = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            action()
+            samples.append((time.perf_counter() - start) * 1000)
+        timings[phase] = summarize(samples)
+        memory[phase] = max_rss_kb()
+
+    def settle():
+        # Let queued work (search threads, populate batches, icon loads) reach the GUI thread
+        while QThreadPool.globalInstance().activeThreadCount():
+            qt_app.processEvents()
+        qt_app.processEvents()
+
+    settings_file = os.path.join(work_dir, "settings.json")
+    with open(settings_file, "w") as f:
+        json.dump({"theme": "light", "view_mode": view_mode, "apps": make_catalog(work_dir, size, with_icons)}, f)
+    memory["catalog"] = max_rss_kb()
+
+    windows = []
+    measure("construct", lambda: windows.append(main.AppLauncher(settings_file)), runs=1)
+    window = windows[0]
+
+    def first_paint():
+        window.show()
+        while window._populate_count is not None:
+            qt_app.processEvents()
+        window.repaint()
+
+    measure("first_paint", first_paint, runs=1)
+
+    measure("load_settings", window.load_settings)
+
+    def save_settings():
+        window.save_settings()
+        window.write_settings()
+        window.settings_store.flush()
+
+    measure("save_settings", save_settings)
+
+    apps = window.ordered_apps()
+
+    def display_icons_cold():
+        window.clear_icon_widgets()
+        window.display_icons(apps)
+
+    measure("display_icons", display_icons_cold)
+    measure("display_icons_warm", lambda: window.display_icons(apps))
+
+    # Every icon decoded (or read from the atlas) and shown
+    loader = window.icon_loader
+    while loader.atlas is None or loader._pending:
+        qt_app.processEvents()
+    window.repaint()
+    memory["icons"] = max_rss_kb()
+    icon_memory = icons.icon_memory_report()
+    icon_memory["bytes_per_entry"] = round(icon_memory["total_bytes"] / size)
+
+    samples = []
+    for _ in range(repeat):
+        for end in list(range(1, len(QUERY) + 1)) + [0]:
+            window.search_bar.blockSignals(True)
+            window.search_bar.setText(QUERY[:end])
+            window.search_bar.blockSignals(False)
+            start = time.perf_counter()
+            window.filter_icons()
+            settle()
+            samples.append((time.perf_counter() - start) * 1000)
+    timings["filter_keystroke"] = summarize(samples)
+    memory["filter_keystroke"] = max_rss_kb()
+
+    def apply_theme():
+        window.current_theme = "dark" if window.current_theme == "light" else "light"
+        window.apply_theme()
+        qt_app.processEvents()
+
+    measure("apply_theme", apply_theme)
+
+    window.launch_engine = NullLaunchEngine()
+    targets = iter(apps * (repeat // len(apps) + 1))
+    measure("launch_dispatch", lambda: window.launch_application(next(targets)))
+
+    window.save_timer.stop()
+    window.settings_store.close()
+    window.close()
+    return {
+        "catalog": size,
+        "icons": with_icons,
+        "view_mode": view_mode,
+        "timings_ms": timings,
+        "max_rss_kb": memory,
+        "icon_memory": icon_memory,
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "describe", "--always", "--dirty"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def scenario_label(result):
+    return f"{result['catalog']} apps, {'with' if result['icons'] else 'without'} icons, {result['view_mode']} view"
+
+
+def add_rss_per_entry(results):
+    """
+    Set the "rss_kb_per_entry" of every result to the growth of the memory high-water mark
+    per entry between the next smaller catalog in the same view mode (with or without icons
+    alike) and its own, so the fixed cost of Qt and the interpreter cancels out; None for the
+    smallest catalog.
+    """
+    previous = {}
+    for result in sorted(results, key=lambda r: r["catalog"]):
+        group = (result["view_mode"], result["icons"])
+        before = previous.get(group)
+        rss, slope = result["max_rss_kb"]["icons"], None
+        if before is not None and rss is not None and before["max_rss_kb"]["icons"] is not None:
+            slope = round((rss - before["max_rss_kb"]["icons"]) / (result["catalog"] - before["catalog"]), 2)
+        result["rss_kb_per_entry"] = slope
+        previous[group] = result
+
+
+def rss_per_entry_by_mode(results):
+    """
+    {view mode: {"icons": KiB, "no_icons": KiB}}: the least-squares slope of the memory
+    high-water mark over the catalog sizes run in that mode; None with fewer than two sizes.
+    """
+    points = {}
+    for result in results:
+        if result["max_rss_kb"]["icons"] is not None:
+            points.setdefault((result["view_mode"], result["icons"]), []).append(
+                (result["catalog"], result["max_rss_kb"]["icons"]))
+    slopes = {}
+    for (view_mode, with_icons), group in points.items():
+        mean_size = statistics.mean(size for size, _ in group)
+        mean_rss = statistics.mean(rss for _, rss in group)
+        spread = sum((size - mean_size) ** 2 for size, _ in group)
+        slope = None
+        if len(group) > 1 and spread:
+            slope = round(sum((size - mean_size) * (rss - mean_rss) for size, rss in group) / spread, 2)
+        slopes.setdefault(view_mode, {})["icons" if with_icons else "no_icons"] = slope
+    return slopes
+
+
+def run_suite(sizes, repeat, view_modes=VIEW_MODES):
+    results = []
+    for view_mode in view_modes:
+        for size in sizes:
+            if view_mode == "grid" and size > GRID_MAX_SIZE:
+                continue
+            for with_icons in (False, True):
+                label = scenario_label({"catalog": size, "icons": with_icons, "view_mode": view_mode})
+                print(f"Running {label}...", file=sys.stderr)
+                process = subprocess.run(
+                    [sys.executable, os.path.abspath(__file__), "--scenario", str(size), str(int(with_icons)),
+                     "--view-modes", view_mode, "--repeat", str(repeat)],
+                    capture_output=True, text=True, env=dict(os.environ, QT_QPA_PLATFORM="offscreen"))
+                if process.returncode != 0:
+                    print(process.stderr, file=sys.stderr)
+                    raise SystemExit(f"{label} failed")
+                results.append(json.loads(process.stdout.strip().splitlines()[-1]))
+    add_rss_per_entry(results)
+    per_entry = rss_per_entry_by_mode(results)
+    for view_mode, slopes in per_entry.items():
+        for key, slope in slopes.items():
+            if slope is not None:
+                print(f"Memory per entry, {view_mode} view, {'with' if key == 'icons' else 'without'} icons: "
+                      f"{slope} KiB", file=sys.stderr)
+    from PyQt5.QtCore import QT_VERSION_STR
+    return {
+        "revision": git_revision(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "qt": QT_VERSION_STR,
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "rss_kb_per_entry": per_entry,
+        "results": results,
+    }
+
+
+def compare(baseline_path, current_path, threshold):
+    """Print the median of every timing against the baseline; returns the regressions."""
+    with open(baseline_path) as f:
+        # Results from before view modes were pinned ran in "auto"
+        baseline = {(r["catalog"], r["icons"], r.get("view_mode", "auto")): r for r in json.load(f)["results"]}
+    with open(current_path) as f:
+        current = json.load(f)["results"]
+    regressions = []
+    for result in current:
+        base = baseline.get((result["catalog"], result["icons"], result.get("view_mode", "auto")))
+        if base is None:
+            continue
+        label = scenario_label(dict(result, view_mode=result.get("view_mode", "auto")))
+        print(label)
+        for phase, timing in result["timings_ms"].items():
+            before = base["timings_ms"].get(phase)
+            if before is None:
+                continue
+            ratio = timing["median"] / before["median"] if before["median"] else 1.0
+            flag = ""
+            if ratio > 1 + threshold:
+                flag = "  REGRESSION"
+                regressions.append((label, phase, ratio))
+            print(f"  {phase:<20}{before['median']:10.2f}{timing['median']:10.2f} ms  x{ratio:.2f}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark FlexiLaunch's hot paths headlessly")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="catalog sizes to run")
+    parser.add_argument("--view-modes", nargs="+", choices=VIEW_MODES, default=VIEW_MODES,
+                        help=f"views to run every catalog in (grid only up to {GRID_MAX_SIZE} apps)")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per timed path")
+    parser.add_argument("--output", default="benchmark-results.json", help="where to save the results")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"),
+                        help="compare two result files instead of running")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="slowdown of a median (0.2 = 20%%) reported as a regression by --compare")
+    parser.add_argument("--scenario", nargs=2, type=int, metavar=("SIZE", "ICONS"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.scenario:
+        print(json.dumps(run_scenario(args.scenario[0], bool(args.scenario[1]), args.view_modes[0], args.repeat)))
+        return 0
+    if args.compare:
+        return 1 if compare(*args.compare, args.threshold) else 0
+    results = run_suite(args.sizes, args.repeat, args.view_modes)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=4)
+    print(f"Results saved to {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,234 @@
+import os
+
+
+_MISSING = object()
+
+
+def command_key(command):
+    """Normalized form of a command, used to spot entries that point at the same target."""
+    if not command:
+        return ""
+    return os.path.normcase(os.path.abspath(os.path.expanduser(command)))
+
+
+class AppRecord:
+    """
+    One catalog entry, with a stable id.
+
+    The common fields live in slots; anything else an entry carries (launch stats, desktop
+    id...) goes in `extra`. Records read like the dicts stored in settings.json (get, [],
+    in, items...), and two records are only ever equal if they are the same record.
+    """
+
+    FIELDS = ("name", "command", "icon", "tags", "args", "cwd", "env")
+    __slots__ = ("id",) + FIELDS + ("extra",)
+
+    def __init__(self, record_id, values=()):
+        self.id = record_id
+        for field in self.FIELDS:
+            setattr(self, field, _MISSING)
+        self.extra = None
+        for key, value in dict(values).items():
+            if key != "id":
+                self[key] = value
+
+    def __repr__(self):
+        return f"AppRecord({self.id}, {self.get('name')!r})"
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        if key in self.FIELDS:
+            setattr(self, key, value)
+        elif key == "id":
+            raise KeyError("the id of a record cannot change")
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def get(self, key, default=None):
+        if key in self.FIELDS:
+            value = getattr(self, key)
+            return default if value is _MISSING else value
+        if key == "id":
+            return self.id
+        return self.extra.get(key, default) if self.extra else default
+
+    def pop(self, key, default=None):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            return default
+        if key in self.FIELDS:
+            setattr(self, key, _MISSING)
+        else:
+            del self.extra[key]
+        return value
+
+    def items(self):
+        yield "id", self.id
+        for field in self.FIELDS:
+            value = getattr(self, field)
+            if value is not _MISSING:
+                yield field, value
+        if self.extra:
+            yield from self.extra.items()
+
+    def keys(self):
+        return [key for key, _ in self.items()]
+
+    def to_dict(self):
+        return dict(self.items())
+
+
+class Catalog:
+    """
+    The apps of one launcher instance, in display order.
+
+    Records are indexed by id (insertion ordered), by normalized command and by lowercased
+    name, so lookups, edits and removals never scan the list. Listeners registered with
+    `subscribe` are called as `listener(event, records)` after every change, with event one
+    of "reset", "added", "updated" and "removed".
+    """
+
+    def __init__(self):
+        self._records = {}  # id -> AppRecord, in display order
+        self._by_command = {}  # command_key -> {id: record}
+        self._by_name = {}  # lowercased name -> {id: record}
+        self._next_id = 1
+        self._listeners = []
+
+    def __len__(self):
+        return len(self._records)
+
+    def __iter__(self):
+        return iter(list(self._records.values()))
+
+    def __contains__(self, record):
+        record_id = getattr(record, "id", record)
+        return self._records.get(record_id) is not None
+
+    def subscribe(self, listener):
+        self._listeners.append(listener)
+
+    def _notify(self, event, records):
+        for listener in self._listeners:
+            listener(event, records)
+
+    def records(self):
+        return list(self._records.values())
+
+    @property
+    def next_id(self):
+        """The id the next added entry gets; saved as "next_id" so ids of removed entries are never reused."""
+        return self._next_id
+
+    def get(self, record_id):
+        return self._records.get(record_id)
+
+    def by_command(self, command):
+        return list(self._by_command.get(command_key(command), {}).values())
+
+    def by_name(self, name):
+        return list(self._by_name.get((name or "").strip().lower(), {}).values())
+
+    def command_keys(self):
+        return set(self._by_command)
+
+    def find(self, name, search_index=None, boost=None):
+        """The entry `name` designates: an id, else an exact (case-insensitive) name, else the best search match."""
+        if name.strip().isdigit() and int(name) in self._records:
+            return self._records[int(name)]
+        exact = self.by_name(name)
+        if exact:
+            return exact[0]
+        if search_index is None:
+            return None
+        results = search_index.search(name, boost=boost)
+        return results[0] if results else None
+
+    def load(self, apps, next_id=1):
+        """
+        Replace the whole catalog with `apps` (dicts from settings.json) and `next_id` (the
+        saved next_id, so the ids of entries removed since are not handed out again).
+
+        Entries saved before records had ids get one here; returns True when that happened,
+        so the caller can write the ids back.
+        """
+        self._records.clear()
+        self._by_command.clear()
+        self._by_name.clear()
+        used = {app["id"] for app in apps if isinstance(app.get("id"), int)}
+        self._next_id = max(used, default=0) + 1
+        if isinstance(next_id, int):
+            self._next_id = max(self._next_id, next_id)
+        migrated = False
+        for app in apps:
+            record_id = app.get("id")
+            if not isinstance(record_id, int) or record_id in self._records:
+                record_id = self._new_id()
+                migrated = True
+            self._insert(AppRecord(record_id, app))
+        self._notify("reset", self.records())
+        return migrated
+
+    def add(self, app):
+        return self.extend([app])[0]
+
+    def extend(self, apps):
+        records = [self._insert(AppRecord(self._new_id(), app)) for app in apps]
+        if records:
+            self._notify("added", records)
+        return records
+
+    def update(self, record, values, clear=()):
+        """Set `values` on `record` in place, dropping the keys of `clear` that `values` leaves out."""
+        self._unindex(record)
+        for key in clear:
+            if key not in values:
+                record.pop(key)
+        for key, value in values.items():
+            if key != "id":
+                record[key] = value
+        self._index(record)
+        self._notify("updated", [record])
+
+    def remove(self, records):
+        removed = []
+        for record in records:
+            if self._records.pop(record.id, None) is not None:
+                self._unindex(record)
+                removed.append(record)
+        if removed:
+            self._notify("removed", removed)
+        return removed
+
+    def _new_id(self):
+        record_id = self._next_id
+        self._next_id += 1
+        return record_id
+
+    def _insert(self, record):
+        self._records[record.id] = record
+        self._index(record)
+        return record
+
+    def _index(self, record):
+        self._by_command.setdefault(command_key(record.get("command")), {})[record.id] = record
+        self._by_name.setdefault((record.get("name") or "").strip().lower(), {})[record.id] = record
+
+    def _unindex(self, record):
+        for index, key in ((self._by_command, command_key(record.get("command"))),
+                           (self._by_name, (record.get("name") or "").strip().lower())):
+            group = index.get(key)
+            if group is not None:
+                group.pop(record.id, None)
+                if not group:
+                    del index[key]
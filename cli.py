@@ -0,0 +1,201 @@
+"""
+Headless commands: list, search, launch and import without starting the GUI.
+
+    python main.py --list [--json]
+    python main.py --search QUERY [--json]
+    python main.py --launch NAME_OR_ID [--json]
+    python main.py --group NAME [--json]
+    python main.py --import PATH [--import PATH...] [--json]
+
+They read and write the same settings file as the launcher instance they address (--instance),
+and match and launch through the same code: catalog ids and names, the search index with the
+frecency boost, classify_command and the launch engine. Nothing here imports Qt, so a command
+costs little more than the interpreter's start-up.
+"""
+import json
+import sys
+
+import ipc
+from catalog import Catalog
+from frecency import FrecencyTracker
+from health import check_command
+from importer import BulkImporter
+from launch_groups import GroupLaunch, find_group, load_groups
+from launch_engine import LaunchEngine, LaunchResult, launch_target, record_launch
+from persistence import SettingsStore, instance_settings_file, snapshot_app
+from search import SearchIndex, matching_keys
+
+
+def frecency_key(app_info):
+    return app_info.get("command", "")
+
+
+def app_summary(app_info):
+    return {"id": app_info.id, "name": app_info.get("name", ""), "command": app_info.get("command", ""),
+            "icon": app_info.get("icon", ""), "tags": list(app_info.get("tags") or ())}
+
+
+class HeadlessLauncher:
+    """The catalog, frecency and settings of one launcher instance, without any window."""
+
+    def __init__(self, settings_file):
+        self.settings_store = SettingsStore(settings_file)
+        self.settings = self.settings_store.load() or {}
+        self.settings_store.journal = self.settings.get("settings_journal", False)
+        self.settings_store.snapshot = self.settings.get("catalog_snapshot", False)
+        self.catalog = Catalog()
+        self.frecency = FrecencyTracker()
+        self.frecency.load(self.settings.get("frecency"))
+        # Ids a migration assigns are the same on every load: they are written along with the
+        # next change, never by a read-only command
+        self.catalog.load(self.settings.get("apps", []), self.settings.get("next_id", 1))
+        self.dirty = False
+        self.launch_groups = load_groups(self.settings.get("launch_groups"))
+        self._search_index = None
+
+    @property
+    def search_index(self):
+        if self._search_index is None:
+            self._search_index = SearchIndex()
+            keys = self.settings_store.take_search_keys()
+            for app_info in self.catalog:
+                self._search_index.add(app_info.id, app_info, app_info.get("name", ""), app_info.get("command", ""),
+                                       app_info.get("tags", ()),
+                                       matching_keys(keys.get(app_info.id), app_info.get("name"),
+                                                     app_info.get("command"), app_info.get("tags")))
+        return self._search_index
+
+    def search_boosts(self):
+        boosts = {}
+        for key, points in self.frecency.boosts().items():
+            for app_info in self.catalog.by_command(key):
+                if frecency_key(app_info) == key:
+                    boosts[app_info.id] = points
+        return boosts
+
+    def ordered_apps(self):
+        if self.settings.get("sort_mode", "manual") == "frecency":
+            return self.frecency.ordered(self.catalog.records(), frecency_key)
+        return self.catalog.records()
+
+    def search(self, query):
+        results = self.search_index.search(query, boost=self.search_boosts())
+        return self.ordered_apps() if results is None else results
+
+    def find_application(self, name):
+        return self.catalog.find(name, self.search_index, self.search_boosts())
+
+    def launch_application(self, app_info):
+        """Launch like the launcher window does; returns the LaunchResult."""
+        status = check_command(app_info.get("command"))
+        if not status.ok:
+            # Missing targets are refused, not handed to the desktop
+            return LaunchResult(False, 0.0, error=status.error)
+        self.frecency.record(frecency_key(app_info))
+        result = launch_target(app_info, LaunchEngine(max_workers=1))
+        record_launch(app_info, result)
+        self.dirty = True
+        return result
+
+    def launch_group(self, group):
+        """Start the members of `group` and wait until all have; returns the (app_info, result) pairs."""
+        apps = [app_info for app_info in map(self.catalog.get, group.members) if app_info is not None]
+        refused = {}
+        for app_info in apps:
+            status = check_command(app_info.get("command"))
+            if status.ok:
+                self.frecency.record(frecency_key(app_info))
+            else:
+                refused[app_info.id] = LaunchResult(False, 0.0, error=status.error)
+        runnable = [app_info for app_info in apps if app_info.id not in refused]
+        engine = LaunchEngine(max_workers=1)
+        run = GroupLaunch(group, runnable, lambda app_info: launch_target(app_info, engine))
+        run.start()
+        run.wait()
+        results = dict(refused)
+        for app_info, result in zip(runnable, run.results):
+            if result is not None:
+                record_launch(app_info, result)
+                results[app_info.id] = result
+        self.dirty = True
+        # In the group's order, the refused members with the others
+        return [(app_info, results[app_info.id]) for app_info in apps if app_info.id in results]
+
+    def import_paths(self, paths):
+        """Import files and folders into the catalog; returns (imported records, skipped count)."""
+        batches = []
+        importer = BulkImporter(self.catalog.command_keys(), lambda apps: batches.append(list(apps)))
+        importer.start(paths)
+        importer.wait()
+        records = self.catalog.extend([app for batch in batches for app in batch])
+        if records:
+            self.dirty = True
+        return records, importer.skipped
+
+    def save(self):
+        """
+        Write the settings back, with everything that was not touched left as loaded; returns
+        the OSError if writing them failed.
+        """
+        if self.dirty:
+            self.settings_store.save(dict(self.settings, apps=[snapshot_app(app) for app in self.catalog],
+                                          next_id=self.catalog.next_id, frecency=self.frecency.to_dict()))
+            self.dirty = False
+        return self.settings_store.flush()
+
+
+def emit(args, data, lines):
+    if args.json:
+        print(json.dumps(data, indent=2))
+    else:
+        for line in lines:
+            print(line)
+
+
+def run(args):
+    """Run the headless command `args` asks for; returns the exit code."""
+    instance = (args.instance or ["default"])[0]
+    launcher = HeadlessLauncher(instance_settings_file(instance))
+    try:
+        if args.launch:
+            app_info = launcher.find_application(args.launch)
+            if app_info is None:
+                print(f"error no application matches {args.launch!r}", file=sys.stderr)
+                return 1
+            result = launcher.launch_application(app_info)
+            emit(args, dict(app_summary(app_info), ok=result.ok, pid=result.pid, error=result.error,
+                            spawn_ms=round(result.spawn_ms, 1)),
+                 [f"ok {app_info['name']}" if result.ok else f"error {app_info['name']}: {result.error}"])
+            return 0 if result.ok else 1
+        if args.group:
+            group = find_group(launcher.launch_groups, args.group)
+            if group is None:
+                print(f"error no launch group named {args.group!r}", file=sys.stderr)
+                return 1
+            results = launcher.launch_group(group)
+            emit(args, {"group": group.name,
+                        "members": [dict(app_summary(app_info), ok=result.ok, pid=result.pid, error=result.error,
+                                         spawn_ms=round(result.spawn_ms, 1)) for app_info, result in results]},
+                 [f"ok {app_info['name']}" if result.ok else f"error {app_info['name']}: {result.error}"
+                  for app_info, result in results])
+            return 0 if all(result.ok for _, result in results) else 1
+        if args.import_paths:
+            records, skipped = launcher.import_paths(args.import_paths)
+            error = launcher.save()
+            if error is not None:
+                reason = getattr(error, "strerror", None) or error
+                print(f"error could not save {launcher.settings_store.path}: {reason}", file=sys.stderr)
+                return 1
+            if records:
+                # A running launcher would otherwise write its older catalog over the new entries
+                ipc.send_command(f"@{instance} reload")
+            emit(args, {"imported": [app_summary(app) for app in records], "skipped": skipped},
+                 [f"{app.id}\t{app.get('name', '')}" for app in records]
+                 + [f"{len(records)} imported, {skipped} skipped"])
+            return 0
+        apps = launcher.search(args.search) if args.search is not None else launcher.ordered_apps()
+        emit(args, [app_summary(app) for app in apps],
+             [f"{app.id}\t{app.get('name', '')}\t{app.get('command', '')}" for app in apps])
+        return 0
+    finally:
+        launcher.save()
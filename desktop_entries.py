@@ -0,0 +1,323 @@
+import json
+import os
+import re
+import shlex
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+from persistence import write_atomic
+
+
+ICON_EXTENSIONS = (".png", ".svg", ".xpm")
+ICON_SIZE = 64
+FIELD_CODE = re.compile(r"%[fFuUdDnNickvm]")
+FIELD_CODE_OR_PERCENT = re.compile(r"%%|%[fFuUdDnNickvm]")
+SIZE_PATTERN = re.compile(r"^(\d+)(?:x\d+)?(?:@\d+)?$")
+ESCAPES = {"s": " ", "n": "\n", "t": "\t", "r": "\r", "\\": "\\"}
+
+
+def data_dirs():
+    """XDG data directories, most important first."""
+    home = os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")
+    system = os.environ.get("XDG_DATA_DIRS") or "/usr/local/share:/usr/share"
+    dirs = []
+    for directory in [home] + system.split(":"):
+        if directory and directory not in dirs:
+            dirs.append(directory)
+    return dirs
+
+
+def application_dirs():
+    return [os.path.join(directory, "applications") for directory in data_dirs()]
+
+
+def icon_base_dirs():
+    dirs = [os.path.expanduser("~/.icons")]
+    dirs += [os.path.join(directory, "icons") for directory in data_dirs()]
+    return dirs
+
+
+def pixmap_dirs():
+    return [os.path.join(directory, "pixmaps") for directory in data_dirs()]
+
+
+def locale_suffixes():
+    """["[it_IT]", "[it]", ""] for LANG=it_IT.UTF-8: localized keys to try, best first."""
+    lang = os.environ.get("LC_ALL") or os.environ.get("LC_MESSAGES") or os.environ.get("LANG") or ""
+    lang = lang.split(".")[0].split("@")[0]
+    suffixes = []
+    if lang and lang not in ("C", "POSIX"):
+        suffixes.append(f"[{lang}]")
+        if "_" in lang:
+            suffixes.append(f"[{lang.split('_')[0]}]")
+    suffixes.append("")
+    return suffixes
+
+
+def unescape(value):
+    return re.sub(r"\\(.)", lambda match: ESCAPES.get(match.group(1), match.group(0)), value)
+
+
+def read_desktop_section(path, section="[Desktop Entry]"):
+    """Key/value pairs of one section of a .desktop (or index.theme) file."""
+    values = {}
+    inside = False
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if line.startswith("["):
+                if inside:
+                    break
+                inside = line == section
+            elif inside and "=" in line:
+                key, value = line.split("=", 1)
+                values[key.strip()] = value.strip()
+    return values
+
+
+def exec_argv(exec_line, name="", path=""):
+    """Split an Exec line into argv, expanding or dropping the field codes."""
+    try:
+        tokens = shlex.split(exec_line)
+    except ValueError:
+        return []
+    argv = []
+    for token in tokens:
+        if FIELD_CODE.fullmatch(token):
+            # Files and URLs are passed by the caller, the launcher never has any
+            if token == "%c" and name:
+                argv.append(name)
+            elif token == "%k" and path:
+                argv.append(path)
+            continue
+        token = FIELD_CODE_OR_PERCENT.sub(lambda match: "%" if match.group(0) == "%%" else "", token)
+        if token:
+            argv.append(token)
+    return argv
+
+
+def parse_desktop_file(path, suffixes=None):
+    """
+    Turn a .desktop file into an app entry (name, command, args, cwd, tags and the icon
+    *name*), or None when it must not be shown.
+    """
+    values = read_desktop_section(path)
+    if values.get("Type", "Application") != "Application":
+        return None
+    if values.get("NoDisplay") == "true" or values.get("Hidden") == "true":
+        return None
+    try_exec = values.get("TryExec")
+    if try_exec and not shutil.which(os.path.expanduser(try_exec)):
+        return None
+
+    def localized(key):
+        for suffix in suffixes or locale_suffixes():
+            if key + suffix in values:
+                return unescape(values[key + suffix])
+        return ""
+
+    name = localized("Name")
+    argv = exec_argv(unescape(values.get("Exec", "")), name, path)
+    if not name or not argv:
+        return None
+    entry = {"name": name, "command": argv[0], "icon": values.get("Icon", "")}
+    if len(argv) > 1:
+        entry["args"] = argv[1:]
+    if values.get("Path"):
+        entry["cwd"] = values["Path"]
+    tags = [tag for tag in localized("Keywords").split(";") if tag]
+    generic_name = localized("GenericName")
+    if generic_name:
+        tags.append(generic_name)
+    if tags:
+        entry["tags"] = tags
+    return entry
+
+
+def list_desktop_files(dirs=None):
+    """
+    {desktop file id: path} of every .desktop file in the application directories. An id
+    found in more than one directory resolves to the first one, as the spec says.
+    """
+    files = {}
+    for root in dirs or application_dirs():
+        for directory, subdirs, names in os.walk(root):
+            subdirs.sort()
+            for name in names:
+                if not name.endswith(".desktop"):
+                    continue
+                path = os.path.join(directory, name)
+                desktop_id = os.path.relpath(path, root).replace(os.sep, "-")
+                files.setdefault(desktop_id, path)
+    return files
+
+
+def icon_score(relative_dir, size):
+    """Lower is better: app icons first, then the size closest to `size`, larger beats smaller."""
+    parts = relative_dir.split(os.sep)
+    penalty = 0 if "apps" in parts else 1000
+    for part in parts:
+        if part == "scalable":
+            return penalty + 1
+        match = SIZE_PATTERN.match(part)
+        if match:
+            found = int(match.group(1))
+            return penalty + (found - size if found >= size else 2 * (size - found))
+    return penalty + 500
+
+
+class IconResolver:
+    """
+    Resolves freedesktop icon names to files, following the theme's Inherits chain and
+    ending with hicolor and the pixmaps folders. Each theme is indexed once, on first use.
+    """
+
+    def __init__(self, theme=None, size=ICON_SIZE):
+        self.theme = theme or "hicolor"
+        self.size = size
+        self._themes = {}  # theme -> {icon name: (score, path)}
+
+    def resolve(self, name):
+        if not name:
+            return ""
+        if os.path.isabs(name):
+            return name if os.path.isfile(name) else ""
+        queue, seen = [self.theme], set()
+        while queue:
+            theme = queue.pop(0)
+            if theme in seen:
+                continue
+            seen.add(theme)
+            icons, inherits = self._theme_icons(theme)
+            if name in icons:
+                return icons[name][1]
+            queue.extend(inherits)
+            if not queue and "hicolor" not in seen:
+                queue.append("hicolor")
+        for directory in pixmap_dirs():
+            for extension in ICON_EXTENSIONS:
+                candidate = os.path.join(directory, name + extension)
+                if os.path.isfile(candidate):
+                    return candidate
+        return ""
+
+    def _theme_icons(self, theme):
+        cached = self._themes.get(theme)
+        if cached is not None:
+            return cached
+        icons, inherits = {}, []
+        for base in icon_base_dirs():
+            theme_dir = os.path.join(base, theme)
+            if not os.path.isdir(theme_dir):
+                continue
+            index = os.path.join(theme_dir, "index.theme")
+            if not inherits and os.path.isfile(index):
+                try:
+                    inherited = read_desktop_section(index, "[Icon Theme]").get("Inherits", "")
+                except OSError:
+                    inherited = ""
+                inherits = [item.strip() for item in inherited.split(",") if item.strip()]
+            for directory, _, names in os.walk(theme_dir):
+                score = icon_score(os.path.relpath(directory, theme_dir), self.size)
+                for file_name in names:
+                    stem, extension = os.path.splitext(file_name)
+                    if extension not in ICON_EXTENSIONS:
+                        continue
+                    if stem not in icons or score < icons[stem][0]:
+                        icons[stem] = (score, os.path.join(directory, file_name))
+        self._themes[theme] = cached = (icons, inherits)
+        return cached
+
+
+class DesktopIndex:
+    """
+    On-disk index of the installed .desktop entries, keyed by file path and mtime.
+
+    `scan()` lists the application directories, re-parses only the files that are new or
+    whose mtime changed (on a thread pool) and returns {desktop file id: app entry} with the
+    icon names resolved to files. The index is rewritten only when something changed.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path, max_workers=8):
+        self.path = path
+        self.max_workers = max_workers
+        self.files = {}  # path -> {"mtime": ns, "entry": dict or None, "icon": resolved path}
+        self.theme = None
+        self.parsed = 0
+        self._loaded = False
+
+    def load(self):
+        self._loaded = True
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") == self.VERSION:
+            self.files = data.get("files", {})
+            self.theme = data.get("theme")
+
+    def save(self):
+        write_atomic(self.path, {"version": self.VERSION, "theme": self.theme, "files": self.files})
+
+    def scan(self, dirs=None, theme=None):
+        if not self._loaded:
+            self.load()
+        found = list_desktop_files(dirs)
+        paths = {}
+        for path in found.values():
+            try:
+                paths[path] = os.stat(path).st_mtime_ns
+            except OSError:
+                continue
+        changed = [path for path, mtime in paths.items()
+                   if self.files.get(path, {}).get("mtime") != mtime]
+        dirty = bool(changed) or any(path not in paths for path in self.files)
+        self.files = {path: record for path, record in self.files.items() if path in paths}
+
+        suffixes = locale_suffixes()
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="desktop-index") as executor:
+            entries = executor.map(lambda path: self._parse(path, suffixes), changed)
+            for path, entry in zip(changed, entries):
+                self.files[path] = {"mtime": paths[path], "entry": entry, "icon": None}
+        self.parsed = len(changed)
+
+        # Icon themes are walked only if some icon actually needs resolving
+        resolver = None
+        theme_changed = theme != self.theme
+        for record in self.files.values():
+            entry = record["entry"]
+            if entry is None:
+                continue
+            icon = record.get("icon")
+            if icon is None or theme_changed or (icon and not os.path.exists(icon)):
+                resolver = resolver or IconResolver(theme)
+                record["icon"] = resolver.resolve(entry.get("icon"))
+                dirty = True
+        self.theme = theme
+
+        if dirty:
+            try:
+                self.save()
+            except OSError:
+                pass
+
+        result = {}
+        for desktop_id, path in found.items():
+            record = self.files.get(path)
+            if record is None or record["entry"] is None:
+                continue
+            entry = dict(record["entry"], icon=record["icon"] or "", desktop_id=desktop_id)
+            result[desktop_id] = entry
+        return result
+
+    @staticmethod
+    def _parse(path, suffixes):
+        try:
+            return parse_desktop_file(path, suffixes)
+        except (OSError, UnicodeError):
+            return None
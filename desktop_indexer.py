@@ -0,0 +1,81 @@
+import os
+import threading
+
+from PyQt5.QtGui import QIcon
+from PyQt5.QtCore import QObject, QFileSystemWatcher, QTimer, pyqtSignal
+
+from desktop_entries import DesktopIndex, application_dirs
+from icons import cache_dir
+
+
+class DesktopIndexer(QObject):
+    """
+    Keeps the installed applications indexed in the background.
+
+    Scans run on a worker thread and end with `entries_changed({desktop id: entry})`; the
+    application directories are watched, and changes in them trigger a new (incremental)
+    scan after a short delay.
+    """
+
+    entries_changed = pyqtSignal(object)
+    RESCAN_DELAY_MS = 1000
+
+    def __init__(self, index_path=None, parent=None):
+        super().__init__(parent)
+        self.index = DesktopIndex(index_path or os.path.join(cache_dir("desktop"), "index.json"))
+        self.entries = None  # result of the last scan
+        self._scanning = False
+        self._rescan = False
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self.schedule_scan)
+        self.rescan_timer = QTimer(self)
+        self.rescan_timer.setSingleShot(True)
+        self.rescan_timer.setInterval(self.RESCAN_DELAY_MS)
+        self.rescan_timer.timeout.connect(self.scan)
+        self.entries_changed.connect(self._on_scanned)
+
+    def scan(self):
+        if self._scanning:
+            self._rescan = True
+            return
+        self._scanning = True
+        theme = QIcon.themeName() or None
+        threading.Thread(target=self._run, args=(theme,), name="desktop-index", daemon=True).start()
+
+    def schedule_scan(self, *_):
+        self.rescan_timer.start()
+
+    def _run(self, theme):
+        try:
+            entries = self.index.scan(theme=theme)
+        except OSError:
+            entries = {}
+        self.entries_changed.emit(entries)
+
+    def _on_scanned(self, entries):
+        self.entries = entries
+        self._scanning = False
+        self.watch_directories()
+        if self._rescan:
+            self._rescan = False
+            self.scan()
+
+    def watch_directories(self):
+        watched = set(self.watcher.directories())
+        wanted = []
+        for root in application_dirs():
+            for directory, _, _ in os.walk(root):
+                if directory not in watched:
+                    wanted.append(directory)
+        if wanted:
+            self.watcher.addPaths(wanted)
+
+
+_indexer = None
+
+
+def shared_desktop_indexer():
+    global _indexer
+    if _indexer is None:
+        _indexer = DesktopIndexer()
+    return _indexer
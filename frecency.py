@@ -0,0 +1,101 @@
+import math
+import time
+from bisect import bisect_left, insort
+
+
+HALF_LIFE = 3 * 24 * 3600  # seconds for a launch to count half as much
+SEARCH_WEIGHT = 60  # relevance points a search match gains per log-unit of frecency
+
+
+class FrecencyTracker:
+    """
+    Decaying launch score per key, kept in launch-rank order.
+
+    A launch at time t adds exp(-rate * (now - t)) to a key's score. All scores decay at the
+    same rate, so the ranking never changes by itself; each key stores its score relative to
+    a fixed epoch, in log space (log_value), and a launch is an O(1) log-add. The ranking is a
+    sorted list that a launch updates with one bisect removal and one insort.
+    """
+
+    def __init__(self, half_life=HALF_LIFE):
+        self.rate = math.log(2) / half_life
+        self._entries = {}  # key -> [count, last launch, log_value, seq]
+        self._order = []  # (-log_value, seq, key), best first
+        self._seq = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def record(self, key, now=None):
+        now = time.time() if now is None else now
+        launch = self.rate * now
+        entry = self._entries.get(key)
+        if entry is None:
+            self._seq += 1
+            entry = self._entries[key] = [0, now, launch, self._seq]
+        else:
+            self._order.pop(bisect_left(self._order, (-entry[2], entry[3], key)))
+            high, low = max(entry[2], launch), min(entry[2], launch)
+            entry[2] = high + math.log1p(math.exp(low - high))
+        entry[0] += 1
+        entry[1] = now
+        insort(self._order, (-entry[2], entry[3], key))
+
+    def forget(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._order.pop(bisect_left(self._order, (-entry[2], entry[3], key)))
+
+    def score(self, key, now=None):
+        """Decayed number of launches as of `now`."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return 0.0
+        now = time.time() if now is None else now
+        return math.exp(entry[2] - self.rate * now)
+
+    def boost(self, key, now=None):
+        """Relevance added to a search match for `key`, so frequent and recent picks rank higher."""
+        score = self.score(key, now)
+        return SEARCH_WEIGHT * math.log1p(score) if score else 0
+
+    def boosts(self, now=None):
+        """boost() of every key that has a score, as of the same `now`."""
+        now = time.time() if now is None else now
+        return {key: self.boost(key, now) for key in self._entries}
+
+    def ranked(self):
+        """Keys ordered from most to least frecent."""
+        return [key for _, _, key in self._order]
+
+    def ordered(self, items, key):
+        """
+        Return `items` with the ones that have a score first, most frecent first; the others
+        follow in their original order. Linear in len(items), no sorting.
+        """
+        groups = {}
+        for item in items:
+            groups.setdefault(key(item), []).append(item)
+        result = []
+        for _, _, item_key in self._order:
+            group = groups.pop(item_key, None)
+            if group:
+                result.extend(group)
+        if groups:
+            result.extend(item for item in items if key(item) in groups)
+        return result
+
+    def to_dict(self):
+        return {key: [entry[0], entry[1], round(entry[2], 6)] for key, entry in self._entries.items()}
+
+    def load(self, data):
+        self._entries.clear()
+        self._order.clear()
+        for key, (count, last, log_value) in (data or {}).items():
+            self._seq += 1
+            self._entries[key] = [count, last, log_value, self._seq]
+            self._order.append((-log_value, self._seq, key))
+        self._order.sort()
@@ -0,0 +1,59 @@
+import os
+
+from launch_engine import URL_PATTERN, classify_command
+
+
+class TargetStatus:
+    """Outcome of checking one command or icon target; `watch` are the folders whose changes can affect it."""
+
+    __slots__ = ("ok", "kind", "target", "error", "watch")
+
+    def __init__(self, ok, kind=None, target=None, error=None, watch=()):
+        self.ok = ok
+        self.kind = kind
+        self.target = target
+        self.error = error
+        self.watch = tuple(watch)
+
+
+def existing_ancestor(path):
+    """The folder to watch for `path` to appear: its parent, or the closest ancestor that exists."""
+    directory = os.path.dirname(os.path.abspath(path))
+    while directory and not os.path.isdir(directory):
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            break
+        directory = parent
+    return directory
+
+
+def path_dirs():
+    return [directory for directory in os.environ.get("PATH", "").split(os.pathsep) if directory]
+
+
+def check_command(command):
+    """Resolve a command the way launching it would, without launching it."""
+    if not command:
+        return TargetStatus(False, error="no command specified")
+    kind, target = classify_command(command)
+    if kind == "url":
+        if URL_PATTERN.match(command):
+            return TargetStatus(True, kind, target)
+        # classify_command hands unknown names to the desktop; for a health check they are missing
+        path = os.path.expanduser(command)
+        if os.sep in command or (os.altsep and os.altsep in command):
+            return TargetStatus(False, error=f"{path} not found", watch=[existing_ancestor(path)])
+        return TargetStatus(False, error=f"{command} not found in PATH", watch=path_dirs())
+    if os.sep in command or (os.altsep and os.altsep in command) or os.path.exists(os.path.expanduser(command)):
+        return TargetStatus(True, kind, target, watch=[existing_ancestor(target)])
+    # A bare name found on PATH: an earlier PATH folder may start shadowing it
+    return TargetStatus(True, kind, target, watch=path_dirs())
+
+
+def check_icon(path):
+    if not path:
+        return TargetStatus(True)
+    path = os.path.expanduser(path)
+    if os.path.isfile(path):
+        return TargetStatus(True, "icon", path, watch=[existing_ancestor(path)])
+    return TargetStatus(False, "icon", error=f"icon {path} not found", watch=[existing_ancestor(path)])
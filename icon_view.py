@@ -0,0 +1,192 @@
+from PyQt5.QtWidgets import QListView, QStyledItemDelegate, QMenu, QStyle, QAbstractItemView
+from PyQt5.QtGui import QIcon, QCursor, QPainter, QColor
+from PyQt5.QtCore import (
+    Qt, QAbstractListModel, QModelIndex, QSize, QRect, QVariantAnimation, QEasingCurve, pyqtSignal
+)
+
+
+ICON_SIZE = 64
+CELL_SIZE = 100
+CELL_SPACING = 20
+
+
+def cell_size(icon_size):
+    """Side of the square cell holding an icon of `icon_size`, keeping the default padding."""
+    return icon_size + CELL_SIZE - ICON_SIZE
+
+
+BADGE_SIZE = 18
+BADGE_COLOR = "#d9534f"
+
+
+def app_tooltip(app_info, problem=None):
+    """Tooltip for an app cell: its name, what is wrong with its target, and how its last launch went."""
+    name = app_info["name"] if problem is None else f"{app_info['name']}\nBroken: {problem}"
+    stats = app_info.get("launch_stats")
+    if not stats:
+        return name
+    if stats.get("last_error"):
+        status = f"failed: {stats['last_error']}"
+    elif stats.get("last_exit") not in (None, 0):
+        status = f"exited with status {stats['last_exit']}"
+    else:
+        status = "ok"
+    return (f"{name}\nLast launch: {stats.get('last_spawn_ms', 0):.0f} ms ({status}), "
+            f"average {stats.get('avg_spawn_ms', 0):.0f} ms over {stats.get('count', 0)}")
+
+
+def paint_broken_badge(painter, icon_rect):
+    """Paint the "!" badge marking an entry whose command or icon is missing on the icon's top-right corner."""
+    badge = QRect(icon_rect.right() - BADGE_SIZE + 5, icon_rect.top() - 5, BADGE_SIZE, BADGE_SIZE)
+    painter.save()
+    painter.setRenderHint(QPainter.Antialiasing)
+    painter.setPen(Qt.NoPen)
+    painter.setBrush(QColor(BADGE_COLOR))
+    painter.drawEllipse(badge)
+    font = painter.font()
+    font.setBold(True)
+    painter.setFont(font)
+    painter.setPen(Qt.white)
+    painter.drawText(badge, Qt.AlignCenter, "!")
+    painter.restore()
+
+
+class AppListModel(QAbstractListModel):
+    """List model over the app dicts shown by the virtualized view."""
+
+    AppInfoRole = Qt.UserRole + 1
+    ProblemRole = Qt.UserRole + 2
+
+    def __init__(self, icon_provider, parent=None, problem_provider=None):
+        super().__init__(parent)
+        self.apps = []
+        self.icon_provider = icon_provider
+        self.problem_provider = problem_provider or (lambda app_info: None)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.apps)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        app_info = self.apps[index.row()]
+        if role == Qt.DecorationRole:
+            return self.icon_provider(app_info)
+        if role == Qt.ToolTipRole:
+            return app_tooltip(app_info, self.problem_provider(app_info))
+        if role == self.AppInfoRole:
+            return app_info
+        if role == self.ProblemRole:
+            return self.problem_provider(app_info)
+        return None
+
+    def set_apps(self, apps):
+        self.beginResetModel()
+        self.apps = list(apps)
+        self.endResetModel()
+
+
+class AppIconDelegate(QStyledItemDelegate):
+    """Paints an app cell the same way AppIcon looks: a centered icon, no text."""
+
+    def sizeHint(self, option, index):
+        size = cell_size(self.parent().icon_size)
+        return QSize(size, size)
+
+    def paint(self, painter, option, index):
+        icon = index.data(Qt.DecorationRole)
+        if not isinstance(icon, QIcon):
+            return
+        rect = QRect(option.rect)
+        view = self.parent()
+        rect.translate(0, view.bounce_offset(index))
+        icon_rect = QRect(0, 0, view.icon_size, view.icon_size)
+        icon_rect.moveCenter(rect.center())
+        mode = QIcon.Active if option.state & QStyle.State_MouseOver else QIcon.Normal
+        icon.paint(painter, icon_rect, Qt.AlignCenter, mode)
+        if index.data(AppListModel.ProblemRole) is not None:
+            paint_broken_badge(painter, icon_rect)
+
+
+class AppIconView(QListView):
+    """Virtualized icon grid: only the visible cells are laid out and painted."""
+
+    launch_requested = pyqtSignal(object)
+    remove_requested = pyqtSignal(object)
+    edit_requested = pyqtSignal(object)
+    open_requested = pyqtSignal(object)
+    # (menu, app_info) just before an entry's context menu opens, for the window to add to it
+    menu_requested = pyqtSignal(object, object)
+
+    def __init__(self, model, parent=None, icon_size=ICON_SIZE):
+        super().__init__(parent)
+        self.icon_size = icon_size
+        self.setModel(model)
+        self.setItemDelegate(AppIconDelegate(self))
+        self.setViewMode(QListView.IconMode)
+        self.setMovement(QListView.Static)
+        self.setResizeMode(QListView.Adjust)
+        self.setUniformItemSizes(True)
+        self.setLayoutMode(QListView.Batched)
+        self.setBatchSize(256)
+        self.set_icon_size(icon_size)
+        self.setSelectionMode(QAbstractItemView.NoSelection)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.setMouseTracking(True)
+        self.viewport().setCursor(QCursor(Qt.PointingHandCursor))
+        self.setFrameShape(QListView.NoFrame)
+        self.setStyleSheet("background-color: transparent; border: none;")
+        self.clicked.connect(self.on_click)
+
+        self._bounce_app = None
+        self._bounce_offset = 0
+        self._bounce_animation = QVariantAnimation(self)
+        self._bounce_animation.setDuration(500)
+        self._bounce_animation.setKeyValueAt(0, 0)
+        self._bounce_animation.setKeyValueAt(0.25, -20)
+        self._bounce_animation.setKeyValueAt(0.5, 0)
+        self._bounce_animation.setKeyValueAt(0.75, -10)
+        self._bounce_animation.setKeyValueAt(1, 0)
+        self._bounce_animation.setEasingCurve(QEasingCurve.OutBounce)
+        self._bounce_animation.valueChanged.connect(self._on_bounce_step)
+
+    def set_icon_size(self, icon_size):
+        self.icon_size = icon_size
+        size = cell_size(icon_size) + CELL_SPACING
+        self.setGridSize(QSize(size, size))
+
+    def on_click(self, index):
+        app_info = index.data(AppListModel.AppInfoRole)
+        if app_info is None:
+            return
+        self.launch_requested.emit(app_info)
+        self.animate_bounce(index)
+
+    def contextMenuEvent(self, event):
+        index = self.indexAt(event.pos())
+        app_info = index.data(AppListModel.AppInfoRole) if index.isValid() else None
+        if app_info is None:
+            event.ignore()
+            return
+        menu = QMenu(self)
+        menu.addAction("Open").triggered.connect(lambda: self.open_requested.emit(app_info))
+        menu.addAction("Edit").triggered.connect(lambda: self.edit_requested.emit(app_info))
+        menu.addAction("Remove").triggered.connect(lambda: self.remove_requested.emit(app_info))
+        self.menu_requested.emit(menu, app_info)
+        menu.exec_(event.globalPos())
+
+    def animate_bounce(self, index):
+        self._bounce_app = index.data(AppListModel.AppInfoRole)
+        self._bounce_animation.stop()
+        self._bounce_animation.start()
+
+    def bounce_offset(self, index):
+        if self._bounce_app is not None and index.data(AppListModel.AppInfoRole) is self._bounce_app:
+            return self._bounce_offset
+        return 0
+
+    def _on_bounce_step(self, value):
+        self._bounce_offset = value
+        self.viewport().update()
@@ -0,0 +1,497 @@
+import json
+import os
+import time
+import weakref
+from collections import OrderedDict
+
+from PyQt5.QtWidgets import QApplication, QStyle, QStyleOption
+from PyQt5.QtGui import QIcon, QIconEngine, QImage, QImageReader, QPainter, QPixmap
+from PyQt5.QtCore import Qt, QObject, QPoint, QRect, QRunnable, QThreadPool, QStandardPaths, QTimer, pyqtSignal
+
+
+ICON_SIZE = 64
+DEFAULT_ICON_PATH = "../../../Desktop/PyCharm/EasyGameLauncher/default_icon.png"
+
+
+def cache_dir(name):
+    cache = QStandardPaths.writableLocation(QStandardPaths.GenericCacheLocation) or os.path.expanduser("~/.cache")
+    return os.path.join(cache, "flexilaunch", name)
+
+
+def decode_icon(path, size):
+    """Decode `path` into a QImage scaled to fit `size` x `size`."""
+    reader = QImageReader(path)
+    source_size = reader.size()
+    if source_size.isValid() and (source_size.width() > size or source_size.height() > size):
+        # Let the decoder downscale where it can (JPEG skips most of the work)
+        reader.setScaledSize(source_size.scaled(size, size, Qt.KeepAspectRatio))
+    image = reader.read()
+    if image.isNull():
+        return None
+    if image.width() > size or image.height() > size:
+        image = image.scaled(size, size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+    return image
+
+
+def file_signature(path):
+    stat = os.stat(path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def today():
+    return int(time.time() // 86400)
+
+
+class IconAtlas:
+    """
+    Every decoded icon of one size, packed into a single image of size x size slots.
+
+    `index` maps a source path to [slot, width, height, mtime_ns, file_size, last_used_day],
+    least recently used first; slots freed by stale or forgotten icons are reused before the
+    image grows, and once it holds MAX_ICONS the least recently used icon gives up its slot.
+    The atlas is saved as one PNG with the index in a text chunk, so the two can never
+    disagree, and only ever touched on the GUI thread once loaded.
+    """
+
+    COLUMNS = 32
+    # Slots at most, size x size x 4 bytes each: 16 MB at 64 px
+    MAX_ICONS = 1024
+    # Icons not shown for this many days are dropped when the atlas is next loaded
+    PRUNE_DAYS = 30
+    INDEX_KEY = "flexilaunch-atlas"
+
+    def __init__(self, size, image=None, index=None):
+        self.size = size
+        self.image = image if image is not None else QImage()
+        self.index = OrderedDict(index or ())
+        used = {entry[0] for entry in self.index.values()}
+        capacity = self.capacity()
+        self.free = sorted(set(range(capacity)) - used, reverse=True)
+        self.dirty = False
+
+    @classmethod
+    def load(cls, path, size):
+        """
+        Read a saved atlas, dropping the icons whose file changed or went away and those
+        unused for PRUNE_DAYS. Does file I/O: meant for a worker thread.
+        """
+        image = QImage(path) if os.path.exists(path) else QImage()
+        try:
+            saved = json.loads(image.text(cls.INDEX_KEY)) if not image.isNull() else {}
+        except ValueError:
+            saved = {}
+        if saved.get("size") != size or saved.get("columns") != cls.COLUMNS:
+            return cls(size)
+        image = image.convertToFormat(QImage.Format_ARGB32_Premultiplied)
+        index = {}
+        oldest = today() - cls.PRUNE_DAYS
+        for source, entry in saved.get("index", {}).items():
+            try:
+                if entry[5] >= oldest and file_signature(source) == entry[3:5]:
+                    index[source] = entry
+            except OSError:
+                continue
+        atlas = cls(size, image, index)
+        atlas.dirty = len(index) != len(saved.get("index", {}))
+        return atlas
+
+    def capacity(self):
+        if self.image.isNull():
+            return 0
+        return self.COLUMNS * (self.image.height() // self.size)
+
+    def __contains__(self, path):
+        return path in self.index
+
+    def __len__(self):
+        return len(self.index)
+
+    def nbytes(self):
+        return self.image.sizeInBytes() if not self.image.isNull() else 0
+
+    def slot_rect(self, slot, width, height):
+        return QRect((slot % self.COLUMNS) * self.size, (slot // self.COLUMNS) * self.size, width, height)
+
+    def put(self, path, image, signature):
+        """
+        Store a decoded icon (at most size x size), in its previous slot if it had one; returns
+        the path of the icon it evicted, if any.
+        """
+        evicted = None
+        entry = self.index.pop(path, None)
+        if entry is not None:
+            slot = entry[0]
+        else:
+            if not self.free and self.capacity() >= self.MAX_ICONS:
+                evicted, entry = self.index.popitem(last=False)
+                self.free.append(entry[0])
+            elif not self.free:
+                self._grow()
+            slot = self.free.pop()
+        self.index[path] = [slot, image.width(), image.height(), *signature, today()]
+        painter = QPainter(self.image)
+        painter.setCompositionMode(QPainter.CompositionMode_Source)
+        painter.fillRect(self.slot_rect(slot, self.size, self.size), Qt.transparent)
+        painter.drawImage(self.slot_rect(slot, image.width(), image.height()).topLeft(), image)
+        painter.end()
+        self.dirty = True
+        return evicted
+
+    def touch(self, path):
+        self.index.move_to_end(path)
+        entry = self.index[path]
+        if entry[5] != today():
+            entry[5] = today()
+            self.dirty = True
+
+    def prune(self, keep):
+        """Forget the icons whose path is not in `keep`; returns their paths."""
+        removed = [path for path in self.index if path not in keep]
+        for path in removed:
+            self.free.append(self.index.pop(path)[0])
+        if removed:
+            self.free.sort(reverse=True)
+            self.dirty = True
+        return removed
+
+    def _grow(self):
+        old_capacity = self.capacity()
+        # By half again, so a large catalog is packed in a few copies and a small one stays small
+        rows = old_capacity // self.COLUMNS
+        rows = min(rows + max(rows // 2, 1), -(-self.MAX_ICONS // self.COLUMNS))
+        image = QImage(self.COLUMNS * self.size, rows * self.size, QImage.Format_ARGB32_Premultiplied)
+        image.fill(Qt.transparent)
+        if not self.image.isNull():
+            painter = QPainter(image)
+            painter.drawImage(0, 0, self.image)
+            painter.end()
+        self.image = image
+        self.free = sorted(set(self.free) | set(range(old_capacity, self.capacity())), reverse=True)
+
+    def source_rect(self, path):
+        slot, width, height = self.index[path][:3]
+        return self.slot_rect(slot, width, height)
+
+    def paint(self, painter, rect, path):
+        """Draw the icon of `path` fitted and centered in `rect`."""
+        source = self.source_rect(path)
+        target = QRect(QPoint(0, 0), source.size())
+        if source.width() > rect.width() or source.height() > rect.height():
+            target.setSize(source.size().scaled(rect.size(), Qt.KeepAspectRatio))
+        target.moveCenter(rect.center())
+        painter.save()
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+        painter.drawImage(target, self.image, source)
+        painter.restore()
+
+    def snapshot(self):
+        """
+        (image, index text) to save from another thread: the image is shared with the atlas
+        until the GUI thread next writes to it, and only copied then.
+        """
+        self.dirty = False
+        return QImage(self.image), json.dumps({"size": self.size, "columns": self.COLUMNS, "index": self.index})
+
+
+def save_atlas(path, image, index_text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    image.setText(IconAtlas.INDEX_KEY, index_text)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    if image.save(tmp_path, "PNG"):
+        os.replace(tmp_path, path)
+
+
+class AtlasIconEngine(QIconEngine):
+    """
+    Paints one icon straight from its loader's atlas: every widget and view showing the
+    icon shares this engine, and no per-icon pixmap is kept.
+    """
+
+    def __init__(self, loader, path):
+        super().__init__()
+        self.loader = loader
+        self.path = path
+
+    def paint(self, painter, rect, mode, state):
+        atlas = self.loader.atlas
+        if self.path in atlas:
+            atlas.touch(self.path)
+            atlas.paint(painter, rect, self.path)
+        else:
+            # Evicted since: decoded again, and icon_loaded repaints the views that show it
+            self.loader.default_icon().paint(painter, rect)
+            self.loader.icon(self.path)
+
+    def actualSize(self, size, mode, state):
+        if self.path not in self.loader.atlas:
+            return size
+        source = self.loader.atlas.source_rect(self.path).size()
+        if source.width() > size.width() or source.height() > size.height():
+            return source.scaled(size, Qt.KeepAspectRatio)
+        return source
+
+    def pixmap(self, size, mode, state):
+        # Transient: the style draws it and lets it go
+        pixmap = QPixmap(self.actualSize(size, mode, state))
+        pixmap.fill(Qt.transparent)
+        painter = QPainter(pixmap)
+        self.paint(painter, pixmap.rect(), mode, state)
+        painter.end()
+        if mode == QIcon.Disabled:
+            option = QStyleOption()
+            option.palette = QApplication.palette()
+            pixmap = QApplication.style().generatedIconPixmap(mode, pixmap, option)
+        return pixmap
+
+    def clone(self):
+        return AtlasIconEngine(self.loader, self.path)
+
+
+class IconTaskSignals(QObject):
+    finished = pyqtSignal(str, object, object)
+    atlas_loaded = pyqtSignal(object)
+
+
+class IconTask(QRunnable):
+    def __init__(self, path, size, signals):
+        super().__init__()
+        self.path = path
+        self.size = size
+        self.signals = signals
+
+    def run(self):
+        try:
+            signature = file_signature(self.path)
+        except OSError:
+            self.signals.finished.emit(self.path, None, None)
+            return
+        self.signals.finished.emit(self.path, decode_icon(self.path, self.size), signature)
+
+
+class AtlasTask(QRunnable):
+    """Loads the atlas (and checks it against the icon files) or saves a snapshot of it."""
+
+    def __init__(self, path, size, signals, snapshot=None):
+        super().__init__()
+        self.path = path
+        self.size = size
+        self.signals = signals
+        self.snapshot = snapshot
+
+    def run(self):
+        if self.snapshot is not None:
+            try:
+                save_atlas(self.path, *self.snapshot)
+            except OSError:
+                pass
+            return
+        self.signals.atlas_loaded.emit(IconAtlas.load(self.path, self.size))
+
+
+class IconLoader(QObject):
+    """
+    Loads app icons off the GUI thread.
+
+    Decoded icons are packed into one bounded IconAtlas per size, persisted in the cache
+    folder so later starts read a single image instead of decoding every icon file; icons
+    whose file changed are dropped from it on load and decoded again, and icons no catalog
+    uses (see add_icon_source) when it is saved. Each path in the atlas gets one QIcon,
+    painted from it and shared by every widget and view. Until an icon is ready callers get
+    the shared default icon.
+    """
+
+    # Changes to the atlas are saved once they have settled for this long
+    SAVE_DELAY_MS = 2000
+
+    icon_loaded = pyqtSignal(str)
+
+    def __init__(self, size=ICON_SIZE, atlas_path=None, parent=None):
+        super().__init__(parent)
+        self.size = size
+        self.atlas_path = atlas_path or os.path.join(cache_dir("atlas"), f"atlas-{size}.png")
+        self.atlas = None  # set once loaded
+        self._icons = {}  # path -> QIcon painting from the atlas
+        self._failed = set()
+        self._pending = {}  # path -> receivers waiting for it
+        self._default_icon = None
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(4)
+        self._signals = IconTaskSignals(self)
+        self._signals.finished.connect(self._on_finished)
+        self._signals.atlas_loaded.connect(self._on_atlas_loaded)
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(self.SAVE_DELAY_MS)
+        self._save_timer.timeout.connect(self.save_atlas)
+        if QApplication.instance() is not None:
+            QApplication.instance().aboutToQuit.connect(self.flush_atlas)
+        self._pool.start(AtlasTask(self.atlas_path, size, self._signals))
+
+    def default_icon(self):
+        if self._default_icon is None:
+            if os.path.exists(DEFAULT_ICON_PATH):
+                pixmap = QPixmap(DEFAULT_ICON_PATH)
+            else:
+                pixmap = QApplication.style().standardIcon(QStyle.SP_FileIcon).pixmap(self.size, self.size)
+            if pixmap.width() > self.size or pixmap.height() > self.size:
+                pixmap = pixmap.scaled(self.size, self.size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+            self._default_icon = QIcon(pixmap)
+        return self._default_icon
+
+    def cached(self, path):
+        return self._icons.get(path)
+
+    def icon(self, path, receiver=None):
+        """
+        Return the icon for `path` if it is ready, else the default icon.
+
+        When the icon still has to be decoded (or the atlas read), `receiver(icon)` is called
+        on the GUI thread once it is.
+        """
+        if not path or path in self._failed:
+            return self.default_icon()
+        icon = self._icons.get(path)
+        if icon is not None:
+            return icon
+        if self.atlas is not None and path in self.atlas:
+            return self._atlas_icon(path)
+        receivers = self._pending.get(path)
+        if receivers is None:
+            receivers = self._pending[path] = []
+            if self.atlas is not None:
+                self._pool.start(IconTask(path, self.size, self._signals))
+        if receiver is not None:
+            receivers.append(receiver)
+        return self.default_icon()
+
+    def _atlas_icon(self, path):
+        self.atlas.touch(path)
+        icon = self._icons[path] = QIcon(AtlasIconEngine(self, path))
+        return icon
+
+    def cache_count(self):
+        return len(self._icons)
+
+    def clear(self):
+        self._icons.clear()
+        self._failed.clear()
+
+    def memory_report(self):
+        return {"size": self.size, "icons": len(self._icons),
+                "atlas_icons": len(self.atlas) if self.atlas is not None else 0,
+                "atlas_slots": self.atlas.capacity() if self.atlas is not None else 0,
+                "atlas_bytes": self.atlas.nbytes() if self.atlas is not None else 0,
+                "default_icon_bytes": self.size * self.size * 4 if self._default_icon is not None else 0}
+
+    def save_atlas(self):
+        if self.atlas is None:
+            return
+        in_use = icons_in_use()
+        if in_use is not None:
+            for path in self.atlas.prune(in_use):
+                self._icons.pop(path, None)
+        if self.atlas.dirty:
+            self._pool.start(AtlasTask(self.atlas_path, self.size, self._signals, self.atlas.snapshot()))
+
+    def flush_atlas(self):
+        self._save_timer.stop()
+        self.save_atlas()
+        self._pool.waitForDone()
+
+    def _on_atlas_loaded(self, atlas):
+        self.atlas = atlas
+        if atlas.dirty:
+            self._save_timer.start()
+        for path in list(self._pending):
+            if path in atlas:
+                self._deliver(path, self._atlas_icon(path))
+            else:
+                self._pool.start(IconTask(path, self.size, self._signals))
+
+    def _on_finished(self, path, image, signature):
+        if image is None:
+            self._failed.add(path)
+            icon = self.default_icon()
+        else:
+            evicted = self.atlas.put(path, image, signature)
+            if evicted is not None:
+                self._icons.pop(evicted, None)
+            self._save_timer.start()
+            icon = self._icons.get(path) or self._atlas_icon(path)
+        self._deliver(path, icon)
+
+    def _deliver(self, path, icon):
+        for receiver in self._pending.pop(path, ()):
+            try:
+                receiver(icon)
+            except RuntimeError:
+                # The widget waiting for this icon was deleted in the meantime
+                pass
+        self.icon_loaded.emit(path)
+
+
+_glyphs = {}
+
+
+def glyph_icon(name, color, size=24):
+    """
+    Return a qtawesome glyph as a QIcon, from memory or from the on-disk glyph cache.
+
+    qtawesome (and its font loading) is only imported the first time a glyph/color pair is
+    rendered on this machine; later starts just load the cached PNG.
+    """
+    key = (name, color, size)
+    icon = _glyphs.get(key)
+    if icon is not None:
+        return icon
+    directory = cache_dir("glyphs")
+    path = os.path.join(directory, f"{name}-{color.lstrip('#')}-{size}.png")
+    pixmap = QPixmap(path) if os.path.exists(path) else QPixmap()
+    if pixmap.isNull():
+        import qtawesome as qta
+        pixmap = qta.icon(name, color=color).pixmap(size * 2, size * 2)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            pixmap.save(path, "PNG")
+        except OSError:
+            pass
+    icon = _glyphs[key] = QIcon(pixmap)
+    return icon
+
+
+_shared_loaders = {}  # icon size -> IconLoader
+_icon_sources = []  # WeakMethods returning the icon paths a catalog uses
+
+
+def add_icon_source(method):
+    """Register a bound method returning the icon paths of a catalog; atlases keep only those."""
+    _icon_sources.append(weakref.WeakMethod(method))
+
+
+def icons_in_use():
+    """The icon paths of every registered catalog, or None while none is registered."""
+    sources = [source for source in (ref() for ref in _icon_sources) if source is not None]
+    _icon_sources[:] = [ref for ref in _icon_sources if ref() is not None]
+    if not sources:
+        return None
+    return set().union(*(source() for source in sources))
+
+
+def cached_icon_count():
+    """Decoded icons and glyphs held in memory, across every shared loader."""
+    return sum(loader.cache_count() for loader in _shared_loaders.values()) + len(_glyphs)
+
+
+def icon_memory_report():
+    """Pixel memory held for icons: each shared loader's atlas, the default icons and the glyphs."""
+    loaders = [loader.memory_report() for loader in _shared_loaders.values()]
+    glyph_bytes = sum((size * 2) ** 2 * 4 for _, _, size in _glyphs)
+    total = sum(report["atlas_bytes"] + report["default_icon_bytes"] for report in loaders) + glyph_bytes
+    return {"loaders": loaders, "glyph_bytes": glyph_bytes, "total_bytes": total}
+
+
+def shared_icon_loader(size=ICON_SIZE):
+    loader = _shared_loaders.get(size)
+    if loader is None:
+        loader = _shared_loaders[size] = IconLoader(size, parent=QApplication.instance())
+    return loader
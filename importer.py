@@ -0,0 +1,130 @@
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from background import BackgroundJob
+from catalog import command_key
+
+
+LAUNCHABLE_EXTENSIONS = {".exe", ".bat", ".cmd", ".lnk", ".url", ".desktop", ".sh", ".appimage", ".jar"}
+ICON_EXTENSIONS = (".png", ".ico", ".svg", ".xpm", ".jpg", ".jpeg", ".bmp")
+FOLDER_ICON_NAMES = ("icon", "folder", ".icon")
+MAX_DEPTH = 4
+
+
+def is_launchable(path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension in LAUNCHABLE_EXTENSIONS:
+        return True
+    if extension in ICON_EXTENSIONS or os.name == "nt":
+        return False
+    return os.access(path, os.X_OK)
+
+
+def find_icon(path):
+    """An icon next to `path` with the same name, or the folder's own icon."""
+    directory = os.path.dirname(path)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    for base in (stem,) + FOLDER_ICON_NAMES:
+        for extension in ICON_EXTENSIONS:
+            candidate = os.path.join(directory, base + extension)
+            if os.path.isfile(candidate):
+                return candidate
+    return ""
+
+
+def derive_entry(path):
+    """Build the app entry for a dropped or discovered file."""
+    name = os.path.splitext(os.path.basename(path))[0]
+    return {"name": name, "command": path, "icon": find_icon(path)}
+
+
+def walk_launchables(root, depth=0):
+    """Yield the launchable files under `root`, skipping hidden folders."""
+    try:
+        entries = list(os.scandir(root))
+    except OSError:
+        return
+    for entry in entries:
+        if entry.name.startswith("."):
+            continue
+        try:
+            if entry.is_dir():
+                if depth < MAX_DEPTH:
+                    yield from walk_launchables(entry.path, depth + 1)
+            elif entry.is_file() and is_launchable(entry.path):
+                yield entry.path
+        except OSError:
+            continue
+
+
+class BulkImporter(BackgroundJob):
+    """
+    Imports dropped files and folders in the background.
+
+    Folders are walked on the importer thread and entries derived on worker threads; entries
+    whose command is already in the catalog (or was already imported in this run) are skipped. Results are
+    handed over in batches through `on_batch(entries)`, progress through
+    `on_progress(done, found)` and the end through `on_finished(imported, skipped)`. The
+    callbacks run on the importer's threads.
+    """
+
+    BATCH_SIZE = 50
+    THREAD_NAME = "bulk-import"
+
+    def __init__(self, existing_commands, on_batch, on_progress=None, on_finished=None, max_workers=4):
+        super().__init__()
+        self.known = set(existing_commands)
+        self.on_batch = on_batch
+        self.on_progress = on_progress
+        self.on_finished = on_finished
+        self.max_workers = max_workers
+        self.found = self.done = self.imported = self.skipped = 0
+        self._batch = []
+
+    def start(self, paths):
+        super().start(list(paths))
+
+    def _candidates(self, paths):
+        for path in paths:
+            if os.path.isdir(path):
+                yield from walk_launchables(path)
+            elif os.path.isfile(path):
+                # Files dropped one by one are always imported, whatever their type
+                yield path
+
+    def _run(self, paths):
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="import") as executor:
+            for path in self._candidates(paths):
+                if self._cancelled.is_set():
+                    break
+                key = command_key(path)
+                if key in self.known:
+                    self.skipped += 1
+                    continue
+                self.known.add(key)
+                self.found += 1
+                pending.append(executor.submit(derive_entry, path))
+                # Stream what is ready while the walk goes on
+                while pending and pending[0].done():
+                    self._collect(pending.popleft())
+            while pending and not self._cancelled.is_set():
+                self._collect(pending.popleft())
+        if self._batch and not self._cancelled.is_set():
+            self.on_batch(self._batch)
+        if self.on_finished is not None:
+            self.on_finished(self.imported, self.skipped)
+
+    def _collect(self, future):
+        try:
+            self._batch.append(future.result())
+            self.imported += 1
+        except OSError:
+            self.skipped += 1
+        self.done += 1
+        if len(self._batch) >= self.BATCH_SIZE:
+            self.on_batch(self._batch)
+            self._batch = []
+        if self.on_progress is not None:
+            self.on_progress(self.done, self.found)
@@ -0,0 +1,182 @@
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+from PyQt5.QtWidgets import QApplication, QLabel
+from PyQt5.QtCore import Qt, QObject, QTimer
+
+
+# Imported only when tracing is turned on (see ipc.trace_path); nothing is wrapped otherwise
+
+
+class Tracer(QObject):
+    """
+    Records timed operations, event-loop stalls and counters as Chrome trace events.
+
+    `instrument` wraps methods so each call becomes a complete ("X") event; a heartbeat
+    timer measures how late the event loop delivers it, and lateness past STALL_MS is a
+    stall. Counters are sampled with the heartbeat's statistics every SAMPLE_MS. The trace
+    is written when the application quits, and loads in chrome://tracing or Perfetto.
+    """
+
+    HEARTBEAT_MS = 16
+    STALL_MS = 50
+    SAMPLE_MS = 500
+    # Operations slower than this are listed in the overlay
+    SLOW_MS = 16
+    MAX_EVENTS = 500000
+
+    def __init__(self, path, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.origin = time.perf_counter()
+        self.pid = os.getpid()
+        self.events = deque(maxlen=self.MAX_EVENTS)
+        self.slow_operations = deque(maxlen=10)  # (name, ms), most recent last
+        self.frame_times = deque(maxlen=120)
+        self.stall_ms = 0.0
+        self.counters = {}  # name -> callable returning the current value
+        self._last_beat = None
+        self.heartbeat = QTimer(self)
+        self.heartbeat.setTimerType(Qt.PreciseTimer)
+        self.heartbeat.setInterval(self.HEARTBEAT_MS)
+        self.heartbeat.timeout.connect(self._on_heartbeat)
+        self.sampler = QTimer(self)
+        self.sampler.setInterval(self.SAMPLE_MS)
+        self.sampler.timeout.connect(self.sample_counters)
+
+    def start(self):
+        self._last_beat = time.perf_counter()
+        self.heartbeat.start()
+        self.sampler.start()
+        QApplication.instance().aboutToQuit.connect(self.export)
+
+    def timestamp(self, moment):
+        return (moment - self.origin) * 1e6
+
+    def record(self, name, start, end, category="op", args=None):
+        event = {"name": name, "cat": category, "ph": "X", "ts": self.timestamp(start),
+                 "dur": (end - start) * 1e6, "pid": self.pid, "tid": threading.get_ident()}
+        if args:
+            event["args"] = args
+        self.events.append(event)
+        elapsed_ms = (end - start) * 1000
+        if elapsed_ms >= self.SLOW_MS and category == "op":
+            self.slow_operations.append((name, elapsed_ms))
+
+    def wrap(self, name, function):
+        @functools.wraps(function)
+        def traced(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.record(name, start, time.perf_counter())
+        return traced
+
+    def instrument(self, owner, *names):
+        """Replace `owner.name` (a class or module attribute) with a traced version, for each name."""
+        label = getattr(owner, "__name__", type(owner).__name__)
+        for name in names:
+            setattr(owner, name, self.wrap(f"{label}.{name}", getattr(owner, name)))
+
+    def add_counter(self, name, value):
+        self.counters[name] = value
+
+    def counter_values(self):
+        values = {}
+        for name, value in self.counters.items():
+            try:
+                values[name] = value()
+            except RuntimeError:
+                # A window went away between two samples
+                pass
+        return values
+
+    def sample_counters(self):
+        values = self.counter_values()
+        values["event-loop stall ms"] = round(self.stall_ms, 1)
+        self.events.append({"name": "counters", "ph": "C", "ts": self.timestamp(time.perf_counter()),
+                            "pid": self.pid, "args": values})
+
+    def _on_heartbeat(self):
+        now = time.perf_counter()
+        elapsed_ms = (now - self._last_beat) * 1000
+        self.frame_times.append(elapsed_ms)
+        late_ms = elapsed_ms - self.HEARTBEAT_MS
+        if late_ms >= self.STALL_MS:
+            self.stall_ms += late_ms
+            self.record("event-loop stall", self._last_beat + self.HEARTBEAT_MS / 1000, now, category="stall")
+        self._last_beat = now
+
+    def export(self, path=None):
+        path = path or self.path
+        trace = {"traceEvents": list(self.events), "displayTimeUnit": "ms",
+                 "otherData": {"stall_ms": round(self.stall_ms, 1)}}
+        try:
+            with open(path, "w") as f:
+                json.dump(trace, f)
+        except OSError as e:
+            print(f"Could not write trace to {path}: {e}", file=sys.stderr)
+
+
+class TraceOverlay(QLabel):
+    """Small always-on-top readout of frame times, counters and the last slow operations."""
+
+    def __init__(self, tracer, parent=None):
+        super().__init__(parent)
+        self.tracer = tracer
+        self.setWindowFlags(Qt.Tool | Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint
+                            | Qt.WindowTransparentForInput)
+        self.setAttribute(Qt.WA_ShowWithoutActivating)
+        self.setStyleSheet("background-color: rgba(0, 0, 0, 180); color: #e0e0e0; "
+                           "font-family: monospace; font-size: 11px; padding: 6px;")
+        self.timer = QTimer(self)
+        self.timer.setInterval(tracer.SAMPLE_MS)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start()
+        self.move(10, 10)
+
+    def refresh(self):
+        frames = self.tracer.frame_times
+        lines = []
+        if frames:
+            lines.append(f"frame  avg {sum(frames) / len(frames):5.1f} ms  max {max(frames):6.1f} ms")
+        lines.append(f"stalls {self.tracer.stall_ms:8.0f} ms total")
+        for name, value in self.tracer.counter_values().items():
+            lines.append(f"{name}: {value}")
+        if self.tracer.slow_operations:
+            lines.append("slow:")
+            for name, elapsed_ms in reversed(self.tracer.slow_operations):
+                lines.append(f"  {elapsed_ms:7.1f} ms  {name}")
+        self.setText("\n".join(lines))
+        self.adjustSize()
+
+
+_tracer = None
+
+
+def enable(path, launcher_class, overlay=False):
+    """Turn tracing on for the rest of the process; call before any `launcher_class` window is created."""
+    global _tracer
+    import icons
+    _tracer = Tracer(path, QApplication.instance())
+    _tracer.instrument(launcher_class, "display_icons", "filter_icons", "apply_theme", "save_settings",
+                       "write_settings", "launch_application")
+    # Looked up as a module global by the loader's worker threads
+    _tracer.instrument(icons, "decode_icon")
+    _tracer.add_counter("cached icons", icons.cached_icon_count)
+    _tracer.add_counter("icon memory KB", lambda: icons.icon_memory_report()["total_bytes"] // 1024)
+    _tracer.start()
+    if overlay:
+        _tracer.overlay = TraceOverlay(_tracer)
+        _tracer.overlay.show()
+    return _tracer
+
+
+def tracer():
+    return _tracer
@@ -0,0 +1,113 @@
+import argparse
+import os
+import socket
+
+
+# This module is imported before anything else on every invocation, keep its imports light
+
+TRACE_ENV = "FLEXILAUNCH_TRACE"
+DEFAULT_TRACE_FILE = "flexilaunch-trace.json"
+
+
+def server_name():
+    """Name the running launcher listens on: a socket path on Unix, a pipe name on Windows."""
+    if os.name == "nt":
+        return f"flexilaunch-{os.environ.get('USERNAME', 'user')}"
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or os.environ.get("TMPDIR") or "/tmp"
+    return os.path.join(runtime_dir, f"flexilaunch-{os.getuid()}.sock")
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog="main.py", description="FlexiLaunch application launcher")
+    parser.add_argument("--resident", action="store_true",
+                        help="keep running in the background when the window is closed")
+    parser.add_argument("--hidden", action="store_true", help="start without showing the window")
+    parser.add_argument("--instance", metavar="NAME", action="append",
+                        help="launcher instance to open or address (repeatable, default: default)")
+    parser.add_argument("--launch", metavar="NAME", help="launch an application by name or id and exit")
+    parser.add_argument("--group", metavar="NAME", help="start the members of a launch group and exit")
+    parser.add_argument("--list", action="store_true", help="print the applications of the instance and exit")
+    parser.add_argument("--search", metavar="QUERY", help="print the applications matching QUERY and exit")
+    parser.add_argument("--import", metavar="PATH", action="append", dest="import_paths",
+                        help="add the applications found in PATH (a file or folder, repeatable) and exit")
+    parser.add_argument("--json", action="store_true", help="with --list, --search, --launch, --group or --import: "
+                                                            "print JSON for scripts")
+    parser.add_argument("--reload", action="store_true", help="make the running launcher reload its settings")
+    parser.add_argument("--quit", action="store_true", help="stop the running launcher")
+    parser.add_argument("--startup-profile", action="store_true",
+                        help="print a per-phase startup timing breakdown")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="record a Chrome trace of slow operations and event-loop stalls to FILE on exit")
+    parser.add_argument("--trace-overlay", action="store_true",
+                        help="with tracing on, show frame times and the last slow operations on screen")
+    # Qt's own options (-style, -platform...) are left for QApplication
+    args, _ = parser.parse_known_args(argv)
+    return args
+
+
+def trace_path(cli_path=None):
+    """Where the trace goes: --trace FILE, else $FLEXILAUNCH_TRACE (a path, or 1 for the default), else None."""
+    if cli_path:
+        return cli_path
+    value = os.environ.get(TRACE_ENV, "")
+    if not value or value == "0":
+        return None
+    return DEFAULT_TRACE_FILE if value == "1" else value
+
+
+def requests_for_args(args):
+    """The commands a later invocation sends to the running launcher, one per addressed instance."""
+    if args.quit:
+        return ["quit"]
+    if args.launch:
+        return [f"@{(args.instance or ['default'])[0]} launch {args.launch}"]
+    if args.group:
+        return [f"@{(args.instance or ['default'])[0]} group {args.group}"]
+    if args.reload:
+        command = "reload"
+    elif args.hidden:
+        command = "ping"
+    else:
+        command = "show"
+    return [f"@{name} {command}" for name in args.instance or ["default"]]
+
+
+def send_command(command, timeout=5.0):
+    """
+    Send one command line to the running launcher and return its reply, or None when no
+    launcher is listening.
+    """
+    if os.name == "nt":
+        return _send_command_qt(command, timeout)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        try:
+            sock.connect(server_name())
+        except OSError:
+            return None
+        try:
+            sock.sendall(command.encode("utf-8") + b"\n")
+            reply = b""
+            while not reply.endswith(b"\n"):
+                chunk = sock.recv(4096)
+                if not chunk:
+                    break
+                reply += chunk
+        except OSError:
+            return None
+    return reply.decode("utf-8").strip()
+
+
+def _send_command_qt(command, timeout):
+    from PyQt5.QtNetwork import QLocalSocket
+    sock = QLocalSocket()
+    sock.connectToServer(server_name())
+    if not sock.waitForConnected(int(timeout * 1000)):
+        return None
+    sock.write(command.encode("utf-8") + b"\n")
+    sock.waitForBytesWritten(int(timeout * 1000))
+    reply = b""
+    while not reply.endswith(b"\n") and sock.waitForReadyRead(int(timeout * 1000)):
+        reply += bytes(sock.readAll())
+    sock.disconnectFromServer()
+    return reply.decode("utf-8").strip()
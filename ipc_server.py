@@ -0,0 +1,58 @@
+from PyQt5.QtCore import QObject
+from PyQt5.QtNetwork import QLocalServer
+
+from ipc import server_name, send_command
+
+
+class CommandServer(QObject):
+    """
+    Local socket server of the running launcher.
+
+    Each client sends one newline-terminated command ("show", "launch <name>", "reload",
+    "quit"...) and gets one reply line produced by `handler(command)`.
+    """
+
+    def __init__(self, handler, parent=None):
+        super().__init__(parent)
+        self.handler = handler
+        self.server = QLocalServer(self)
+        self.server.setSocketOptions(QLocalServer.UserAccessOption)
+        self.server.newConnection.connect(self.on_new_connection)
+        self._buffers = {}
+
+    def listen(self):
+        name = server_name()
+        if self.server.listen(name):
+            return True
+        if send_command("ping", timeout=1.0) is not None:
+            # Another launcher won the race and is serving
+            return False
+        # Left over by a launcher that crashed
+        QLocalServer.removeServer(name)
+        return self.server.listen(name)
+
+    def on_new_connection(self):
+        while self.server.hasPendingConnections():
+            sock = self.server.nextPendingConnection()
+            self._buffers[sock] = b""
+            sock.readyRead.connect(lambda sock=sock: self.on_ready_read(sock))
+            sock.disconnected.connect(lambda sock=sock: self.on_disconnected(sock))
+
+    def on_ready_read(self, sock):
+        data = self._buffers.get(sock, b"") + bytes(sock.readAll())
+        while b"\n" in data:
+            line, data = data.split(b"\n", 1)
+            try:
+                reply = self.handler(line.decode("utf-8").strip())
+            except Exception as e:
+                reply = f"error {e}"
+            sock.write(reply.encode("utf-8") + b"\n")
+            sock.flush()
+        self._buffers[sock] = data
+
+    def on_disconnected(self, sock):
+        self._buffers.pop(sock, None)
+        sock.deleteLater()
+
+    def close(self):
+        self.server.close()
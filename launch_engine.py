@@ -0,0 +1,190 @@
+import os
+import re
+import shlex
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+URL_PATTERN = re.compile(r"^[a-zA-Z][a-zA-Z0-9+.-]+:")
+WINDOWS = os.name == "nt"
+
+
+def is_executable_file(path):
+    if WINDOWS:
+        extensions = os.environ.get("PATHEXT", ".COM;.EXE;.BAT;.CMD").lower().split(";")
+        return os.path.splitext(path)[1].lower() in extensions
+    return os.access(path, os.X_OK)
+
+
+def classify_command(command):
+    """
+    Decide how a command is opened.
+
+    Returns ("executable", path) for programs that are spawned directly, ("document", path)
+    for existing files and folders handed to the desktop, and ("url", command) for anything else.
+    """
+    # Schemes need two characters or more, so a Windows drive letter is never taken for one
+    if URL_PATTERN.match(command):
+        return "url", command
+    path = os.path.expanduser(command)
+    if os.path.isfile(path):
+        return ("executable" if is_executable_file(path) else "document"), path
+    if os.path.isdir(path):
+        return "document", path
+    resolved = shutil.which(command)
+    if resolved:
+        return "executable", resolved
+    return "url", command
+
+
+def command_args(app_info):
+    args = app_info.get("args") or []
+    if isinstance(args, str):
+        args = shlex.split(args, posix=not WINDOWS)
+    return [str(arg) for arg in args]
+
+
+def command_env(app_info):
+    env = app_info.get("env")
+    if not env:
+        return None
+    return dict(os.environ, **{str(key): str(value) for key, value in env.items()})
+
+
+class LaunchResult:
+    __slots__ = ("ok", "spawn_ms", "pid", "error", "exit_code", "runtime")
+
+    def __init__(self, ok, spawn_ms, pid=None, error=None):
+        self.ok = ok
+        self.spawn_ms = spawn_ms
+        self.pid = pid
+        self.error = error
+        self.exit_code = None
+        self.runtime = None
+
+
+def record_launch(app_info, result):
+    """Fold a launch result into the app's "launch_stats" (replaced, never mutated in place)."""
+    stats = dict(app_info.get("launch_stats") or {})
+    count = stats.get("count", 0) + 1
+    stats["count"] = count
+    stats["last_launch"] = time.time()
+    stats["last_spawn_ms"] = round(result.spawn_ms, 1)
+    average = stats.get("avg_spawn_ms", result.spawn_ms)
+    stats["avg_spawn_ms"] = round(average + (result.spawn_ms - average) / count, 1)
+    stats["last_error"] = result.error
+    stats["last_exit"] = None
+    if not result.ok:
+        stats["failures"] = stats.get("failures", 0) + 1
+    app_info["launch_stats"] = stats
+
+
+def record_exit(app_info, result):
+    stats = dict(app_info.get("launch_stats") or {})
+    stats["last_exit"] = result.exit_code
+    stats["last_runtime"] = round(result.runtime, 1)
+    if result.exit_code:
+        stats["failures"] = stats.get("failures", 0) + 1
+    app_info["launch_stats"] = stats
+
+
+def open_with_desktop(target):
+    """Hand a document, folder or URL to the desktop's default handler, without Qt."""
+    start = time.perf_counter()
+    try:
+        if WINDOWS:
+            os.startfile(target)
+            pid = None
+        else:
+            opener = "open" if sys.platform == "darwin" else "xdg-open"
+            pid = subprocess.Popen([opener, target], stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                                   stderr=subprocess.DEVNULL, close_fds=True, start_new_session=True).pid
+    except OSError as e:
+        return LaunchResult(False, (time.perf_counter() - start) * 1000, error=str(e))
+    return LaunchResult(True, (time.perf_counter() - start) * 1000, pid=pid)
+
+
+def launch_target(app_info, engine, on_exited=None):
+    """
+    Start an entry on the calling thread, whatever its command is: programs are spawned by
+    `engine`, documents and URLs handed to the desktop. Returns the LaunchResult.
+    """
+    command = app_info.get("command")
+    if not command:
+        return LaunchResult(False, 0.0, error="no command specified")
+    kind, target = classify_command(command)
+    if kind == "executable":
+        return engine.spawn(app_info, target, on_exited=on_exited)
+    return open_with_desktop(target)
+
+
+class LaunchEngine:
+    """
+    Spawns executables directly and asynchronously, with per-app argv, cwd and env.
+
+    Processes are started on a small thread pool so the caller never waits on fork/exec (or on
+    a slow filesystem), and each child is detached into its own session so it outlives the
+    launcher. `on_spawned(app_info, result)` is called from the pool once the process started
+    (or failed to), `on_exited(app_info, result)` from a waiter thread when it ends; both can
+    be overridden per launch, so several launcher windows can share one engine.
+    """
+
+    def __init__(self, on_spawned=None, on_exited=None, max_workers=4):
+        self.on_spawned = on_spawned
+        self.on_exited = on_exited
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="launch")
+
+    def launch(self, app_info, executable, on_spawned=None, on_exited=None):
+        return self._executor.submit(self.spawn, app_info, executable, on_spawned, on_exited)
+
+    def spawn(self, app_info, executable, on_spawned=None, on_exited=None):
+        on_spawned = on_spawned or self.on_spawned
+        on_exited = on_exited or self.on_exited
+        argv = [executable] + command_args(app_info)
+        cwd = app_info.get("cwd") or None
+        options = {}
+        if WINDOWS:
+            options["creationflags"] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+        else:
+            options["start_new_session"] = True
+        start = time.perf_counter()
+        try:
+            process = subprocess.Popen(argv, cwd=cwd, env=command_env(app_info), stdin=subprocess.DEVNULL,
+                                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, close_fds=True,
+                                       **options)
+        except (OSError, ValueError) as e:
+            result = LaunchResult(False, (time.perf_counter() - start) * 1000, error=str(e))
+            self._notify(on_spawned, app_info, result)
+            return result
+        result = LaunchResult(True, (time.perf_counter() - start) * 1000, pid=process.pid)
+        self._notify(on_spawned, app_info, result)
+        threading.Thread(target=self._wait, args=(process, app_info, result, start, on_exited),
+                         name="launch-wait", daemon=True).start()
+        return result
+
+    def _wait(self, process, app_info, result, start, on_exited):
+        result.exit_code = process.wait()
+        result.runtime = time.perf_counter() - start
+        self._notify(on_exited, app_info, result)
+
+    @staticmethod
+    def _notify(callback, app_info, result):
+        if callback is not None:
+            callback(app_info, result)
+
+    def shutdown(self, wait=False):
+        self._executor.shutdown(wait=wait)
+
+
+_shared_engine = None
+
+
+def shared_launch_engine():
+    global _shared_engine
+    if _shared_engine is None:
+        _shared_engine = LaunchEngine()
+    return _shared_engine
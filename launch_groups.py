@@ -0,0 +1,106 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from background import BackgroundJob
+from launch_engine import LaunchResult
+
+
+DEFAULT_PARALLEL = 3
+MAX_PARALLEL = 16
+
+
+class LaunchGroup:
+    """A named set of catalog entries (by record id) that are launched together."""
+
+    __slots__ = ("name", "members", "max_parallel", "stagger_ms")
+
+    def __init__(self, name, members=(), max_parallel=DEFAULT_PARALLEL, stagger_ms=0):
+        self.name = name
+        self.members = list(members)
+        self.max_parallel = min(max(int(max_parallel), 1), MAX_PARALLEL)
+        self.stagger_ms = max(int(stagger_ms), 0)
+
+    def __repr__(self):
+        return f"LaunchGroup({self.name!r}, {self.members!r})"
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["name"], [member for member in data.get("members", []) if isinstance(member, int)],
+                   data.get("max_parallel", DEFAULT_PARALLEL), data.get("stagger_ms", 0))
+
+    def to_dict(self):
+        return {"name": self.name, "members": list(self.members), "max_parallel": self.max_parallel,
+                "stagger_ms": self.stagger_ms}
+
+
+def load_groups(data):
+    """The launch groups stored in settings.json, skipping malformed entries."""
+    groups = []
+    for item in data or []:
+        try:
+            groups.append(LaunchGroup.from_dict(item))
+        except (KeyError, TypeError, ValueError):
+            continue
+    return groups
+
+
+def find_group(groups, name):
+    name = (name or "").strip().lower()
+    return next((group for group in groups if group.name.lower() == name), None)
+
+
+class GroupLaunch(BackgroundJob):
+    """
+    One start of a launch group, run on its own thread so the caller never waits on it.
+
+    Members are started in order by `start_member(app_info)`, which returns a LaunchResult:
+    at most `max_parallel` are being started at any time, and each start begins at least
+    `stagger_ms` after the previous one, so a group opened at login doesn't have every
+    member hit the disk at once. `on_member(app_info, result)` is called as each member has
+    started (or failed to), `on_finished(results)` once all have, with the (app_info, result)
+    pairs in member order. Both are called from the group's threads. cancel() starts no
+    further members; the ones already starting finish. `skipped` are the
+    (app_info, result) pairs of members the caller refused to start, kept for its report.
+    """
+
+    THREAD_NAME = "group-launch"
+
+    def __init__(self, group, apps, start_member, on_member=None, on_finished=None, skipped=()):
+        super().__init__()
+        self.group = group
+        self.apps = list(apps)
+        self.skipped = list(skipped)
+        self.start_member = start_member
+        self.on_member = on_member
+        self.on_finished = on_finished
+        self.results = [None] * len(self.apps)
+        self._slots = threading.BoundedSemaphore(group.max_parallel)
+
+    @property
+    def done(self):
+        return sum(result is not None for result in self.results)
+
+    def _run(self):
+        with ThreadPoolExecutor(max_workers=self.group.max_parallel, thread_name_prefix="group-member") as executor:
+            for position, app_info in enumerate(self.apps):
+                if position and self.group.stagger_ms and self._cancelled.wait(self.group.stagger_ms / 1000):
+                    break
+                self._slots.acquire()
+                if self._cancelled.is_set():
+                    self._slots.release()
+                    break
+                executor.submit(self._start, position, app_info)
+        if self.on_finished is not None:
+            self.on_finished([(app_info, result) for app_info, result in zip(self.apps, self.results)
+                              if result is not None])
+
+    def _start(self, position, app_info):
+        try:
+            result = self.start_member(app_info)
+        except OSError as e:
+            result = LaunchResult(False, 0.0, error=str(e))
+        finally:
+            self._slots.release()
+        self.results[position] = result
+        if self.on_member is not None:
+            self.on_member(app_info, result)
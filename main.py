@@ -1,83 +1,192 @@
+import time
+
+_START_TIME = time.perf_counter()
+
 import sys
-import json
+
+import ipc
+
+if __name__ == '__main__':
+    ARGS = ipc.parse_args(sys.argv[1:])
+    if ARGS.list or ARGS.search is not None or ARGS.import_paths:
+        # Answered from the settings file, without Qt
+        import cli
+        sys.exit(cli.run(ARGS))
+    # When a launcher is already running, hand it the request and exit before importing Qt
+    _REPLIES = [ipc.send_command(request) for request in ipc.requests_for_args(ARGS)]
+    if all(reply is not None for reply in _REPLIES):
+        for _reply in _REPLIES:
+            if _reply.startswith("error"):
+                print(_reply, file=sys.stderr)
+        sys.exit(1 if any(reply.startswith("error") for reply in _REPLIES) else 0)
+    if ARGS.quit or ARGS.reload:
+        # Only meaningful for a running launcher: never start one to serve them
+        print("no launcher running", file=sys.stderr)
+        sys.exit(1)
+    if (ARGS.launch or ARGS.group) and not ARGS.resident:
+        # Nothing running to forward to: launch it here, without building the GUI
+        import cli
+        sys.exit(cli.run(ARGS))
+
 import os
+import re
+import shlex
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QPushButton, QVBoxLayout, QHBoxLayout, QWidget,
     QMenu, QMessageBox, QLineEdit, QSizePolicy, QGridLayout, QDialog,
-    QFormLayout, QFileDialog, QSpacerItem, QLabel, QStyle
+    QFormLayout, QFileDialog, QSpacerItem, QLabel, QInputDialog, QProgressBar, QListWidget, QListWidgetItem,
+    QScrollArea, QSpinBox
+)
+from PyQt5.QtGui import QCursor, QPainter
+from PyQt5.QtGui import QDesktopServices
+from PyQt5.QtCore import (
+    Qt, QPropertyAnimation, QRect, QSize, QPoint, pyqtSignal, QEasingCurve, QUrl, QTimer, QObject, QRunnable,
+    QThreadPool, QEvent
 )
-from PyQt5.QtGui import QIcon, QCursor, QFont
-from PyQt5.QtCore import Qt, QPropertyAnimation, QRect, QSize, QPoint, pyqtSignal, QEasingCurve, QUrl
-from PyQt5.Qt import QDesktopServices
-import qtawesome as qta
+
+from icon_view import AppListModel, AppIconView, app_tooltip, paint_broken_badge, cell_size, ICON_SIZE, CELL_SPACING
+from search import SearchIndex, matching_keys
+from icons import add_icon_source, shared_icon_loader
+from themes import get_theme, load_theme_files, next_theme, theme_names
+from persistence import SETTINGS_FILE, SettingsStore, instance_settings_file, snapshot_app
+from frecency import FrecencyTracker
+from catalog import Catalog
+from ipc_server import CommandServer
+from importer import BulkImporter
+from desktop_indexer import shared_desktop_indexer
+from target_validator import shared_target_validator
+from launch_engine import (LaunchResult, classify_command, launch_target, record_launch, record_exit,
+                           shared_launch_engine)
+from launch_groups import GroupLaunch, LaunchGroup, MAX_PARALLEL, find_group, load_groups
+from warmup import BUDGET_MB, TOP_N, record_warm_launch, shared_warmup_service, warmup_report
+
+
+class StartupProfiler:
+    """Records the duration of each startup phase; printed with --startup-profile."""
+
+    def __init__(self, start):
+        self.start = start
+        self.last = start
+        self.phases = []
+        self.enabled = False
+
+    def mark(self, phase):
+        if any(name == phase for name, _ in self.phases):
+            return
+        now = time.perf_counter()
+        self.phases.append((phase, (now - self.last) * 1000))
+        self.last = now
+
+    def done(self, *phases):
+        names = {name for name, _ in self.phases}
+        return all(phase in names for phase in phases)
+
+    def report(self, stream=None):
+        stream = stream or sys.stderr
+        print("Startup profile (ms):", file=stream)
+        for name, elapsed in self.phases:
+            print(f"  {name:<16}{elapsed:9.1f}", file=stream)
+        print(f"  {'total':<16}{(self.last - self.start) * 1000:9.1f}", file=stream)
+
+
+STARTUP = StartupProfiler(_START_TIME)
+STARTUP.mark("imports")
 
 
 class AppIcon(QPushButton):
-    remove_requested = pyqtSignal(dict)
-    edit_requested = pyqtSignal(dict)
-    open_requested = pyqtSignal(dict)
+    remove_requested = pyqtSignal(object)
+    edit_requested = pyqtSignal(object)
+    open_requested = pyqtSignal(object)
+    menu_requested = pyqtSignal(object, object)
 
-    def __init__(self, app_info, parent=None):
+    def __init__(self, app_info, parent=None, icon_size=ICON_SIZE):
         super().__init__(parent)
         self.app_info = app_info
+        self.problem = None  # set while the command or icon target is missing
+        self.animation = None  # created on the first click, then reused
         self.setFlat(True)
         self.setCursor(QCursor(Qt.PointingHandCursor))
-        self.setToolTip(app_info["name"])
+        self.setToolTip(app_tooltip(app_info))
 
-        default_icon_path = "../../../Desktop/PyCharm/EasyGameLauncher/default_icon.png"
+        # The shared default icon stands in until the loader has decoded the real one
+        self.setIcon(shared_icon_loader(icon_size).icon(app_info.get("icon"), self.setIcon))
 
-        # Set icon, or use a default icon with proper size
-        icon_path = app_info.get("icon")
-        if icon_path and os.path.exists(icon_path):
-            self.setIcon(QIcon(icon_path))
-        else:
-            if os.path.exists(default_icon_path):
-                self.setIcon(QIcon(default_icon_path))
-            else:
-                default_icon = self.style().standardIcon(QStyle.SP_FileIcon).pixmap(64, 64)
-                resized_default_icon = default_icon.scaled(64, 64, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                self.setIcon(QIcon(resized_default_icon))
-
-        self.setIconSize(QSize(64, 64))  # Same size for all icons
-        self.setFixedSize(100, 100)
-        self.setStyleSheet("background-color: transparent; border: none;")
+        self.setIconSize(QSize(icon_size, icon_size))  # Same size for all icons
+        self.setFixedSize(cell_size(icon_size), cell_size(icon_size))
         self.clicked.connect(self.on_click)
 
+    def set_problem(self, problem):
+        self.setToolTip(app_tooltip(self.app_info, problem))
+        if problem != self.problem:
+            self.problem = problem
+            self.update()
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self.problem is not None:
+            icon_rect = QRect(QPoint(0, 0), self.iconSize())
+            icon_rect.moveCenter(self.rect().center())
+            painter = QPainter(self)
+            paint_broken_badge(painter, icon_rect)
+            painter.end()
+
     def on_click(self):
-        self.parent().parent().launch_application(self.app_info)
+        self.window().launch_application(self.app_info)
         self.animate_bounce()
 
     def contextMenuEvent(self, event):
         menu = QMenu(self)
-        main_window = self.parent().parent()
-        menu.setStyleSheet(main_window.get_menu_style())
         menu.addAction("Open").triggered.connect(lambda: self.open_requested.emit(self.app_info))
         menu.addAction("Edit").triggered.connect(lambda: self.edit_requested.emit(self.app_info))
         menu.addAction("Remove").triggered.connect(lambda: self.remove_requested.emit(self.app_info))
+        self.menu_requested.emit(menu, self.app_info)
         menu.exec_(self.mapToGlobal(event.pos()))
 
     def animate_bounce(self):
-        animation = QPropertyAnimation(self, b"geometry")
-        original = self.geometry()
-        animation.setDuration(500)
-        animation.setKeyValueAt(0, original)
-        animation.setKeyValueAt(0.25, QRect(original.x(), original.y() - 20, original.width(), original.height()))
-        animation.setKeyValueAt(0.5, original)
-        animation.setKeyValueAt(0.75, QRect(original.x(), original.y() - 10, original.width(), original.height()))
-        animation.setKeyValueAt(1, original)
-        animation.setEasingCurve(QEasingCurve.OutBounce)
-        animation.start()
-        self.animation = animation
-
-
-class AddEditIconDialog(QDialog):
-    def __init__(self, title, current_theme, prefill_data=None, parent=None):
+        if self.animation is None:
+            self.animation = QPropertyAnimation(self, b"geometry", self)
+            self.animation.setDuration(500)
+            self.animation.setEasingCurve(QEasingCurve.OutBounce)
+            original = self.geometry()
+        elif self.animation.state() == QPropertyAnimation.Running:
+            # Clicked again mid-bounce: bounce from where the grid put it, not from mid-air
+            original = self.animation.keyValueAt(0)
+            self.animation.stop()
+        else:
+            original = self.geometry()
+        self.animation.setKeyValueAt(0, original)
+        self.animation.setKeyValueAt(0.25, original.translated(0, -20))
+        self.animation.setKeyValueAt(0.5, original)
+        self.animation.setKeyValueAt(0.75, original.translated(0, -10))
+        self.animation.setKeyValueAt(1, original)
+        self.animation.start()
+
+
+class ThemedDialog(QDialog):
+    """Modal dialog in the launcher's theme; subclasses call apply_theme() once their widgets exist."""
+
+    def __init__(self, current_theme, parent=None):
         super().__init__(parent)
         self.current_theme = current_theme
-        self.setWindowTitle(title)
-        self.setFixedSize(400, 250)
         self.setWindowFlags(self.windowFlags() & ~Qt.WindowContextHelpButtonHint)  # Remove the "?" button
         self.setModal(True)
+
+    def apply_theme(self):
+        # Opened from a launcher window, the dialog already inherits the window's theme stylesheet
+        if self.parent() is None:
+            theme = get_theme(self.current_theme)
+            self.setStyleSheet(theme.stylesheet)
+            self.setPalette(theme.palette)
+
+
+class AddEditIconDialog(ThemedDialog):
+    # App entry fields edited by this dialog; anything else in the entry (launch stats...) is kept on edit
+    FIELDS = ("name", "command", "icon", "tags", "args", "cwd", "env")
+
+    def __init__(self, title, current_theme, prefill_data=None, parent=None):
+        super().__init__(current_theme, parent)
+        self.setWindowTitle(title)
+        self.setFixedSize(420, 400)
         self.setup_ui(prefill_data)
 
     def setup_ui(self, prefill_data):
@@ -85,6 +194,16 @@ class AddEditIconDialog(QDialog):
         self.name_input = QLineEdit(prefill_data.get("name", "") if prefill_data else "", self)
         self.command_input = QLineEdit(prefill_data.get("command", "") if prefill_data else "", self)
         self.icon_path_input = QLineEdit(prefill_data.get("icon", "") if prefill_data else "", self)
+        self.tags_input = QLineEdit(", ".join(prefill_data.get("tags", [])) if prefill_data else "", self)
+        self.tags_input.setPlaceholderText("Optional, comma separated")
+        args = prefill_data.get("args", []) if prefill_data else []
+        self.args_input = QLineEdit(args if isinstance(args, str) else shlex.join(args), self)
+        self.args_input.setPlaceholderText("Optional, as on a command line")
+        self.cwd_input = QLineEdit(prefill_data.get("cwd", "") if prefill_data else "", self)
+        self.cwd_input.setPlaceholderText("Optional")
+        env = prefill_data.get("env", {}) if prefill_data else {}
+        self.env_input = QLineEdit("; ".join(f"{key}={value}" for key, value in env.items()), self)
+        self.env_input.setPlaceholderText("Optional, KEY=VALUE; KEY2=VALUE2")
 
         icon_button = QPushButton("Select Icon", self)
         icon_button.clicked.connect(self.browse_icon)
@@ -107,95 +226,279 @@ class AddEditIconDialog(QDialog):
         layout.addRow("Application Name:", self.name_input)
         layout.addRow("Command:", self.command_input)
         layout.addRow("Icon Path:", icon_layout)
+        layout.addRow("Tags:", self.tags_input)
+        layout.addRow("Arguments:", self.args_input)
+        layout.addRow("Working Dir:", self.cwd_input)
+        layout.addRow("Environment:", self.env_input)
         layout.addRow("", buttons_layout)
 
         self.apply_theme()
 
-    def apply_theme(self):
-        if self.current_theme == "dark":
-            self.setStyleSheet("""
-                QDialog {
-                    background-color: #2e2e2e;
-                    color: #d3d3d3;
-                    border-radius: 10px;
-                }
-                QLabel {
-                    color: #d3d3d3;
-                }
-                QLineEdit {
-                    background-color: #3e3e3e;
-                    color: #d3d3d3;
-                    border: 1px solid #555;
-                    border-radius: 5px;
-                    padding: 5px;
-                }
-                QPushButton {
-                    background-color: #555555;
-                    color: #d3d3d3;
-                    border: none;
-                    padding: 8px 16px;
-                    border-radius: 5px;
-                }
-                QPushButton:hover {
-                    background-color: #666666;
-                }
-            """)
-        else:
-            self.setStyleSheet("""
-                QDialog {
-                    background-color: #f0f0f0;
-                    color: #333333;
-                    border-radius: 10px;
-                }
-                QLabel {
-                    color: #333333;
-                }
-                QLineEdit {
-                    background-color: white;
-                    color: #333333;
-                    border: 1px solid #ccc;
-                    border-radius: 5px;
-                    padding: 5px;
-                }
-                QPushButton {
-                    background-color: #e0e0e0;
-                    color: #333333;
-                    border: none;
-                    padding: 8px 16px;
-                    border-radius: 5px;
-                }
-                QPushButton:hover {
-                    background-color: #d0d0d0;
-                }
-            """)
-
     def browse_icon(self):
         icon_path, _ = QFileDialog.getOpenFileName(self, "Select Icon", "", "Image Files (*.png *.jpg *.bmp *.ico)")
         if icon_path:
             self.icon_path_input.setText(icon_path)
 
     def get_data(self):
-        return {
+        data = {
             "name": self.name_input.text(),
             "command": self.command_input.text(),
             "icon": self.icon_path_input.text()
         }
+        tags = [tag.strip() for tag in self.tags_input.text().split(",") if tag.strip()]
+        if tags:
+            data["tags"] = tags
+        try:
+            args = shlex.split(self.args_input.text())
+        except ValueError:
+            args = self.args_input.text().split()
+        if args:
+            data["args"] = args
+        if self.cwd_input.text().strip():
+            data["cwd"] = self.cwd_input.text().strip()
+        env = dict(item.strip().split("=", 1) for item in self.env_input.text().split(";") if "=" in item)
+        if env:
+            data["env"] = {key.strip(): value for key, value in env.items()}
+        return data
+
+
+class ImportReviewDialog(ThemedDialog):
+    """Single review step at the end of a bulk import: uncheck the entries to leave out."""
+
+    def __init__(self, apps, skipped, current_theme, parent=None):
+        super().__init__(current_theme, parent)
+        self.apps = apps
+        self.setWindowTitle("Review Import")
+        self.resize(420, 460)
+
+        layout = QVBoxLayout(self)
+        summary = f"{len(apps)} applications found"
+        if skipped:
+            summary += f", {skipped} already in the launcher or unreadable"
+        layout.addWidget(QLabel(summary, self))
+
+        self.list_widget = QListWidget(self)
+        for app_info in apps:
+            item = QListWidgetItem(f"{app_info['name']}  ({app_info['command']})")
+            item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+            item.setCheckState(Qt.Checked)
+            self.list_widget.addItem(item)
+        layout.addWidget(self.list_widget)
+
+        ok_button = QPushButton("Import", self)
+        cancel_button = QPushButton("Cancel", self)
+        ok_button.clicked.connect(self.accept)
+        cancel_button.clicked.connect(self.reject)
+        buttons_layout = QHBoxLayout()
+        buttons_layout.addSpacerItem(QSpacerItem(40, 20, QSizePolicy.Expanding, QSizePolicy.Minimum))
+        buttons_layout.addWidget(ok_button)
+        buttons_layout.addWidget(cancel_button)
+        layout.addLayout(buttons_layout)
+
+        self.apply_theme()
 
+    def rejected_apps(self):
+        return [app_info for row, app_info in enumerate(self.apps)
+                if self.list_widget.item(row).checkState() != Qt.Checked]
 
-class AppLauncher(QMainWindow):
-    SETTINGS_FILE = "../../../Desktop/PyCharm/EasyGameLauncher/settings.json"
 
-    def __init__(self):
+class LaunchGroupDialog(ThemedDialog):
+    """Creates or edits a launch group: its name, members, parallelism and stagger."""
+
+    def __init__(self, group, apps, current_theme, parent=None):
+        super().__init__(current_theme, parent)
+        self.group = group
+        self.apps = apps
+        self.setWindowTitle("Edit Launch Group" if group.name else "New Launch Group")
+        self.resize(420, 500)
+
+        layout = QFormLayout(self)
+        self.name_input = QLineEdit(group.name, self)
+        self.list_widget = QListWidget(self)
+        for app_info in apps:
+            item = QListWidgetItem(app_info.get("name", ""))
+            item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+            item.setCheckState(Qt.Checked if app_info.id in group.members else Qt.Unchecked)
+            self.list_widget.addItem(item)
+        self.parallel_input = QSpinBox(self)
+        self.parallel_input.setRange(1, MAX_PARALLEL)
+        self.parallel_input.setValue(group.max_parallel)
+        self.parallel_input.setToolTip("How many members may be starting at the same time")
+        self.stagger_input = QSpinBox(self)
+        self.stagger_input.setRange(0, 60000)
+        self.stagger_input.setSingleStep(250)
+        self.stagger_input.setSuffix(" ms")
+        self.stagger_input.setValue(group.stagger_ms)
+        self.stagger_input.setToolTip("Delay between the start of one member and the next")
+
+        ok_button = QPushButton("OK", self)
+        cancel_button = QPushButton("Cancel", self)
+        ok_button.clicked.connect(self.accept)
+        cancel_button.clicked.connect(self.reject)
+        buttons_layout = QHBoxLayout()
+        buttons_layout.addSpacerItem(QSpacerItem(40, 20, QSizePolicy.Expanding, QSizePolicy.Minimum))
+        buttons_layout.addWidget(ok_button)
+        buttons_layout.addWidget(cancel_button)
+
+        layout.addRow("Group Name:", self.name_input)
+        layout.addRow("Members:", self.list_widget)
+        layout.addRow("Max Parallel:", self.parallel_input)
+        layout.addRow("Stagger:", self.stagger_input)
+        layout.addRow("", buttons_layout)
+
+        self.apply_theme()
+
+    def get_group(self):
+        checked = {app_info.id for row, app_info in enumerate(self.apps)
+                   if self.list_widget.item(row).checkState() == Qt.Checked}
+        # Members keep their start order; newly checked ones start last, in grid order
+        members = [member for member in self.group.members if member in checked]
+        members += [app_info.id for app_info in self.apps if app_info.id in checked and app_info.id not in members]
+        return LaunchGroup(self.name_input.text().strip(), members, self.parallel_input.value(),
+                           self.stagger_input.value())
+
+
+class ImportSignals(QObject):
+    """Carries BulkImporter callbacks from its threads to the GUI thread."""
+    batch = pyqtSignal(object)
+    progress = pyqtSignal(int, int)
+    finished = pyqtSignal(int, int)
+
+
+class LaunchSignals(QObject):
+    """Carries LaunchEngine callbacks from its worker threads to the GUI thread."""
+    spawned = pyqtSignal(object, object)
+    exited = pyqtSignal(object, object)
+
+
+class GroupLaunchSignals(QObject):
+    """Carries GroupLaunch callbacks from its threads to the GUI thread."""
+    member = pyqtSignal(object, object)
+    finished = pyqtSignal(object)
+
+
+class SettingsSignals(QObject):
+    """Carries SettingsStore callbacks from its worker thread to the GUI thread."""
+    error = pyqtSignal(object)
+
+
+class SearchSignals(QObject):
+    finished = pyqtSignal(int, object)
+
+
+class SearchTask(QRunnable):
+    """Runs a SearchIndex query on the thread pool; results for a superseded generation are dropped."""
+
+    def __init__(self, index, query, generation, current_generation, boost=None):
+        super().__init__()
+        self.index = index
+        self.query = query
+        self.boost = boost
+        self.generation = generation
+        self.current_generation = current_generation
+        self.signals = SearchSignals()
+
+    def run(self):
+        cancelled = lambda: self.current_generation() != self.generation
+        results = self.index.search(self.query, cancelled, self.boost)
+        if not cancelled():
+            self.signals.finished.emit(self.generation, results)
+
+
+class AppLauncher(QMainWindow):
+    SETTINGS_FILE = SETTINGS_FILE
+    # In "auto" view mode catalogs larger than this use the virtualized view
+    VIRTUAL_VIEW_THRESHOLD = 500
+    # Delay after the last keystroke before the search runs
+    SEARCH_DEBOUNCE_MS = 60
+    # Catalogs at least this large are matched off the GUI thread
+    SEARCH_THREAD_THRESHOLD = 2000
+    # Idle time after the last change before settings are written
+    SAVE_DELAY_MS = 500
+    # Icons built per event-loop tick while the grid is filled in at startup
+    POPULATE_BATCH = 48
+    # Fields of an indexed .desktop entry that a rescan keeps up to date
+    DESKTOP_FIELDS = ("name", "command", "icon", "args", "cwd", "tags")
+    # Margin around the window content
+    CONTENT_MARGIN = 15
+    # Relayouts while the window is dragged wider or narrower are coalesced to one per frame
+    RELAYOUT_INTERVAL_MS = 16
+    # With warm-up on, the frequent apps are pre-read once the launcher has been idle this long,
+    # and again at this interval while it stays idle
+    WARMUP_IDLE_MS = 30 * 1000
+    WARMUP_INTERVAL_MS = 10 * 60 * 1000
+    # Icon sizes offered in the context menu
+    ICON_SIZES = (("Small", 48), ("Medium", ICON_SIZE), ("Large", 96))
+
+    def __init__(self, settings_file=None, instance_name="default", manager=None):
         super().__init__()
+        self.settings_file = settings_file or self.SETTINGS_FILE
+        self.instance_name = instance_name
+        self.manager = manager
         self.current_theme = "light"
-        self.all_apps = []
+        self.catalog = Catalog()
+        self.catalog.subscribe(self.on_catalog_changed)
         self.window_width = 700
         self.window_title = "Application Launcher"
+        self.view_mode = "auto"
+        self.sort_mode = "manual"
+        self.icon_size = ICON_SIZE
+        self.icon_columns = 0  # columns of the widget grid as last laid out
+        self.shown_apps = ([], False)  # arguments of the last display_icons, replayed on relayout
+        self.index_desktop_entries = False
+        self.desktop_hidden = []  # desktop ids of indexed entries the user removed
+        self.desktop_indexer = None  # set while this window follows the .desktop index
+        self.resident = False  # Closing the window only hides it, the process keeps serving commands
+        self.frecency = FrecencyTracker()
+        self.icon_widgets = {}  # record id -> AppIcon, kept alive across rebuilds
+        self.icon_positions = {}  # record id -> (row, col) of the widgets currently in the grid
+        self.search_index = SearchIndex()
+        self.search_generation = 0
+        self.settings_signals = SettingsSignals(self)
+        self.settings_signals.error.connect(self.on_settings_error)
+        self.settings_error = None  # OSError of the failing settings writes, reported once until one succeeds
+        self.settings_store = SettingsStore(self.settings_file, on_error=self.settings_signals.error.emit)
+        self.save_timer = QTimer(self)
+        self.save_timer.setSingleShot(True)
+        self.save_timer.setInterval(self.SAVE_DELAY_MS)
+        self.save_timer.timeout.connect(self.write_settings)
+        self._pending_width = None  # width the user is dragging to, applied by relayout
+        self.relayout_timer = QTimer(self)
+        self.relayout_timer.setSingleShot(True)
+        self.relayout_timer.setInterval(self.RELAYOUT_INTERVAL_MS)
+        self.relayout_timer.timeout.connect(self.relayout)
+        self._populate_count = None
+        self.importer = None
+        self.imported_apps = []
+        self.launch_groups = []
+        self.group_launches = []  # GroupLaunch runs still starting members
+        self.launch_signals = LaunchSignals(self)
+        self.launch_signals.spawned.connect(self.on_launch_spawned)
+        self.launch_signals.exited.connect(self.on_launch_exited)
+        self.launch_engine = shared_launch_engine()
+        self.target_validator = shared_target_validator()
+        self.target_validator.status_changed.connect(self.refresh_target_status)
+        self.warmup_enabled = False
+        self.warmup_top_n = TOP_N
+        self.warmup_budget_mb = BUDGET_MB
+        self.warmup = shared_warmup_service()
+        self.warmup_timer = QTimer(self)
+        self.warmup_timer.setSingleShot(True)
+        self.warmup_timer.timeout.connect(self.run_warmup)
         self.load_settings()
+        self.load_themes()
+        self.icon_loader = shared_icon_loader(self.icon_size)
+        add_icon_source(self.icon_paths)
+        STARTUP.mark("settings load")
         self.setup_ui()
         self.setup_window()
         self.apply_theme()
         self.center_window()
+        STARTUP.mark("window shell")
+        self.installEventFilter(self)
+        if self.index_desktop_entries:
+            self.start_desktop_indexing()
+        self.schedule_warmup()
         self._is_dragging = False
         self._drag_position = QPoint()
         self._is_resizing = False
@@ -214,7 +517,7 @@ class AppLauncher(QMainWindow):
 
     def setup_ui(self):
         main_layout = QVBoxLayout()
-        main_layout.setContentsMargins(15, 15, 15, 15)
+        main_layout.setContentsMargins(*(self.CONTENT_MARGIN,) * 4)
         main_layout.setSpacing(10)
 
         header_layout = QHBoxLayout()
@@ -222,6 +525,7 @@ class AppLauncher(QMainWindow):
         header_layout.setSpacing(10)
 
         self.title_label = QLabel(self.window_title)
+        self.title_label.setObjectName("title_label")
         font = self.title_label.font()
         font.setPointSize(12)
         self.title_label.setFont(font)
@@ -236,28 +540,25 @@ class AppLauncher(QMainWindow):
 
         button_size = QSize(24, 24)
         self.theme_button = QPushButton()
-        self.theme_button.setIcon(qta.icon('fa.lightbulb-o', color='white'))
         self.theme_button.setIconSize(button_size)
         self.theme_button.setFixedSize(24, 24)
-        self.theme_button.setStyleSheet("background-color: transparent; border: none;")
+        self.theme_button.setObjectName("header_button")
         self.theme_button.setCursor(QCursor(Qt.PointingHandCursor))
         self.theme_button.clicked.connect(self.toggle_theme)
         header_layout.addWidget(self.theme_button)
 
         self.add_icon_button = QPushButton()
-        self.add_icon_button.setIcon(qta.icon('fa.plus', color='white'))
         self.add_icon_button.setIconSize(button_size)
         self.add_icon_button.setFixedSize(24, 24)
-        self.add_icon_button.setStyleSheet("background-color: transparent; border: none;")
+        self.add_icon_button.setObjectName("header_button")
         self.add_icon_button.setCursor(QCursor(Qt.PointingHandCursor))
         self.add_icon_button.clicked.connect(self.open_add_icon_dialog)
         header_layout.addWidget(self.add_icon_button)
 
         self.close_button = QPushButton()
-        self.close_button.setIcon(qta.icon('fa.close', color='white'))
         self.close_button.setIconSize(button_size)
         self.close_button.setFixedSize(24, 24)
-        self.close_button.setStyleSheet("background-color: transparent; border: none;")
+        self.close_button.setObjectName("header_button")
         self.close_button.setCursor(QCursor(Qt.PointingHandCursor))
         self.close_button.clicked.connect(self.close)
         header_layout.addWidget(self.close_button)
@@ -265,18 +566,21 @@ class AppLauncher(QMainWindow):
         main_layout.addLayout(header_layout)
 
         self.search_bar = QLineEdit()
+        self.search_bar.setObjectName("search_bar")
         self.search_bar.setPlaceholderText("Search...")
-        self.search_bar.setStyleSheet("""
-            QLineEdit {
-                padding: 10px;
-                font-size: 18px;
-                background-color: rgba(255, 255, 255, 220);
-                border-radius: 10px;
-            }
-        """)
-        self.search_bar.textChanged.connect(self.filter_icons)
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(self.SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.filter_icons)
+        self.search_bar.textChanged.connect(self.schedule_search)
         main_layout.addWidget(self.search_bar)
 
+        self.import_progress = QProgressBar()
+        self.import_progress.setTextVisible(True)
+        self.import_progress.setFixedHeight(16)
+        self.import_progress.hide()
+        main_layout.addWidget(self.import_progress)
+
         self.no_icons_label = QLabel("Drag files here or use the + button to add new icons.")
         self.no_icons_label.setAlignment(Qt.AlignCenter)
         self.no_icons_label.setStyleSheet("""
@@ -287,12 +591,34 @@ class AppLauncher(QMainWindow):
         self.no_icons_label.hide()
         main_layout.addWidget(self.no_icons_label)
 
-        self.icon_layout = QGridLayout()
+        # Past the height limit the grid scrolls instead of growing the window
+        self.icon_container = QWidget()
+        self.icon_container.setObjectName("icon_container")
+        self.icon_layout = QGridLayout(self.icon_container)
+        self.icon_layout.setContentsMargins(0, 0, 0, 0)
         self.icon_layout.setAlignment(Qt.AlignTop)
-        self.icon_layout.setSpacing(20)
-        main_layout.addLayout(self.icon_layout)
-
-        self.display_icons(self.all_apps)
+        self.icon_layout.setSpacing(CELL_SPACING)
+        self.icon_scroll = QScrollArea()
+        self.icon_scroll.setObjectName("icon_scroll")
+        self.icon_scroll.viewport().setObjectName("icon_viewport")
+        self.icon_scroll.setWidgetResizable(True)
+        self.icon_scroll.setFrameShape(QScrollArea.NoFrame)
+        self.icon_scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.icon_scroll.setWidget(self.icon_container)
+        main_layout.addWidget(self.icon_scroll)
+
+        self.app_model = AppListModel(self.app_icon, self, self.target_validator.problem)
+        self.icon_view = AppIconView(self.app_model, self, self.icon_size)
+        self.icon_view.launch_requested.connect(self.launch_application)
+        self.icon_view.open_requested.connect(self.launch_application)
+        self.icon_view.edit_requested.connect(self.edit_application)
+        self.icon_view.remove_requested.connect(self.remove_application)
+        self.icon_view.menu_requested.connect(self.add_group_actions)
+        self.icon_view.hide()
+        self.icon_loader.icon_loaded.connect(self.icon_view.viewport().update)
+        main_layout.addWidget(self.icon_view)
+
+        self.populate_icons()
 
         central_widget = QWidget()
         central_widget.setLayout(main_layout)
@@ -305,15 +631,12 @@ class AppLauncher(QMainWindow):
         """
         Mostra le icone delle applicazioni basate sulla lista fornita.
 
+        I widget AppIcon esistenti vengono riutilizzati: solo le celle cambiate
+        vengono spostate, nascoste o create.
+
         :param apps: Lista delle applicazioni da visualizzare.
         :param filtering: Se True, indica che stiamo filtrando le icone, quindi la barra di ricerca deve sempre essere visibile.
         """
-        # Rimuove le icone esistenti
-        for i in reversed(range(self.icon_layout.count())):
-            widget = self.icon_layout.itemAt(i).widget()
-            if widget:
-                widget.setParent(None)
-
         if not apps:
             # Se non ci sono icone
             self.no_icons_label.show()
@@ -327,97 +650,550 @@ class AppLauncher(QMainWindow):
 
             self.no_icons_label.hide()
 
-            # Aggiunge le nuove icone in una griglia
-            num_columns = 6
+        self.shown_apps = (apps, filtering)
+        if self.use_virtual_view():
+            self._populate_count = None
+            # The virtualized view only lays out and paints the visible rows, no widget per app
+            self.clear_icon_widgets()
+            self.icon_scroll.hide()
+            self.app_model.set_apps(apps)
+            self.icon_view.show()
+            self.adjust_window_height()
+            return
+
+        self.icon_view.hide()
+        self.icon_scroll.show()
+        if self.app_model.rowCount():
+            self.app_model.set_apps([])
+
+        self._populate_count = None
+        self.setUpdatesEnabled(False)
+        try:
+            # Patch the grid in place: reuse live widgets, move only the cells whose position changed
+            num_columns = self.icon_columns = self.grid_columns()
+            visible = set()
             for index, app in enumerate(apps):
-                row, col = divmod(index, num_columns)
-                icon = AppIcon(app, self)
-                icon.remove_requested.connect(self.remove_application)
-                icon.edit_requested.connect(self.edit_application)
-                icon.open_requested.connect(self.launch_application)
-                self.icon_layout.addWidget(icon, row, col)
+                key = app.id
+                icon = self.get_icon_widget(app)
+                position = divmod(index, num_columns)
+                if self.icon_positions.get(key) != position:
+                    self.icon_layout.removeWidget(icon)
+                    self.icon_layout.addWidget(icon, *position)
+                    self.icon_positions[key] = position
+                    icon.show()
+                visible.add(key)
+
+            # Take widgets that are no longer shown out of the grid, but keep them alive
+            for key in [key for key in self.icon_positions if key not in visible]:
+                icon = self.icon_widgets[key]
+                self.icon_layout.removeWidget(icon)
+                icon.hide()
+                del self.icon_positions[key]
+        finally:
+            self.setUpdatesEnabled(True)
 
         self.adjust_window_height()
 
+    def populate_icons(self):
+        # Build the grid a batch per event-loop tick so the window appears before every icon exists
+        if self.use_virtual_view() or len(self.catalog) <= self.POPULATE_BATCH:
+            self.display_icons(self.ordered_apps())
+            self.on_icons_populated()
+            return
+        self._populate_order = self.ordered_apps()
+        self._populate_count = 0
+        self._populate_step()
+
+    def _populate_step(self):
+        if self._populate_count is None:
+            # Superseded by a full display_icons (search, add, remove...)
+            return
+        apps = self._populate_order
+        count = min(self._populate_count + self.POPULATE_BATCH, len(apps))
+        self.display_icons(apps[:count])
+        if count < len(apps):
+            self._populate_count = count
+            QTimer.singleShot(0, self._populate_step)
+        else:
+            self.on_icons_populated()
+
+    def on_icons_populated(self):
+        STARTUP.mark("widget build")
+        self.report_startup()
+
+    def report_startup(self):
+        if STARTUP.enabled and STARTUP.done("widget build", "first paint"):
+            STARTUP.report()
+            STARTUP.enabled = False
+
+    def eventFilter(self, obj, event):
+        if obj is self and event.type() == QEvent.Paint:
+            self.removeEventFilter(self)
+            STARTUP.mark("first paint")
+            self.report_startup()
+        return super().eventFilter(obj, event)
+
+    def ordered_apps(self):
+        """The catalog in display order: insertion order, or most frecent first."""
+        if self.sort_mode == "frecency":
+            return self.frecency.ordered(self.catalog.records(), self.frecency_key)
+        return self.catalog.records()
+
+    @staticmethod
+    def frecency_key(app_info):
+        return app_info.get("command", "")
+
+    def search_boosts(self):
+        """{app id: frecency boost} of the apps that have been launched, for SearchIndex.search."""
+        boosts = {}
+        for key, points in self.frecency.boosts().items():
+            for app_info in self.catalog.by_command(key):
+                if self.frecency_key(app_info) == key:
+                    boosts[app_info.id] = points
+        return boosts
+
+    def set_sort_mode(self, sort_mode):
+        self.sort_mode = sort_mode
+        self.filter_icons()
+        self.save_settings({"op": "set", "key": "sort_mode", "value": sort_mode})
+
+    def contextMenuEvent(self, event):
+        if event.pos().y() <= 60:
+            # The header has its own right-click behaviour (title editing)
+            return
+        menu = QMenu(self)
+        themes_menu = menu.addMenu("Theme")
+        for name in theme_names():
+            action = themes_menu.addAction(name.capitalize())
+            action.setCheckable(True)
+            action.setChecked(name == self.current_theme)
+            action.triggered.connect(lambda _, name=name: self.set_theme(name))
+        sort_action = menu.addAction("Sort by Frecency")
+        sort_action.setCheckable(True)
+        sort_action.setChecked(self.sort_mode == "frecency")
+        sort_action.toggled.connect(lambda checked: self.set_sort_mode("frecency" if checked else "manual"))
+        sizes_menu = menu.addMenu("Icon Size")
+        for label, size in self.ICON_SIZES:
+            action = sizes_menu.addAction(label)
+            action.setCheckable(True)
+            action.setChecked(size == self.icon_size)
+            action.triggered.connect(lambda _, size=size: self.set_icon_size(size))
+        if sys.platform.startswith("linux"):
+            desktop_action = menu.addAction("Index System Applications")
+            desktop_action.setCheckable(True)
+            desktop_action.setChecked(self.index_desktop_entries)
+            desktop_action.toggled.connect(self.set_desktop_indexing)
+        warmup_action = menu.addAction("Warm Up Frequent Apps")
+        warmup_action.setCheckable(True)
+        warmup_action.setChecked(self.warmup_enabled)
+        warmup_action.toggled.connect(self.set_warmup)
+        menu.addAction("Warm-up Report...").triggered.connect(self.show_warmup_report)
+        groups_menu = menu.addMenu("Launch Group")
+        for group in self.launch_groups:
+            groups_menu.addAction(group.name).triggered.connect(lambda _, group=group: self.launch_group(group))
+        if self.launch_groups:
+            groups_menu.addSeparator()
+            edit_menu = groups_menu.addMenu("Edit Group")
+            delete_menu = groups_menu.addMenu("Delete Group")
+            for group in self.launch_groups:
+                edit_menu.addAction(group.name).triggered.connect(lambda _, group=group: self.edit_launch_group(group))
+                delete_menu.addAction(group.name).triggered.connect(
+                    lambda _, group=group: self.delete_launch_group(group))
+        groups_menu.addAction("New Group...").triggered.connect(lambda: self.edit_launch_group(None))
+        if self.manager is not None:
+            menu.addSeparator()
+            instances_menu = menu.addMenu("Open Instance")
+            for name in self.manager.known_instances():
+                action = instances_menu.addAction(name)
+                action.setCheckable(True)
+                action.setChecked(name == self.instance_name)
+                action.triggered.connect(lambda _, name=name: self.manager.open_instance(name))
+            menu.addAction("New Instance...").triggered.connect(self.new_instance)
+        menu.exec_(event.globalPos())
+
+    def set_desktop_indexing(self, enabled):
+        self.index_desktop_entries = enabled
+        if enabled:
+            self.start_desktop_indexing()
+        else:
+            self.stop_desktop_indexing()
+            self.remove_applications([app for app in self.catalog
+                                      if app.get("desktop_id") and not app.get("desktop_edited")], save=False)
+        self.save_settings()
+
+    def set_warmup(self, enabled):
+        self.warmup_enabled = enabled
+        self.schedule_warmup()
+        if not enabled:
+            # Stop reading now rather than at the end of the pass
+            self.warmup.cancel()
+        self.save_settings({"op": "set", "key": "warmup", "value": enabled})
+
+    def schedule_warmup(self):
+        """(Re)start the idle countdown to the next warm-up; called at startup and after every launch."""
+        if self.warmup_enabled:
+            self.warmup_timer.start(self.WARMUP_IDLE_MS)
+        else:
+            self.warmup_timer.stop()
+
+    def run_warmup(self):
+        # The most frecent entries are the likeliest next launches
+        targets = []
+        for key in self.frecency.ranked():
+            if len(targets) >= self.warmup_top_n:
+                break
+            apps = self.catalog.by_command(key)
+            if apps:
+                targets.append((apps[0].get("command"), apps[0].get("icon")))
+        self.warmup.budget_mb = self.warmup_budget_mb
+        self.warmup.request(targets)
+        self.warmup_timer.start(self.WARMUP_INTERVAL_MS)
+
+    def show_warmup_report(self):
+        report = warmup_report(self.catalog)
+        if not report["apps"]:
+            QMessageBox.information(self, "Warm-up Report", "No application has been launched both warmed up and "
+                                                            "cold yet.")
+            return
+        lines = [f"{row['name']}: {row['cold_ms']:.1f} ms cold ({row['cold_count']}), "
+                 f"{row['warm_ms']:.1f} ms warm ({row['warm_count']})" for row in report["apps"]]
+        QMessageBox.information(self, "Warm-up Report",
+                                f"Median time to start saved by warming up: {report['median_saved_ms']:.1f} ms\n\n"
+                                + "\n".join(lines))
+
+    def start_desktop_indexing(self):
+        if self.desktop_indexer is None:
+            self.desktop_indexer = shared_desktop_indexer()
+            self.desktop_indexer.entries_changed.connect(self.sync_desktop_entries)
+        if self.desktop_indexer.entries is None:
+            self.desktop_indexer.scan()
+        else:
+            self.sync_desktop_entries(self.desktop_indexer.entries)
+
+    def stop_desktop_indexing(self):
+        if self.desktop_indexer is not None:
+            self.desktop_indexer.entries_changed.disconnect(self.sync_desktop_entries)
+            self.desktop_indexer = None
+
+    def sync_desktop_entries(self, entries):
+        """Merge the indexed .desktop entries into the catalog: add the new ones, refresh or drop the rest."""
+        indexed = {app["desktop_id"]: app for app in self.catalog if app.get("desktop_id")}
+        hidden = set(self.desktop_hidden)
+        removed = [app for desktop_id, app in indexed.items()
+                   if desktop_id not in entries and not app.get("desktop_edited")]
+        added = []
+        changed = False
+        for desktop_id, entry in entries.items():
+            app_info = indexed.get(desktop_id)
+            if app_info is None:
+                # An entry the user added by hand for the same program wins
+                if desktop_id not in hidden and not any(not app.get("desktop_id")
+                                                        for app in self.catalog.by_command(entry["command"])):
+                    added.append(dict(entry))
+            elif not app_info.get("desktop_edited") and any(
+                    app_info.get(key) != entry.get(key) for key in self.DESKTOP_FIELDS):
+                # Updated in place, so launch stats and frecency stay attached
+                self.catalog.update(app_info, {key: entry[key] for key in self.DESKTOP_FIELDS if key in entry},
+                                    clear=self.DESKTOP_FIELDS)
+                changed = True
+        if removed:
+            self.remove_applications(removed, save=False)
+        if added:
+            self.add_applications(added, save=False)
+        elif changed and not removed:
+            self.filter_icons()
+        if removed or added or changed:
+            self.save_settings()
+
+    def new_instance(self):
+        name, ok = QInputDialog.getText(self, "New Instance", "Instance name:")
+        if ok and name.strip():
+            self.manager.open_instance(name.strip())
+
+    def use_virtual_view(self):
+        if self.view_mode == "virtual":
+            return True
+        if self.view_mode == "grid":
+            return False
+        return len(self.catalog) > self.VIRTUAL_VIEW_THRESHOLD
+
+    def app_icon(self, app_info):
+        # Rows whose icon is still loading get repainted when icon_loaded fires
+        return self.icon_loader.icon(app_info.get("icon"))
+
+    def clear_icon_widgets(self):
+        for app_info in [icon.app_info for icon in self.icon_widgets.values()]:
+            self.discard_icon_widget(app_info)
+
+    def get_icon_widget(self, app_info):
+        icon = self.icon_widgets.get(app_info.id)
+        if icon is not None and icon.app_info is app_info:
+            return icon
+        if icon is not None:
+            # A reload replaced the record, the old widget is stale
+            self.discard_icon_widget(icon.app_info)
+        icon = AppIcon(app_info, self.icon_container, self.icon_size)
+        icon.remove_requested.connect(self.remove_application)
+        icon.edit_requested.connect(self.edit_application)
+        icon.open_requested.connect(self.launch_application)
+        icon.menu_requested.connect(self.add_group_actions)
+        icon.set_problem(self.target_validator.problem(app_info))
+        icon.hide()
+        self.icon_widgets[app_info.id] = icon
+        return icon
+
+    def discard_icon_widget(self, app_info):
+        key = app_info.id
+        icon = self.icon_widgets.pop(key, None)
+        if icon is None:
+            return
+        self.icon_positions.pop(key, None)
+        self.icon_layout.removeWidget(icon)
+        icon.hide()
+        icon.deleteLater()
+
     def launch_application(self, app_info):
         command = app_info.get("command")
-        if command:
-            if os.path.exists(command):
-                QDesktopServices.openUrl(QUrl.fromLocalFile(command))
+        if not command:
+            QMessageBox.critical(self, "Error", "No command specified.")
+            return
+        status = self.target_validator.command_status(command)
+        if status is None:
+            # Not checked yet: resolve it here, the background check will follow
+            kind, target = classify_command(command)
+        elif not status.ok:
+            # It may have come back since the last check
+            self.target_validator.invalidate(command)
+            QMessageBox.warning(self, "Launch Failed", f"Could not start {app_info['name']}: {status.error}")
+            return
+        else:
+            kind, target = status.kind, status.target
+        self.schedule_warmup()
+        # Only the moved entry is repositioned; the grid itself is reordered on its next refresh
+        self.frecency.record(self.frecency_key(app_info))
+        if kind == "executable":
+            # Spawned on the launch engine's pool, on_launch_spawned reports back
+            self.launch_engine.launch(app_info, target, self.launch_signals.spawned.emit,
+                                      self.launch_signals.exited.emit)
+            return
+        # URLs and documents still go through the desktop's handler
+        start = time.perf_counter()
+        url = QUrl.fromLocalFile(target) if kind == "document" else QUrl(command)
+        ok = QDesktopServices.openUrl(url)
+        result = LaunchResult(ok, (time.perf_counter() - start) * 1000, error=None if ok else "no handler")
+        self.on_launch_spawned(app_info, result)
+
+    def on_launch_spawned(self, app_info, result):
+        record_launch(app_info, result)
+        if self.warmup_enabled:
+            # Only launches with warm-up on are compared: with it off every launch would count as cold
+            record_warm_launch(app_info, result, self.warmup.is_warm(app_info.get("command")))
+        self.refresh_app_tooltip(app_info)
+        self.save_settings()
+        if not result.ok:
+            # The cached status said it was there; check again whether it still is
+            self.target_validator.invalidate(app_info.get("command") or "")
+            QMessageBox.warning(self, "Launch Failed", f"Could not start {app_info['name']}: {result.error}")
+
+    def on_launch_exited(self, app_info, result):
+        record_exit(app_info, result)
+        self.refresh_app_tooltip(app_info)
+        self.save_settings()
+
+    def add_group_actions(self, menu, app_info):
+        """Group entries of an icon's context menu: start a group it is in, or add it to one."""
+        menu.addSeparator()
+        for group in self.launch_groups:
+            if app_info.id in group.members:
+                menu.addAction(f"Launch Group {group.name}").triggered.connect(
+                    lambda _, group=group: self.launch_group(group))
+        add_menu = menu.addMenu("Add to Group")
+        for group in self.launch_groups:
+            action = add_menu.addAction(group.name)
+            action.setEnabled(app_info.id not in group.members)
+            action.triggered.connect(lambda _, group=group: self.add_to_launch_group(group, app_info))
+        add_menu.addAction("New Group...").triggered.connect(
+            lambda: self.edit_launch_group(LaunchGroup("", [app_info.id])))
+
+    def launch_group(self, group):
+        """Start the members of a group on a background thread, reporting each one as it starts."""
+        apps = [app_info for app_info in map(self.catalog.get, group.members) if app_info is not None]
+        failed = []
+        runnable = []
+        for app_info in apps:
+            status = self.target_validator.command_status(app_info.get("command") or "")
+            if status is not None and not status.ok:
+                # Known to be missing: reported with the others, without trying
+                self.target_validator.invalidate(app_info.get("command") or "")
+                failed.append((app_info, LaunchResult(False, 0.0, error=status.error)))
             else:
-                QDesktopServices.openUrl(QUrl(command))
+                self.frecency.record(self.frecency_key(app_info))
+                runnable.append(app_info)
+        signals = GroupLaunchSignals(self)
+        run = GroupLaunch(group, runnable,
+                          lambda app_info: launch_target(app_info, self.launch_engine, self.launch_signals.exited.emit),
+                          signals.member.emit, signals.finished.emit, failed)
+        signals.member.connect(lambda app_info, result: self.on_group_member(run, app_info, result))
+        signals.finished.connect(lambda results: self.on_group_finished(run, results))
+        self.group_launches.append(run)
+        self.show_group_progress(run)
+        self.schedule_warmup()
+        run.start()
+        return run
+
+    def on_group_member(self, run, app_info, result):
+        record_launch(app_info, result)
+        if self.warmup_enabled:
+            record_warm_launch(app_info, result, self.warmup.is_warm(app_info.get("command")))
+        self.refresh_app_tooltip(app_info)
+        if not result.ok:
+            self.target_validator.invalidate(app_info.get("command") or "")
+        self.show_group_progress(run)
+
+    def on_group_finished(self, run, results):
+        if run in self.group_launches:
+            self.group_launches.remove(run)
+        if self.importer is None:
+            self.import_progress.hide()
+        self.save_settings()
+        failures = [(app_info, result) for app_info, result in run.skipped + results if not result.ok]
+        if failures:
+            lines = "\n".join(f"{app_info.get('name', '')}: {result.error}" for app_info, result in failures)
+            QMessageBox.warning(self, "Launch Group",
+                                f"{len(failures)} of {len(run.skipped) + len(run.apps)} members of "
+                                f"{run.group.name} could not be started:\n\n{lines}")
+
+    def show_group_progress(self, run):
+        # The progress bar is shared with bulk imports, which take precedence
+        if self.importer is not None:
+            return
+        self.import_progress.setRange(0, max(len(run.apps), 1))
+        self.import_progress.setValue(run.done)
+        self.import_progress.setFormat(f"Starting {run.group.name}... {run.done}/{len(run.apps)}")
+        self.import_progress.show()
+
+    def edit_launch_group(self, group):
+        """Open the group dialog for `group`, or for a new group when it is None or not stored yet."""
+        group = group or LaunchGroup("")
+        dialog = LaunchGroupDialog(group, self.catalog.records(), self.current_theme, self)
+        if dialog.exec_() != QDialog.Accepted:
+            return
+        updated = dialog.get_group()
+        if not updated.name or not updated.members:
+            QMessageBox.warning(self, "Incomplete Input", "A launch group needs a name and at least one member.")
+            return
+        existing = find_group(self.launch_groups, updated.name)
+        if existing is not None and existing is not group:
+            QMessageBox.warning(self, "Launch Group", f"There already is a group named {updated.name}.")
+            return
+        if group in self.launch_groups:
+            self.launch_groups[self.launch_groups.index(group)] = updated
         else:
-            QMessageBox.critical(self, "Error", "No command specified.")
+            self.launch_groups.append(updated)
+        self.save_launch_groups()
+
+    def add_to_launch_group(self, group, app_info):
+        group.members.append(app_info.id)
+        self.save_launch_groups()
+
+    def delete_launch_group(self, group):
+        self.launch_groups.remove(group)
+        self.save_launch_groups()
+
+    def save_launch_groups(self):
+        self.save_settings({"op": "set", "key": "launch_groups",
+                            "value": [group.to_dict() for group in self.launch_groups]})
+
+    def refresh_app_tooltip(self, app_info):
+        icon = self.icon_widgets.get(app_info.id)
+        if icon is not None and icon.app_info is app_info:
+            icon.setToolTip(app_tooltip(app_info, self.target_validator.problem(app_info)))
+
+    def refresh_target_status(self):
+        """Update the broken badges after the validator found a target missing or back."""
+        for icon in self.icon_widgets.values():
+            icon.set_problem(self.target_validator.problem(icon.app_info))
+        self.icon_view.viewport().update()
+
+    def schedule_search(self):
+        # Invalidate any query still running and restart the debounce
+        self.search_generation += 1
+        self.search_timer.start()
 
     def filter_icons(self):
-        search_text = self.search_bar.text().lower()
-        filtered = [app for app in self.all_apps if search_text in app["name"].lower()]
+        self.search_timer.stop()
+        self.search_generation += 1
+        query = self.search_bar.text()
+        if len(self.search_index) >= self.SEARCH_THREAD_THRESHOLD and query.strip():
+            task = SearchTask(self.search_index, query, self.search_generation, lambda: self.search_generation,
+                              self.search_boosts())
+            task.signals.finished.connect(self.on_search_finished)
+            QThreadPool.globalInstance().start(task)
+        else:
+            self.show_search_results(self.search_index.search(query, boost=self.search_boosts()))
+
+    def on_search_finished(self, generation, results):
+        if generation == self.search_generation:
+            self.show_search_results(results)
+
+    def show_search_results(self, results):
+        filtered = self.ordered_apps() if results is None else results
         self.display_icons(filtered, filtering=True)  # Durante il filtraggio, la barra di ricerca rimane visibile
 
+    def on_catalog_changed(self, event, records):
+        """Keep the search index, the target checks and the icon widgets in step with the catalog."""
+        if event == "reset":
+            self.clear_icon_widgets()
+            self.rebuild_search_index()
+            return
+        for app_info in records:
+            if event in ("updated", "removed"):
+                self.discard_icon_widget(app_info)
+            if event == "removed":
+                self.search_index.remove(app_info.id)
+            else:
+                self.index_application(app_info)
+
+    def rebuild_search_index(self):
+        self.search_index.clear()
+        # Search keys precomputed in the settings snapshot, for the entries that haven't changed since
+        keys = self.settings_store.take_search_keys()
+        for app_info in self.catalog:
+            self.index_application(app_info, matching_keys(keys.get(app_info.id), app_info.get("name"),
+                                                           app_info.get("command"), app_info.get("tags")))
+
+    def icon_paths(self):
+        return {app_info.get("icon") for app_info in self.catalog if app_info.get("icon")}
+
+    def index_application(self, app_info, keys=None):
+        self.search_index.add(app_info.id, app_info, app_info.get("name", ""), app_info.get("command", ""),
+                              app_info.get("tags", ()), keys)
+        # New and changed entries get their command and icon checked in the background
+        self.target_validator.validate([app_info])
+
     def apply_theme(self):
-        bg = "rgba(50, 50, 50, 200)" if self.current_theme == "dark" else "rgba(245, 245, 245, 220)"
-        self.setStyleSheet(f"background-color: {bg}; border-radius: 15px;")
-        icon_color = "#d3d3d3" if self.current_theme == "dark" else "#333333"
-        self.theme_button.setIcon(qta.icon('fa.lightbulb-o', color=icon_color))
-        self.close_button.setIcon(qta.icon('fa.close', color=icon_color))
-        self.add_icon_button.setIcon(qta.icon('fa.plus', color=icon_color))
-        search_bg = "rgba(60, 60, 60, 220)" if self.current_theme == "dark" else "rgba(255, 255, 255, 220)"
-        search_text = "#d3d3d3" if self.current_theme == "dark" else "#333333"
-        self.search_bar.setStyleSheet(f"""
-            QLineEdit {{
-                padding: 10px;
-                font-size: 18px;
-                background-color: {search_bg};
-                color: {search_text};
-                border-radius: 10px;
-            }}
-        """)
-        title_color = "#d3d3d3" if self.current_theme == "dark" else "#333333"
-        self.title_label.setStyleSheet(f"color: {title_color}; background-color: transparent;")
-        for label in self.findChildren(QLabel):
-            if label != self.title_label and label != self.no_icons_label:
-                label.setStyleSheet(f"color: {'#d3d3d3' if self.current_theme == 'dark' else '#333333'};")
-        self.icon_layout.setSpacing(20)
-
-    def get_menu_style(self):
-        return """
-            QMenu {
-                background-color: #2e2e2e;
-                color: #d3d3d3;
-                border: 1px solid #555555;
-                border-radius: 0px;
-            }
-            QMenu::item:selected {
-                background-color: #555555;
-            }
-            QMenu::separator {
-                height: 1px;
-                background-color: #555555;
-                margin-left: 5px;
-                margin-right: 5px;
-            }
-        """ if self.current_theme == "dark" else """
-            QMenu {
-                background-color: white;
-                color: black;
-                border: 1px solid #ccc;
-                border-radius: 0px;
-            }
-            QMenu::item:selected {
-                background-color: #d0d0d0;
-            }
-            QMenu::separator {
-                height: 1px;
-                background-color: #ccc;
-                margin-left: 5px;
-                margin-right: 5px;
-            }
-        """
+        theme = get_theme(self.current_theme)
+        self.setUpdatesEnabled(False)
+        try:
+            # Set once at the root: labels, search bar, icons, menus and dialogs all follow it
+            self.setStyleSheet(theme.stylesheet)
+            self.setPalette(theme.palette)
+            self.theme_button.setIcon(theme.icons["theme"])
+            self.close_button.setIcon(theme.icons["close"])
+            self.add_icon_button.setIcon(theme.icons["add"])
+        finally:
+            self.setUpdatesEnabled(True)
+
+    def load_themes(self):
+        load_theme_files(os.path.join(os.path.dirname(self.settings_file), "themes"))
+
+    def set_theme(self, name):
+        self.current_theme = name
+        self.apply_theme()
+        self.save_settings({"op": "set", "key": "theme", "value": self.current_theme})
 
     def toggle_theme(self):
-        self.current_theme = "light" if self.current_theme == "dark" else "dark"
-        self.apply_theme()
-        self.save_settings()
+        self.set_theme(next_theme(self.current_theme))
 
     def center_window(self):
         screen = QApplication.primaryScreen().availableGeometry()
@@ -426,50 +1202,228 @@ class AppLauncher(QMainWindow):
         self.move(x, y)
 
     def load_settings(self):
-        if os.path.exists(self.SETTINGS_FILE):
-            with open(self.SETTINGS_FILE, 'r') as f:
-                settings = json.load(f)
-                self.current_theme = settings.get("theme", "light")
-                self.all_apps = settings.get("apps", [])
-                self.window_width = settings.get("window_width", 700)
-                self.window_title = settings.get("window_title", "Application Launcher")
+        settings = self.settings_store.load()
+        if settings is not None:
+            self.current_theme = settings.get("theme", "light")
+            if self.catalog.load(settings.get("apps", []), settings.get("next_id", 1)):
+                # Written before entries had ids: save them, so they stay the same from now on
+                self.save_settings()
+            self.window_width = settings.get("window_width", 700)
+            self.window_title = settings.get("window_title", "Application Launcher")
+            self.view_mode = settings.get("view_mode", "auto")
+            self.sort_mode = settings.get("sort_mode", "manual")
+            self.icon_size = settings.get("icon_size", ICON_SIZE)
+            self.index_desktop_entries = settings.get("index_desktop_entries", False)
+            self.warmup_enabled = settings.get("warmup", False)
+            self.warmup_top_n = settings.get("warmup_top_n", TOP_N)
+            self.warmup_budget_mb = settings.get("warmup_budget_mb", BUDGET_MB)
+            self.desktop_hidden = settings.get("desktop_hidden", [])
+            self.launch_groups = load_groups(settings.get("launch_groups"))
+            self.frecency.load(settings.get("frecency"))
+            self.settings_store.journal = settings.get("settings_journal", False)
+            self.settings_store.snapshot = settings.get("catalog_snapshot", False)
         else:
             self.current_theme = "light"
-            self.all_apps = []
+            self.catalog.load([])
             self.window_width = 700
             self.window_title = "Application Launcher"
 
-    def save_settings(self):
-        settings = {
+    def save_settings(self, op=None):
+        """
+        Schedule a write of the settings; changes are coalesced and written in the background.
+
+        :param op: Optional journal operation describing the change (see persistence.apply_op).
+        """
+        if op is not None and not self.save_timer.isActive() and self.settings_store.append(op):
+            return
+        self.save_timer.start()
+
+    def write_settings(self):
+        self.save_timer.stop()
+        self.settings_store.save(self.settings_snapshot())
+
+    def flush_settings(self):
+        if self.save_timer.isActive():
+            self.write_settings()
+        self.settings_store.flush()
+
+    def on_settings_error(self, error):
+        reported, self.settings_error = self.settings_error, error
+        if error is not None and reported is None:
+            reason = getattr(error, "strerror", None) or error
+            QMessageBox.warning(self, "Settings Not Saved",
+                                f"Could not save the settings to {self.settings_file}: {reason}")
+
+    def settings_snapshot(self):
+        return {
             "theme": self.current_theme,
-            "apps": self.all_apps,
+            "apps": [snapshot_app(app) for app in self.catalog],
+            "next_id": self.catalog.next_id,
             "window_width": self.width(),
-            "window_title": self.window_title
+            "window_title": self.window_title,
+            "view_mode": self.view_mode,
+            "sort_mode": self.sort_mode,
+            "icon_size": self.icon_size,
+            "index_desktop_entries": self.index_desktop_entries,
+            "desktop_hidden": self.desktop_hidden,
+            "warmup": self.warmup_enabled,
+            "warmup_top_n": self.warmup_top_n,
+            "warmup_budget_mb": self.warmup_budget_mb,
+            "launch_groups": [group.to_dict() for group in self.launch_groups],
+            "frecency": self.frecency.to_dict(),
+            "settings_journal": self.settings_store.journal,
+            "catalog_snapshot": self.settings_store.snapshot
         }
-        with open(self.SETTINGS_FILE, 'w') as f:
-            json.dump(settings, f, indent=4)
+
+    def closeEvent(self, event):
+        self.flush_settings()
+        if self.resident:
+            event.ignore()
+            self.hide()
+            return
+        # Members not started yet would be launched after the launcher is gone
+        for run in self.group_launches:
+            run.cancel()
+        if self.importer is not None:
+            self.importer.cancel()
+        super().closeEvent(event)
+
+    def handle_command(self, command):
+        """Run one command received from another invocation; returns the reply line."""
+        verb, _, argument = command.partition(" ")
+        if verb == "ping":
+            return "ok"
+        if verb == "show":
+            self.show_launcher()
+            return "ok"
+        if verb == "hide":
+            self.hide()
+            return "ok"
+        if verb == "launch":
+            app_info = self.find_application(argument)
+            if app_info is None:
+                return f"error no application matches {argument!r}"
+            self.launch_application(app_info)
+            return f"ok {app_info['name']}"
+        if verb == "group":
+            group = find_group(self.launch_groups, argument)
+            if group is None:
+                return f"error no launch group named {argument!r}"
+            self.launch_group(group)
+            return f"ok {group.name}"
+        if verb == "reload":
+            self.reload_settings()
+            return "ok"
+        if verb == "quit":
+            QTimer.singleShot(0, self.quit_launcher)
+            return "ok"
+        return f"error unknown command {verb!r}"
+
+    def show_launcher(self):
+        self.show()
+        self.setWindowState(self.windowState() & ~Qt.WindowMinimized)
+        self.raise_()
+        self.activateWindow()
+        self.search_bar.setFocus()
+
+    def quit_launcher(self):
+        if self.manager is not None:
+            self.manager.quit()
+            return
+        self.resident = False
+        self.close()
+        QApplication.quit()
+
+    def find_application(self, name):
+        return self.catalog.find(name, self.search_index, self.search_boosts())
+
+    def reload_settings(self):
+        # The file on disk wins: drop changes still waiting for the idle timer
+        self.save_timer.stop()
+        self.settings_store.flush()
+        self.load_settings()
+        self.load_themes()
+        self.apply_icon_size()
+        self.title_label.setText(self.window_title)
+        self.resize(self.window_width, self.height())
+        self.apply_theme()
+        self.filter_icons()
+        if self.index_desktop_entries:
+            self.start_desktop_indexing()
+        else:
+            self.stop_desktop_indexing()
+        self.schedule_warmup()
 
     def add_application(self, app_info):
-        self.all_apps.append(app_info)
-        self.display_icons(self.all_apps)
-        self.save_settings()
+        record = self.catalog.add(app_info)
+        self.display_icons(self.ordered_apps())
+        self.save_settings({"op": "add", "app": snapshot_app(record)})
+        return record
+
+    def add_applications(self, apps, save=True):
+        records = self.catalog.extend(apps)
+        self.display_icons(self.ordered_apps())
+        if save:
+            self.save_settings()
+        return records
+
+    def remove_applications(self, apps, save=True):
+        self.catalog.remove(apps)
+        self.forget_frecency(apps)
+        self.forget_group_members(apps)
+        self.display_icons(self.ordered_apps())
+        if save:
+            self.save_settings()
 
     def remove_application(self, app_info):
-        self.all_apps = [app for app in self.all_apps if app != app_info]
-        self.display_icons(self.all_apps)
-        self.save_settings()
+        if app_info.get("desktop_id"):
+            # Otherwise the next scan would bring it back
+            self.desktop_hidden.append(app_info["desktop_id"])
+            self.save_settings({"op": "set", "key": "desktop_hidden", "value": list(self.desktop_hidden)})
+        self.catalog.remove([app_info])
+        forgotten = self.forget_frecency([app_info])
+        forgotten = self.forget_group_members([app_info]) or forgotten
+        self.display_icons(self.ordered_apps())
+        # Journal operations don't carry the frecency scores or groups: forgetting either needs a full write
+        self.save_settings(None if forgotten else {"op": "remove", "id": app_info.id})
+
+    def forget_frecency(self, apps):
+        """
+        Drop the scores of removed apps whose command no other entry has, so an app added later
+        with the same command doesn't inherit their rank; returns whether any was dropped.
+        """
+        forgotten = False
+        for key in {self.frecency_key(app_info) for app_info in apps}:
+            if key in self.frecency and not any(self.frecency_key(other) == key
+                                                for other in self.catalog.by_command(key)):
+                self.frecency.forget(key)
+                forgotten = True
+        return forgotten
+
+    def forget_group_members(self, apps):
+        """Take removed apps out of the launch groups; returns whether any group changed."""
+        ids = {app_info.id for app_info in apps}
+        changed = False
+        for group in self.launch_groups:
+            members = [member for member in group.members if member not in ids]
+            if len(members) != len(group.members):
+                group.members = members
+                changed = True
+        return changed
 
     def edit_application(self, app_info):
         dialog = AddEditIconDialog("Edit Application", self.current_theme, app_info, self)
         if dialog.exec_() == QDialog.Accepted:
             updated = dialog.get_data()
+            if app_info.get("desktop_id"):
+                updated["desktop_edited"] = True
             if updated["name"] and updated["command"]:
-                try:
-                    index = self.all_apps.index(app_info)
-                    self.all_apps[index] = updated
-                    self.display_icons(self.all_apps)
-                    self.save_settings()
-                except ValueError:
+                if app_info in self.catalog:
+                    # Edited in place: launch stats and anything else outside the dialog stay attached
+                    self.catalog.update(app_info, updated, clear=AddEditIconDialog.FIELDS)
+                    self.display_icons(self.ordered_apps())
+                    self.save_settings({"op": "edit", "id": app_info.id, "app": snapshot_app(app_info)})
+                else:
                     QMessageBox.warning(self, "Error", "Application not found.")
             else:
                 QMessageBox.warning(self, "Incomplete Input", "Please fill all fields.")
@@ -483,20 +1437,62 @@ class AppLauncher(QMainWindow):
             else:
                 QMessageBox.warning(self, "Incomplete Input", "Please fill all fields.")
 
+    def grid_columns(self):
+        """How many icon columns fit the window's current width."""
+        # Room for the scroll bar is always kept, so the columns don't change when it appears
+        width = self.width() - 2 * self.CONTENT_MARGIN - self.icon_scroll.verticalScrollBar().sizeHint().width()
+        return max(1, (width + CELL_SPACING) // (cell_size(self.icon_size) + CELL_SPACING))
+
     def adjust_window_height(self):
-        num_apps = len(self.all_apps)
-        num_columns = 6
+        # Only the rows actually shown count, so a filtered grid shrinks the window
+        num_apps = len(self.shown_apps[0])
+        num_columns = max(1, self.icon_columns or self.grid_columns())
         num_rows = (num_apps + num_columns - 1) // num_columns
-        icon_height = 100
+        icon_height = cell_size(self.icon_size)
         padding = 20
         header_height = 60
+        if not self.search_bar.isHidden():
+            header_height += self.search_bar.sizeHint().height() + 10
         new_height = padding + header_height + (num_rows * icon_height) + (
-                    num_rows * 20) if num_apps else padding + header_height + 100
+                    num_rows * CELL_SPACING) if num_apps else padding + header_height + 100
         new_height = max(200, min(new_height, 800))
+        if new_height == self.height():
+            return
         pos = self.pos()
         self.setFixedHeight(new_height)
         self.move(pos)
 
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if event.size().width() != event.oldSize().width() and not self.relayout_timer.isActive():
+            self.relayout_timer.start()
+
+    def relayout(self):
+        """Apply the width the user dragged to, and re-flow the grid if its column count changed."""
+        if self._pending_width is not None:
+            width, self._pending_width = self._pending_width, None
+            self.resize(width, self.height())
+        if self.use_virtual_view():
+            return
+        if self.grid_columns() != self.icon_columns:
+            self.display_icons(*self.shown_apps)
+
+    def set_icon_size(self, icon_size):
+        self.icon_size = icon_size
+        self.apply_icon_size()
+        self.filter_icons()
+        self.save_settings({"op": "set", "key": "icon_size", "value": icon_size})
+
+    def apply_icon_size(self):
+        if self.icon_loader.size != self.icon_size:
+            self.icon_loader.icon_loaded.disconnect(self.icon_view.viewport().update)
+            self.icon_loader = shared_icon_loader(self.icon_size)
+            self.icon_loader.icon_loaded.connect(self.icon_view.viewport().update)
+        self.icon_view.set_icon_size(self.icon_size)
+        # Widgets are sized at construction, so the live ones are rebuilt at the new size
+        self.clear_icon_widgets()
+        self.icon_columns = 0
+
     def mousePressEvent(self, event):
         if event.button() == Qt.LeftButton:
             if event.x() >= self.width() - self._resize_margin and event.y() > 60:
@@ -513,9 +1509,10 @@ class AppLauncher(QMainWindow):
         if self._is_resizing:
             delta = event.globalX() - self._resize_start_pos.x()
             new_width = self._initial_width + delta
-            if self.minimumWidth() <= new_width <= self.maximumWidth():
-                self.resize(new_width, self.height())
-                self.adjust_window_height()
+            # Applied by relayout, at most once per frame however fast the mouse moves
+            self._pending_width = max(self.minimumWidth(), min(new_width, self.maximumWidth()))
+            if not self.relayout_timer.isActive():
+                self.relayout_timer.start()
             event.accept()
         elif self._is_dragging:
             self.move(event.globalPos() - self._drag_position)
@@ -529,7 +1526,9 @@ class AppLauncher(QMainWindow):
     def mouseReleaseEvent(self, event):
         if self._is_resizing:
             self._is_resizing = False
-            self.save_settings()
+            self.relayout_timer.stop()
+            self.relayout()
+            self.save_settings({"op": "set", "key": "window_width", "value": self.width()})
             event.accept()
         if self._is_dragging:
             self._is_dragging = False
@@ -538,23 +1537,71 @@ class AppLauncher(QMainWindow):
     def dragEnterEvent(self, event):
         if event.mimeData().hasUrls():
             for url in event.mimeData().urls():
-                if os.path.isfile(url.toLocalFile()):
+                if os.path.exists(url.toLocalFile()):
                     event.acceptProposedAction()
                     return
         event.ignore()
 
     def dropEvent(self, event):
         if event.mimeData().hasUrls():
-            for url in event.mimeData().urls():
-                file_path = url.toLocalFile()
-                if os.path.isfile(file_path):
-                    name = os.path.splitext(os.path.basename(file_path))[0]
-                    app_info = {"name": name, "command": file_path, "icon": ""}
-                    self.open_add_icon_dialog(prefill=app_info)
+            paths = [url.toLocalFile() for url in event.mimeData().urls() if url.isLocalFile()]
+            if len(paths) == 1 and os.path.isfile(paths[0]):
+                # A single file still gets the dialog, to adjust name and icon before adding
+                name = os.path.splitext(os.path.basename(paths[0]))[0]
+                app_info = {"name": name, "command": paths[0], "icon": ""}
+                self.open_add_icon_dialog(prefill=app_info)
+            elif paths:
+                self.import_paths(paths)
             event.acceptProposedAction()
         else:
             event.ignore()
 
+    def import_paths(self, paths):
+        """Import files and folders in the background, streaming the entries into the grid."""
+        if self.importer is not None:
+            QMessageBox.information(self, "Import", "An import is already running.")
+            return
+        signals = ImportSignals(self)
+        signals.batch.connect(self.on_import_batch)
+        signals.progress.connect(self.on_import_progress)
+        signals.finished.connect(self.on_import_finished)
+        self.imported_apps = []
+        self.importer = BulkImporter(self.catalog.command_keys(),
+                                     signals.batch.emit, signals.progress.emit, signals.finished.emit)
+        self.import_progress.setRange(0, 0)
+        self.import_progress.setFormat("Importing...")
+        self.import_progress.show()
+        self.importer.start(paths)
+
+    def on_import_batch(self, apps):
+        # Shown right away, but only persisted once the import has been reviewed
+        self.imported_apps.extend(self.add_applications(apps, save=False))
+
+    def on_import_progress(self, done, found):
+        self.import_progress.setRange(0, max(found, 1))
+        self.import_progress.setValue(done)
+        self.import_progress.setFormat(f"Importing... {done}/{found}")
+
+    def on_import_finished(self, imported, skipped):
+        importer, self.importer = self.importer, None
+        self.import_progress.hide()
+        apps, self.imported_apps = self.imported_apps, []
+        if importer is not None and importer.cancelled:
+            # Cancelled by closing the window: nobody is left to review the entries found so far
+            if apps:
+                self.remove_applications(apps)
+            return
+        if not apps:
+            QMessageBox.information(self, "Import", "No new applications found.")
+            return
+        dialog = ImportReviewDialog(apps, skipped, self.current_theme, self)
+        rejected = dialog.rejected_apps() if dialog.exec_() == QDialog.Accepted else apps
+        if rejected:
+            self.remove_applications(rejected, save=False)
+        # Even when every entry was rejected: their ids are taken (next_id), and a save made
+        # during the import may have written them
+        self.save_settings()
+
     def title_mouse_press_event(self, event):
         if event.button() == Qt.RightButton:
             self.edit_title()
@@ -564,7 +1611,7 @@ class AppLauncher(QMainWindow):
         font = self.title_edit.font()  # Ottiene il font corrente (predefinito del sistema)
         font.setPointSize(13)  # Imposta la dimensione del font
         self.title_edit.setFont(font)  #
-        color = "#d3d3d3" if self.current_theme == "dark" else "#333333"
+        color = get_theme(self.current_theme).colors["text"]
         self.title_edit.setStyleSheet(f"color: {color}; background-color: transparent;")
         self.title_edit.setFixedHeight(self.title_label.height())
         self.title_edit.returnPressed.connect(self.finish_edit_title)
@@ -581,15 +1628,112 @@ class AppLauncher(QMainWindow):
             self.title_label.setText(new_title)
         self.title_edit.deleteLater()
         self.title_label.show()
-        self.save_settings()
+        self.save_settings({"op": "set", "key": "window_title", "value": self.window_title})
 
     def finish_edit_title_focus_out(self, event):
         self.finish_edit_title()
         QLineEdit.focusOutEvent(self.title_edit, event)
 
 
+class InstanceManager(QObject):
+    """
+    Hosts several launcher instances (gaming, work, tools...) as windows of one process.
+
+    Each instance has its own settings file, and with it its own catalog, theme, title and
+    width; the icon cache, the settings writer thread and the launch engine are shared.
+    Commands from other invocations are routed to an instance with an "@name " prefix.
+    """
+
+    NAME_PATTERN = re.compile(r"^[\w-]+$")
+
+    def __init__(self, resident=False, parent=None):
+        super().__init__(parent)
+        self.resident = resident
+        self.windows = {}
+        self.settings_dir = os.path.dirname(AppLauncher.SETTINGS_FILE)
+
+    def settings_file(self, name):
+        return instance_settings_file(name)
+
+    def known_instances(self):
+        names = {"default"} | set(self.windows)
+        try:
+            for filename in os.listdir(self.settings_dir or "."):
+                if filename.startswith("settings-") and filename.endswith(".json"):
+                    names.add(filename[len("settings-"):-len(".json")])
+        except OSError:
+            pass
+        return sorted(names)
+
+    def open_instance(self, name="default", show=True):
+        if not self.NAME_PATTERN.match(name):
+            raise ValueError(f"invalid instance name {name!r}")
+        window = self.windows.get(name)
+        if window is None:
+            window = AppLauncher(self.settings_file(name), name, self)
+            window.resident = self.resident
+            if self.windows:
+                # Cascade additional instances so they don't open exactly on top of each other
+                window.move(window.pos() + QPoint(30, 30) * len(self.windows))
+            self.windows[name] = window
+        if show:
+            window.show_launcher()
+        return window
+
+    def handle_command(self, command):
+        name = "default"
+        if command.startswith("@"):
+            name, _, command = command[1:].partition(" ")
+        verb, _, argument = command.partition(" ")
+        if verb == "open":
+            try:
+                self.open_instance(argument.strip() or name)
+            except ValueError as e:
+                return f"error {e}"
+            return "ok"
+        if verb == "list":
+            return "ok " + " ".join(self.known_instances())
+        if verb == "quit":
+            QTimer.singleShot(0, self.quit)
+            return "ok"
+        if name not in self.windows:
+            if verb not in ("show", "ping"):
+                return f"error instance {name!r} is not open"
+            try:
+                self.open_instance(name, show=verb == "show")
+            except ValueError as e:
+                return f"error {e}"
+            return "ok"
+        return self.windows[name].handle_command(command)
+
+    def quit(self):
+        for window in self.windows.values():
+            window.resident = False
+            window.close()
+        QApplication.quit()
+
+
 if __name__ == '__main__':
+    STARTUP.enabled = ARGS.startup_profile
     app = QApplication(sys.argv)
-    window = AppLauncher()
-    window.show()
+    app.setQuitOnLastWindowClosed(not ARGS.resident)
+    STARTUP.mark("qapplication")
+    manager = InstanceManager(ARGS.resident)
+    TRACE_FILE = ipc.trace_path(ARGS.trace)
+    if TRACE_FILE:
+        import instrumentation
+        tracer = instrumentation.enable(TRACE_FILE, AppLauncher, overlay=ARGS.trace_overlay)
+        tracer.add_counter("AppIcon widgets", lambda: sum(len(window.icon_widgets)
+                                                          for window in manager.windows.values()))
+    server = CommandServer(manager.handle_command, manager)
+    if not server.listen() and all(ipc.send_command(request) is not None for request in ipc.requests_for_args(ARGS)):
+        # Another launcher started at the same time and is serving
+        sys.exit(0)
+    for instance_name in ARGS.instance or ["default"]:
+        manager.open_instance(instance_name, show=not ARGS.hidden and not (ARGS.launch or ARGS.group))
+    if ARGS.launch or ARGS.group:
+        # Started resident with --launch or --group: launch from the new launcher, which keeps running
+        reply = manager.handle_command(ipc.requests_for_args(ARGS)[0])
+        if reply.startswith("error"):
+            print(reply, file=sys.stderr)
     sys.exit(app.exec_())
@@ -0,0 +1,299 @@
+import atexit
+import json
+import os
+import stat
+import tempfile
+import threading
+
+from snapshot import CatalogSnapshot, snapshot_path, source_signature, write_snapshot
+
+
+JOURNAL_SUFFIX = ".journal"
+SETTINGS_FILE = "../../../Desktop/PyCharm/EasyGameLauncher/settings.json"
+
+
+def instance_settings_file(name):
+    """Settings file of a launcher instance: settings.json, or settings-<name>.json next to it."""
+    if name == "default":
+        return SETTINGS_FILE
+    return os.path.join(os.path.dirname(SETTINGS_FILE), f"settings-{name}.json")
+
+
+def current_umask():
+    # The umask can only be read by setting it, so put it straight back
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+def write_atomic(path, settings):
+    """Write `settings` as JSON to `path` so that readers see either the old or the new file, never a mix."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        mode = 0o666 & ~current_umask()
+    fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(settings, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates the file 0600; keep the mode the settings file had, or would get from open()
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    if hasattr(os, "O_DIRECTORY"):
+        # Make the rename itself durable
+        dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def snapshot_app(app_info):
+    """Copy an app entry into a dict, nested dicts and lists included, so the writer thread never sees it change."""
+    return {key: value.copy() if isinstance(value, (dict, list)) else value for key, value in app_info.items()}
+
+
+def apply_op(settings, op):
+    """Replay one journal operation on a settings dict."""
+    kind = op.get("op")
+    apps = settings.setdefault("apps", [])
+    if kind == "add":
+        apps.append(op["app"])
+        if isinstance(op["app"].get("id"), int):
+            # The id stays taken after the entry is removed again
+            settings["next_id"] = max(settings.get("next_id", 1), op["app"]["id"] + 1)
+    elif kind == "remove":
+        if "id" in op:
+            settings["apps"] = [app for app in apps if app.get("id") != op["id"]]
+        else:
+            # Journals written before entries had ids
+            settings["apps"] = [app for app in apps if app != op["app"]]
+    elif kind == "edit":
+        if "id" in op:
+            settings["apps"] = [op["app"] if app.get("id") == op["id"] else app for app in apps]
+        elif 0 <= op["index"] < len(apps):
+            apps[op["index"]] = op["app"]
+    elif kind == "set":
+        settings[op["key"]] = op["value"]
+
+
+class PersistenceWorker:
+    """Single background thread that performs the writes of every SettingsStore."""
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._queue = []
+        self._thread = None
+
+    def submit(self, store):
+        with self._condition:
+            if store not in self._queue:
+                self._queue.append(store)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="settings-writer", daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._queue:
+                    self._condition.wait()
+                store = self._queue.pop(0)
+            store._write_pending()
+
+
+_worker = PersistenceWorker()
+_stores = []
+
+
+class SettingsStore:
+    """
+    Write-behind persistence for one settings file.
+
+    save() hands over a snapshot and returns immediately; the background worker writes only
+    the latest snapshot, atomically (temp file, fsync, rename). With journaling enabled small
+    operations are appended to `<file>.journal` instead, and folded into the next full
+    snapshot. Journal lines carry the generation of the snapshot they apply to, so a crash
+    between writing a snapshot and truncating the journal never replays an operation twice.
+
+    With `snapshot` enabled a binary copy of the parsed file (see snapshot.py) is kept in
+    `<file>.snapshot` and loaded instead of the JSON while the JSON's mtime and size match;
+    when they don't it is rebuilt in the background. The JSON stays the source of truth.
+
+    A failed write is kept in `last_error` and returned by flush(); `on_error(error)`, if
+    given, is called from the worker thread when a write fails, and with None when a later
+    write succeeds again.
+    """
+
+    JOURNAL_LIMIT = 200
+
+    def __init__(self, path, journal=False, snapshot=False, on_error=None):
+        self.path = path
+        self.on_error = on_error
+        self.journal = journal
+        self.snapshot = snapshot
+        self.search_keys = {}  # precomputed search keys from the snapshot the last load used
+        self.generation = 0
+        self.journal_length = 0
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._pending_snapshot = None
+        self._pending_ops = []
+        self._pending_rebuild = None  # (parsed JSON, its signature) to write as the snapshot
+        self._busy = False
+        self.last_error = None
+        _stores.append(self)
+
+    @property
+    def journal_path(self):
+        return self.path + JOURNAL_SUFFIX
+
+    @property
+    def snapshot_path(self):
+        return snapshot_path(self.path)
+
+    def load(self):
+        """Return the stored settings with the journal replayed, or None if there is no settings file."""
+        try:
+            signature = source_signature(os.stat(self.path))
+        except OSError:
+            return None
+        settings = self._load_snapshot(signature)
+        if settings is None:
+            with open(self.path, "r") as f:
+                settings = json.load(f)
+            if settings.get("catalog_snapshot"):
+                # Missing or stale: rebuilt from this parse, before the journal is replayed on it
+                with self._lock:
+                    # Replaying the journal only rebinds top-level keys and the apps list
+                    self._pending_rebuild = (dict(settings, apps=list(settings.get("apps", []))), signature)
+                _worker.submit(self)
+            elif os.path.exists(self.snapshot_path):
+                self._remove_snapshot()
+        self.generation = settings.pop("journal_generation", 0)
+        self.journal_length = 0
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, "r") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        break  # Torn last line from a crash, everything before it is intact
+                    if entry.get("generation") == self.generation:
+                        apply_op(settings, entry["op"])
+                        self.journal_length += 1
+        return settings
+
+    def _load_snapshot(self, signature):
+        self.search_keys = {}
+        snapshot = CatalogSnapshot(self.snapshot_path)
+        if not snapshot.open(signature):
+            return None
+        try:
+            settings = snapshot.settings()
+            self.search_keys = snapshot.search_keys()
+        except (ValueError, EOFError, TypeError):
+            return None
+        finally:
+            snapshot.close()
+        return settings
+
+    def take_search_keys(self):
+        """Hand over the precomputed search keys of the last load (once)."""
+        keys, self.search_keys = self.search_keys, {}
+        return keys
+
+    def _remove_snapshot(self):
+        try:
+            os.unlink(self.snapshot_path)
+        except OSError:
+            pass
+
+    def save(self, settings):
+        """Queue a full snapshot; it supersedes every snapshot and operation queued before it."""
+        with self._lock:
+            self._pending_snapshot = settings
+            self._pending_ops = []
+        _worker.submit(self)
+
+    def append(self, op):
+        """
+        Queue one journal operation. Returns False when journaling is off or the journal is
+        due for compaction, in which case the caller should save() a full snapshot instead.
+        """
+        with self._lock:
+            if not self.journal or self.journal_length + len(self._pending_ops) >= self.JOURNAL_LIMIT:
+                return False
+            self._pending_ops.append(op)
+        _worker.submit(self)
+        return True
+
+    def flush(self, timeout=None):
+        """Block until everything queued so far is on disk; returns the OSError of the last write, if it failed."""
+        with self._lock:
+            self._idle.wait_for(lambda: not self._busy and self._pending_snapshot is None and not self._pending_ops
+                                and self._pending_rebuild is None, timeout)
+            return self.last_error
+
+    def close(self):
+        self.flush()
+        if self in _stores:
+            _stores.remove(self)
+
+    def _write_pending(self):
+        with self._lock:
+            snapshot, ops, rebuild = self._pending_snapshot, self._pending_ops, self._pending_rebuild
+            self._pending_snapshot, self._pending_ops, self._pending_rebuild = None, [], None
+            self._busy = True
+        error = None
+        try:
+            if snapshot is not None:
+                generation = self.generation + 1
+                written = dict(snapshot, journal_generation=generation)
+                write_atomic(self.path, written)
+                if self.snapshot:
+                    rebuild = (written, source_signature(os.stat(self.path)))
+                elif os.path.exists(self.snapshot_path):
+                    self._remove_snapshot()
+                    rebuild = None
+                self.generation = generation
+                self.journal_length = 0
+                if os.path.exists(self.journal_path):
+                    os.unlink(self.journal_path)
+            if ops:
+                with open(self.journal_path, "a") as f:
+                    for op in ops:
+                        f.write(json.dumps({"generation": self.generation, "op": op}) + "\n")
+                    f.flush()
+                    os.fsync(f.fileno())
+                self.journal_length += len(ops)
+            if rebuild is not None:
+                write_snapshot(self.snapshot_path, *rebuild)
+        except Exception as e:
+            # Reported like a failed write: an exception escaping here would end the writer thread
+            error = e
+        finally:
+            with self._lock:
+                recovered = error is None and self.last_error is not None
+                self.last_error = error
+                self._busy = False
+                self._idle.notify_all()
+        if self.on_error is not None and (error is not None or recovered):
+            self.on_error(error)
+
+
+@atexit.register
+def _flush_all():
+    for store in list(_stores):
+        store.flush(timeout=5)
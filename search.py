@@ -0,0 +1,372 @@
+import operator
+import re
+import threading
+from array import array
+from bisect import bisect_left
+from itertools import compress, repeat
+
+
+SEPARATORS = " -_./\\:"
+# A term with one of these may span the folder and the file name of a command
+PATH_SEPARATORS = "/\\"
+GRAM = 3
+_WORD_BREAKS = str.maketrans(SEPARATORS + "\0", " " * (len(SEPARATORS) + 1))
+
+
+def trigrams(text):
+    """The trigrams of the words of `text`; separators split words, so "steam-play" and "steam play" share them."""
+    return {word[i:i + GRAM] for word in text.translate(_WORD_BREAKS).split() for i in range(len(word) - GRAM + 1)}
+
+
+def subsequence_pattern(term):
+    """Regex matching `term` as a subsequence inside a single field of an entry's text."""
+    chars = [re.escape(char) for char in term]
+    return re.compile(chars[0] + "".join(f"[^\0{char}]*{char}" for char in chars[1:]))
+
+
+def subsequence_score(term, text):
+    """Score `term` as an in-order subsequence of `text`, or return None if it isn't one."""
+    score = 0
+    last = -1
+    for char in term:
+        pos = text.find(char, last + 1)
+        if pos < 0:
+            return None
+        if pos == last + 1:
+            score += 5
+        elif pos == 0 or text[pos - 1] in SEPARATORS:
+            score += 3
+        else:
+            score -= min(pos - last - 1, 5)
+        last = pos
+    return max(1, min(score, 99))
+
+
+def entry_fields(name, command, tags):
+    # Name first, then tags, then the command path; fuzzy matches never span two fields
+    return (name.lower(),) + tuple(tag.lower() for tag in tags) + (command.lower(),)
+
+
+def split_command(command):
+    """(folder, file name) of a lowercased command path; the folder keeps its trailing separator."""
+    cut = max(command.rfind("/"), command.rfind("\\")) + 1
+    return command[:cut], command[cut:]
+
+
+def field_trigrams(fields):
+    # The command folder is left out: SearchIndex matches it through its folder map
+    return trigrams("\0".join(fields[:-1] + split_command(fields[-1])[1:]))
+
+
+def search_keys(name, command, tags):
+    """
+    The trigrams of an entry's name, tags and command file name, the costly part of indexing
+    it (see SearchIndex.add).
+    """
+    return frozenset(field_trigrams(entry_fields(name, command, tags)))
+
+
+def matching_keys(precomputed, name, command, tags):
+    """
+    The trigrams of a precomputed (name, command, tags, trigrams) tuple, if they were computed
+    for this name, command and tags; else None.
+    """
+    if precomputed is None or tuple(precomputed[:3]) != (name or "", command or "", tuple(tags or ())):
+        return None
+    return precomputed[3]
+
+
+class _Entry:
+    __slots__ = ("key", "value", "seq", "name", "fields", "text", "folder")
+
+    def __init__(self, key, value, seq, name, command, tags):
+        self.key = key
+        self.value = value
+        self.seq = seq
+        self.fields = entry_fields(name, command, tags)
+        self.name = self.fields[0]
+        self.text = "\0".join(self.fields)
+        self.folder = split_command(self.fields[-1])[0]
+
+    def score(self, terms, patterns):
+        total = 0
+        for term, pattern in zip(terms, patterns):
+            term_score = self.score_term(term, pattern)
+            if term_score is None:
+                return None
+            total += term_score
+        return total
+
+    def score_term(self, term, pattern=None):
+        name = self.name
+        pos = name.find(term)
+        if pos == 0:
+            return 1000 if len(term) == len(name) else 800 - min(len(name) - len(term), 100)
+        if pos > 0:
+            return (700 if name[pos - 1] in SEPARATORS else 500) - min(pos, 100)
+        if term in self.text:
+            return 300
+        if pattern is None:
+            pattern = subsequence_pattern(term)
+        if pattern.search(name):
+            return 100 + subsequence_score(term, name)
+        for field in self.fields[1:]:
+            if pattern.search(field):
+                return subsequence_score(term, field)
+        return None
+
+
+class _Table:
+    """
+    The entries of one version of a SearchIndex as parallel lists, in seq order, so a query
+    filters and ranks them with C-level map() and compress() calls instead of a Python loop
+    per entry. A set of matching entries is a sorted list of rows.
+    """
+
+    __slots__ = ("version", "entries", "names", "texts", "values", "rows")
+
+    def __init__(self, version, entries):
+        self.version = version
+        self.entries = entries
+        self.names = [entry.name for entry in entries]
+        self.texts = [entry.text for entry in entries]
+        self.values = [entry.value for entry in entries]
+        self.rows = {entry.seq: row for row, entry in enumerate(entries)}  # seq -> row
+
+    def filter(self, rows, term):
+        """The rows (all if None) whose text contains `term`."""
+        if rows is None:
+            return list(compress(range(len(self.texts)), map(operator.contains, self.texts, repeat(term))))
+        return list(compress(rows, map(operator.contains, map(self.texts.__getitem__, rows), repeat(term))))
+
+    def scores(self, rows, terms):
+        """Substring relevance of each of `rows`, which contain every term."""
+        names = list(map(self.names.__getitem__, rows))
+        total = None
+        for term in terms:
+            size = len(term)
+            # Same tiers as _Entry.score_term: name prefix, name substring, anywhere else
+            scores = [(1000 if len(name) == size else 800 - len(name) + size if len(name) - size < 100 else 700)
+                      if pos == 0 else
+                      (700 if name[pos - 1] in SEPARATORS else 500) - (pos if pos < 100 else 100)
+                      if pos > 0 else 300
+                      for pos, name in zip(map(str.find, names, repeat(term)), names)]
+            total = scores if total is None else list(map(operator.add, total, scores))
+        return total
+
+    def subsequence_rows(self, rows, term):
+        """The rows (all if None) with a field that contains `term` as a subsequence."""
+        for char in dict.fromkeys(term):
+            rows = self.filter(rows, char)
+        pattern = subsequence_pattern(term)
+        return list(compress(rows, map(pattern.search, map(self.texts.__getitem__, rows))))
+
+
+class SearchIndex:
+    """
+    Incremental search index over the catalog.
+
+    Every entry keeps its lowercased name, tags and command path. Trigram postings over the
+    words of the name, tags and command file name, plus a map of command folders, give the
+    entries that can contain a term with a word of three characters or more; other terms,
+    and terms with a path separator, are checked against every entry. Candidates are
+    filtered and ranked as columns of a table built once per version of the index. Fuzzy
+    (subsequence) matches are only looked for when few entries contain the query, among the
+    entries that have all of its characters. A query that extends the previous one is only
+    matched against the previous results.
+
+    The lock is only held to copy references; matching and scoring run outside it, so add()
+    and remove() from another thread never wait for a query.
+    """
+
+    # The postings are used when a term's candidates are at most this fraction of the index
+    CANDIDATE_FRACTION = 0.25
+    # Fuzzy matches are only looked for when fewer entries than this contain the query
+    FUZZY_FALLBACK_BELOW = 50
+
+    def __init__(self, fuzzy=True):
+        self.fuzzy = fuzzy
+        self._entries = {}  # key -> _Entry, in seq order
+        # trigram -> seqs of the entries whose name, tags or command file name contain it, and
+        # command folder -> seqs of the entries in it; appended as entries are added, so sorted
+        self._postings = {}
+        self._folders = {}
+        self._seq = 0
+        self._version = 0
+        # (version, terms, matching rows, whether fuzzy matches were looked for) of the previous query
+        self._last = None
+        self._table = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._postings.clear()
+            self._folders.clear()
+            self._version += 1
+            self._last = None
+            self._table = None
+
+    def add(self, key, value, name, command="", tags=(), keys=None):
+        """Index `value` under `key`; `keys` are its search_keys() when they were computed ahead of time."""
+        with self._lock:
+            self._remove(key)
+            self._seq += 1
+            entry = _Entry(key, value, self._seq, name or "", command or "", tags or ())
+            self._entries[key] = entry
+            for gram in keys if keys is not None else field_trigrams(entry.fields):
+                self._post(self._postings, gram, entry.seq)
+            self._post(self._folders, entry.folder, entry.seq)
+            self._version += 1
+
+    def remove(self, key):
+        with self._lock:
+            self._remove(key)
+            self._version += 1
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for gram in field_trigrams(entry.fields):
+            self._unpost(self._postings, gram, entry.seq)
+        self._unpost(self._folders, entry.folder, entry.seq)
+
+    @staticmethod
+    def _post(postings, token, seq):
+        seqs = postings.get(token)
+        if seqs is None:
+            seqs = postings[token] = array("Q")
+        seqs.append(seq)
+
+    @staticmethod
+    def _unpost(postings, token, seq):
+        seqs = postings[token]
+        seqs.remove(seq)
+        if not seqs:
+            del postings[token]
+
+    def candidates(self, term):
+        """
+        Keys of the entries that can contain `term` (lowercase), or None when `term` has no
+        word of three characters or has a path separator, and every entry has to be checked.
+        """
+        with self._lock:
+            seqs = self._candidates(term)
+            if seqs is None:
+                return None
+            return {entry.key for entry in self._entries.values() if entry.seq in seqs}
+
+    def _candidates(self, term):
+        """Seqs of the entries that can contain `term`, or None if it cannot be looked up."""
+        grams = trigrams(term)
+        if not grams or any(char in PATH_SEPARATORS for char in term):
+            return None
+        postings = []
+        for gram in grams:
+            seqs = self._postings.get(gram)
+            if seqs is None:
+                postings = [()]
+                break
+            postings.append(seqs)
+        postings.sort(key=len)
+        seqs = set(postings[0]).intersection(*postings[1:])
+        for folder, folder_seqs in self._folders.items():
+            if term in folder:
+                seqs.update(folder_seqs)
+        return seqs
+
+    def search(self, query, cancelled=None, boost=None):
+        """
+        Return the values matching `query`, best match first, or None for an empty query.
+
+        `cancelled` is polled between the steps of the search; when it returns True the
+        search stops and returns None so a stale query never reaches the caller. `boost`, if
+        given, maps keys to points added to the relevance score of their entries (frecency
+        blending).
+        """
+        terms = query.lower().split()
+        if not terms:
+            return None
+        with self._lock:
+            version = self._version
+            table = self._table if self._table is not None and self._table.version == version else None
+            entries = list(self._entries.values()) if table is None else None
+            previous = self._previous(terms)
+            candidates = None
+            if previous is None:
+                candidates = min((seqs for seqs in map(self._candidates, terms) if seqs is not None),
+                                 key=len, default=None)
+                if candidates is not None and len(candidates) > self.CANDIDATE_FRACTION * len(self._entries):
+                    candidates = None
+            boosted = []
+            for key, points in (boost or {}).items():
+                entry = self._entries.get(key)
+                if entry is not None:
+                    boosted.append((entry.seq, points))
+        if table is None:
+            table = _Table(version, entries)
+            with self._lock:
+                if self._version == version:
+                    self._table = table
+        if previous is not None:
+            rows = previous[0]
+        elif candidates is not None:
+            rows = sorted(map(table.rows.__getitem__, candidates))
+        else:
+            rows = None
+        for term in terms:
+            if cancelled is not None and cancelled():
+                return None
+            rows = table.filter(rows, term)
+        scores = table.scores(rows, terms)
+        looked = not self.fuzzy
+        if self.fuzzy and len(rows) < self.FUZZY_FALLBACK_BELOW:
+            looked = True
+            pool = table.subsequence_rows(previous[0] if previous is not None and previous[1] else None,
+                                          max(terms, key=len))
+            found = set(rows)
+            patterns = [subsequence_pattern(term) for term in terms]
+            matched = list(zip(rows, scores))
+            for row in pool:
+                if row not in found:
+                    score = table.entries[row].score(terms, patterns)
+                    if score is not None:
+                        matched.append((row, score))
+            matched.sort()
+            rows = [row for row, _ in matched]
+            scores = [score for _, score in matched]
+        if cancelled is not None and cancelled():
+            return None
+        for seq, points in boosted:
+            row = table.rows[seq]
+            index = bisect_left(rows, row)
+            if index < len(rows) and rows[index] == row:
+                scores[index] += points
+        # Rows are in seq order and the sort is stable, so equal scores keep that order
+        order = sorted(range(len(rows)), key=scores.__getitem__, reverse=True)
+        with self._lock:
+            if self._version == version:
+                self._last = (version, terms, rows, looked)
+        return list(map(table.values.__getitem__, map(rows.__getitem__, order)))
+
+    def _previous(self, terms):
+        """(rows, whether fuzzy matches were looked for) of the previous query, if `terms` narrow it."""
+        if self._last is not None:
+            version, last_terms, rows, looked = self._last
+            if version == self._version and self._narrows(last_terms, terms):
+                return rows, looked
+        return None
+
+    @staticmethod
+    def _narrows(last_terms, terms):
+        # Every term of the previous query must be a prefix of the matching term of the new one
+        if len(terms) < len(last_terms):
+            return False
+        return all(new.startswith(old) for old, new in zip(last_terms, terms))
@@ -0,0 +1,105 @@
+import marshal
+import mmap
+import os
+import struct
+import sys
+
+from search import search_keys
+
+
+SNAPSHOT_SUFFIX = ".snapshot"
+MAGIC = b"FLSNAP3\0"
+# magic, marshal version, python major/minor, JSON mtime (ns) and size, section count
+HEADER = struct.Struct("<8sHBBqqI")
+SECTION = struct.Struct("<QQ")
+SETTINGS, APPS, SEARCH_KEYS = range(3)
+
+
+def snapshot_path(settings_path):
+    return settings_path + SNAPSHOT_SUFFIX
+
+
+def source_signature(stat):
+    return stat.st_mtime_ns, stat.st_size
+
+
+def write_snapshot(path, settings, signature):
+    """
+    Write the parsed settings of a JSON file whose (mtime, size) is `signature` as a binary snapshot.
+
+    The apps go in their own section, and the search keys (trigrams) of every entry with an
+    id in a third one, so a load only decodes what it uses. The snapshot is a cache:
+    it is written without fsync, and any mismatch when reading it just falls back to the JSON.
+    """
+    apps = settings.get("apps", [])
+    keys = {}
+    for app in apps:
+        if isinstance(app.get("id"), int):
+            name, command, tags = app.get("name") or "", app.get("command") or "", tuple(app.get("tags") or ())
+            keys[app["id"]] = (name, command, tags, search_keys(name, command, tags))
+    sections = [marshal.dumps({key: value for key, value in settings.items() if key != "apps"}),
+                marshal.dumps(apps), marshal.dumps(keys)]
+    offset = HEADER.size + SECTION.size * len(sections)
+    table = []
+    for section in sections:
+        table.append(SECTION.pack(offset, len(section)))
+        offset += len(section)
+    header = HEADER.pack(MAGIC, marshal.version, *sys.version_info[:2], *signature, len(sections))
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.writelines(table)
+        f.writelines(sections)
+    os.replace(tmp_path, path)
+
+
+class CatalogSnapshot:
+    """
+    Read side of a settings snapshot: the file is memory-mapped and each section is only
+    unmarshalled when asked for. `open` refuses snapshots written for another version of the
+    JSON (mtime or size differ) or by another Python (marshal is version specific).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._map = None
+        self._sections = []
+
+    def open(self, signature):
+        try:
+            with open(self.path, "rb") as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return False
+        try:
+            magic, version, major, minor, mtime, size, count = HEADER.unpack_from(self._map, 0)
+            if (magic != MAGIC or version != marshal.version or (major, minor) != sys.version_info[:2]
+                    or (mtime, size) != tuple(signature)):
+                raise ValueError("stale snapshot")
+            self._sections = [SECTION.unpack_from(self._map, HEADER.size + SECTION.size * i) for i in range(count)]
+            if any(offset + length > len(self._map) for offset, length in self._sections):
+                raise ValueError("truncated snapshot")
+        except (struct.error, ValueError):
+            self.close()
+            return False
+        return True
+
+    def section(self, index):
+        offset, length = self._sections[index]
+        with memoryview(self._map) as view, view[offset:offset + length] as data:
+            return marshal.loads(data)
+
+    def settings(self):
+        settings = self.section(SETTINGS)
+        settings["apps"] = self.section(APPS)
+        return settings
+
+    def search_keys(self):
+        """{app id: (name, command, tags, trigrams)} for the apps as they were in the JSON."""
+        return self.section(SEARCH_KEYS)
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._sections = []
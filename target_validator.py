@@ -0,0 +1,110 @@
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, QFileSystemWatcher, pyqtSignal
+
+from health import check_command, check_icon
+
+
+class CheckSignals(QObject):
+    finished = pyqtSignal(str, str, object)
+
+
+class CheckTask(QRunnable):
+    def __init__(self, kind, key, signals):
+        super().__init__()
+        self.kind = kind
+        self.key = key
+        self.signals = signals
+
+    def run(self):
+        status = check_command(self.key) if self.kind == "command" else check_icon(self.key)
+        self.signals.finished.emit(self.kind, self.key, status)
+
+
+class TargetValidator(QObject):
+    """
+    Checks app commands and icons in the background and caches the results.
+
+    Readers only ever look at the cache (`command_status`, `icon_status`): None means "not
+    checked yet". The folders a result depends on are watched, and a change in one of them
+    re-checks the targets that live there; `status_changed` fires when a result differs
+    from the cached one.
+    """
+
+    status_changed = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._status = {}  # (kind, key) -> TargetStatus
+        self._pending = set()
+        self._watched = {}  # folder -> {(kind, key)}
+        self._pool = QThreadPool(self)
+        # Few threads: on a slow share every probe can block for a while
+        self._pool.setMaxThreadCount(2)
+        self._signals = CheckSignals(self)
+        self._signals.finished.connect(self._on_finished)
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self._on_directory_changed)
+
+    def command_status(self, command):
+        return self._status.get(("command", command))
+
+    def icon_status(self, path):
+        return self._status.get(("icon", path))
+
+    def problem(self, app_info):
+        """Why the entry is broken (missing command or icon), or None if it is fine or not checked yet."""
+        for status in (self.command_status(app_info.get("command") or ""), self.icon_status(app_info.get("icon") or "")):
+            if status is not None and not status.ok:
+                return status.error
+        return None
+
+    def validate(self, apps):
+        """Queue a check for the targets of `apps` that have no cached result yet."""
+        for app_info in apps:
+            self._queue("command", app_info.get("command") or "")
+            self._queue("icon", app_info.get("icon") or "")
+
+    def invalidate(self, command):
+        """Drop what is known about `command` (a launch just failed on it) and check it again."""
+        self._status.pop(("command", command), None)
+        self._queue("command", command)
+
+    def _queue(self, kind, key, force=False):
+        item = (kind, key)
+        if item in self._pending or (not force and item in self._status):
+            return
+        self._pending.add(item)
+        self._pool.start(CheckTask(kind, key, self._signals))
+
+    def _on_finished(self, kind, key, status):
+        item = (kind, key)
+        self._pending.discard(item)
+        previous = self._status.get(item)
+        self._status[item] = status
+        new_folders = []
+        for folder in status.watch:
+            if not folder:
+                continue
+            dependents = self._watched.get(folder)
+            if dependents is None:
+                dependents = self._watched[folder] = set()
+                new_folders.append(folder)
+            dependents.add(item)
+        if new_folders:
+            self.watcher.addPaths(new_folders)
+        if previous is None or previous.ok != status.ok or previous.target != status.target:
+            self.status_changed.emit()
+
+    def _on_directory_changed(self, folder):
+        for item in self._watched.get(folder, ()):
+            self._queue(*item, force=True)
+
+
+_validator = None
+
+
+def shared_target_validator():
+    global _validator
+    if _validator is None:
+        _validator = TargetValidator(QApplication.instance())
+    return _validator
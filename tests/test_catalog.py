@@ -0,0 +1,77 @@
+from catalog import Catalog
+from persistence import SettingsStore, snapshot_app
+
+
+LEGACY_APPS = [
+    {"name": "Editor", "command": "/usr/bin/editor"},
+    {"id": 7, "name": "Shell", "command": "/bin/sh"},
+    {"id": 7, "name": "Browser", "command": "/usr/bin/browser", "launch_stats": {"count": 3}},
+]
+
+
+def test_ids_are_assigned_to_legacy_entries():
+    catalog = Catalog()
+    assert catalog.load(LEGACY_APPS)
+    # Entries without an id, or with one already taken, get fresh ids after the highest one
+    assert [(app.id, app["name"]) for app in catalog] == [(8, "Editor"), (7, "Shell"), (9, "Browser")]
+    assert catalog.get(9)["launch_stats"] == {"count": 3}
+
+
+def test_migrated_ids_survive_a_round_trip(tmp_path):
+    path = str(tmp_path / "settings.json")
+    store = SettingsStore(path)
+    store.save({"apps": LEGACY_APPS})
+    store.flush()
+
+    catalog = Catalog()
+    assert catalog.load(store.load()["apps"])
+    store.save({"apps": [snapshot_app(app) for app in catalog]})
+    store.close()
+
+    reloaded = Catalog()
+    reopened = SettingsStore(path)
+    assert not reloaded.load(reopened.load()["apps"])
+    assert [app.to_dict() for app in reloaded] == [app.to_dict() for app in catalog]
+    assert reloaded.by_command("/usr/bin/browser") == [reloaded.get(9)]
+    reopened.close()
+
+
+def test_migration_assigns_the_same_ids_on_every_load():
+    first, second = Catalog(), Catalog()
+    first.load(LEGACY_APPS)
+    second.load(LEGACY_APPS)
+    assert [app.id for app in first] == [app.id for app in second]
+
+
+def test_ids_of_removed_entries_are_not_reused_after_a_reload(tmp_path):
+    path = str(tmp_path / "settings.json")
+    catalog = Catalog()
+    catalog.load([{"id": 1, "name": "Editor", "command": "/usr/bin/editor"},
+                  {"id": 2, "name": "Shell", "command": "/bin/sh"}])
+    catalog.remove([catalog.get(2)])
+    store = SettingsStore(path)
+    store.save({"apps": [snapshot_app(app) for app in catalog], "next_id": catalog.next_id})
+    store.close()
+
+    reopened = SettingsStore(path)
+    settings = reopened.load()
+    reopened.close()
+    reloaded = Catalog()
+    reloaded.load(settings["apps"], settings["next_id"])
+    assert reloaded.add({"name": "Browser", "command": "/usr/bin/browser"}).id == 3
+
+
+def test_journaled_add_keeps_its_id_taken(tmp_path):
+    path = str(tmp_path / "settings.json")
+    store = SettingsStore(path, journal=True)
+    store.save({"apps": [{"id": 1, "name": "Editor", "command": "/usr/bin/editor"}], "next_id": 2})
+    store.append({"op": "add", "app": {"id": 2, "name": "Shell", "command": "/bin/sh"}})
+    store.append({"op": "remove", "id": 2})
+    store.close()
+
+    reopened = SettingsStore(path, journal=True)
+    settings = reopened.load()
+    reopened.close()
+    reloaded = Catalog()
+    reloaded.load(settings["apps"], settings["next_id"])
+    assert reloaded.add({"name": "Browser", "command": "/usr/bin/browser"}).id == 3
@@ -0,0 +1,105 @@
+import json
+import os
+import shutil
+import stat
+
+from persistence import SettingsStore, current_umask
+
+
+def open_store(path):
+    store = SettingsStore(str(path), journal=True)
+    return store, store.load()
+
+
+def test_journal_is_replayed_after_a_crash(tmp_path):
+    path = tmp_path / "settings.json"
+    store, _ = open_store(path)
+    store.save({"theme": "light", "apps": [{"id": 1, "name": "Editor", "command": "/usr/bin/editor"}]})
+    assert store.append({"op": "add", "app": {"id": 2, "name": "Shell", "command": "/bin/sh"}})
+    assert store.append({"op": "set", "key": "theme", "value": "dark"})
+    assert store.append({"op": "remove", "id": 1})
+    store.close()
+    # Crashed before any compaction: the JSON still has the old state, the journal the rest
+    with open(path) as f:
+        assert [app["id"] for app in json.load(f)["apps"]] == [1]
+
+    reopened, settings = open_store(path)
+    assert settings["theme"] == "dark"
+    assert [app["id"] for app in settings["apps"]] == [2]
+    assert reopened.journal_length == 3
+    reopened.close()
+
+
+def test_journal_of_a_compacted_generation_is_not_replayed(tmp_path):
+    path = tmp_path / "settings.json"
+    store, _ = open_store(path)
+    store.save({"apps": []})
+    store.append({"op": "add", "app": {"id": 1, "name": "Shell", "command": "/bin/sh"}})
+    store.flush()
+    journal = tmp_path / "journal.copy"
+    shutil.copy(store.journal_path, journal)
+    store.save({"apps": [{"id": 1, "name": "Shell", "command": "/bin/sh"}]})
+    store.close()
+    # Crashed between writing the compacted JSON and removing the journal
+    shutil.copy(journal, store.journal_path)
+
+    reopened, settings = open_store(path)
+    assert [app["id"] for app in settings["apps"]] == [1]
+    assert reopened.journal_length == 0
+    reopened.close()
+
+
+def test_torn_journal_line_is_ignored(tmp_path):
+    path = tmp_path / "settings.json"
+    store, _ = open_store(path)
+    store.save({"apps": []})
+    store.append({"op": "add", "app": {"id": 1, "name": "Shell", "command": "/bin/sh"}})
+    store.close()
+    with open(store.journal_path, "a") as f:
+        f.write('{"generation": 1, "op": {"op": "add", "app": {"id": 2')
+
+    reopened, settings = open_store(path)
+    assert [app["id"] for app in settings["apps"]] == [1]
+    reopened.close()
+
+
+def test_failed_write_is_reported(tmp_path):
+    errors = []
+    # A file where the settings folder should be
+    (tmp_path / "blocked").write_text("")
+    store = SettingsStore(str(tmp_path / "blocked" / "settings.json"), on_error=errors.append)
+    store.save({"apps": []})
+    assert isinstance(store.flush(), OSError)
+    assert len(errors) == 1
+
+    os.unlink(tmp_path / "blocked")
+    store.save({"apps": []})
+    assert store.flush() is None
+    assert errors[1:] == [None]
+    store.close()
+
+
+def test_write_keeps_the_file_mode(tmp_path):
+    path = tmp_path / "settings.json"
+    store = SettingsStore(str(path))
+    store.save({"apps": []})
+    store.flush()
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o666 & ~current_umask()
+
+    os.chmod(path, 0o640)
+    store.save({"apps": [], "theme": "dark"})
+    store.flush()
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o640
+    store.close()
+
+
+def test_unexpected_write_error_is_reported(tmp_path):
+    errors = []
+    store = SettingsStore(str(tmp_path / "settings.json"), on_error=errors.append)
+    store.save({"apps": [object()]})
+    assert isinstance(store.flush(), TypeError)
+    # The writer thread survived it
+    store.save({"apps": []})
+    assert store.flush() is None
+    assert [type(error) for error in errors] == [TypeError, type(None)]
+    store.close()
@@ -0,0 +1,93 @@
+import random
+import threading
+
+from search import SearchIndex, search_keys
+
+
+APPS = [
+    (1, "Terminal", "/usr/bin/gnome-terminal", ("shell",)),
+    (2, "Text Editor", "/usr/bin/gedit", ("text", "editor")),
+    (3, "Steam", "/usr/games/steam", ("games",)),
+    (4, "System Monitor", "/usr/bin/gnome-system-monitor", ()),
+    (5, "Master PDF", "/opt/master/pdf-editor", ("office",)),
+]
+
+
+def make_index(apps=APPS, fuzzy=True):
+    index = SearchIndex(fuzzy=fuzzy)
+    for key, name, command, tags in apps:
+        index.add(key, key, name, command, tags)
+    return index
+
+
+def test_candidates_come_from_the_postings():
+    index = make_index()
+    assert index.candidates("ter") == {1, 5}
+    # Words of the command file name and of the tags are indexed; folders are matched separately
+    assert index.candidates("gedit") == {2}
+    assert index.candidates("games") == {3}
+    assert index.candidates("zzz") == set()
+    # Too short, or spanning a folder and a file name: every entry has to be checked
+    assert index.candidates("te") is None
+    assert index.candidates("games/steam") is None
+
+    index.remove(5)
+    index.add(6, 6, "Terminator", "/usr/bin/terminator", (), search_keys("Terminator", "/usr/bin/terminator", ()))
+    assert index.candidates("ter") == {1, 6}
+    assert index.search("master") == []
+
+
+def test_ranking_tiers():
+    index = make_index()
+    # Name prefixes (shorter names first), then inside the name (earlier first, ties in catalog order)
+    assert index.search("te") == [1, 2, 3, 4, 5]
+    # A word of the name before the command file name; every term has to match
+    assert index.search("edit") == [2, 5]
+    assert index.search("sys mon") == [4]
+    assert index.search("gnome") == [1, 4]
+
+
+def test_fuzzy_matches_only_when_few_entries_contain_the_query():
+    index = make_index()
+    assert index.search("tmnl") == [1]
+    assert make_index(fuzzy=False).search("tmnl") == []
+    # Terminal has s, t and e in its command path, after the entries that contain "ste"
+    assert index.search("ste") == [3, 4, 5, 1]
+
+    crowded = make_index(APPS + [(100 + i, f"Stealth {i}", f"/usr/games/stealth{i}", ()) for i in range(60)])
+    assert 1 not in crowded.search("ste")
+    assert crowded.search("tmnl") == [1]
+
+
+def test_narrowed_queries_match_a_fresh_search():
+    rng = random.Random(3)
+    words = ["term", "edit", "stea", "mon", "sys", "text", "game", "tool", "pdf", "shell"]
+    apps = [(i, " ".join(rng.sample(words, rng.randint(1, 3))), f"/usr/bin/{rng.choice(words)}{i}",
+             tuple(rng.sample(words, rng.randint(0, 2)))) for i in range(300)]
+    index = make_index(apps)
+    for query in ["t", "te", "ter", "term", "term e", "term ed", "s", "sy", "syx", "syxt"]:
+        assert index.search(query) == make_index(apps).search(query), query
+
+
+def test_boost_and_cancel():
+    index = make_index()
+    assert index.search("te", boost={4: 1000}) == [4, 1, 2, 3, 5]
+    assert index.search("te", cancelled=lambda: True) is None
+
+
+def test_search_does_not_hold_the_lock_while_matching():
+    index = make_index()
+    results = []
+
+    def add_while_searching():
+        # `cancelled` is polled outside the lock; adding from it would deadlock otherwise
+        if len(index) == len(APPS):
+            index.add(9, 9, "Tetris", "/usr/games/tetris", ())
+        return False
+
+    thread = threading.Thread(target=lambda: results.append(index.search("te", add_while_searching)), daemon=True)
+    thread.start()
+    thread.join(5)
+    assert not thread.is_alive()
+    assert 9 in index
+    assert results == [[1, 2, 3, 4, 5]]
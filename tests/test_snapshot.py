@@ -0,0 +1,85 @@
+import json
+import os
+
+from persistence import SettingsStore
+from snapshot import CatalogSnapshot, snapshot_path, source_signature
+
+
+SETTINGS = {"theme": "dark", "catalog_snapshot": True,
+            "apps": [{"id": 1, "name": "Editor", "command": "/usr/bin/editor", "tags": ["text"]}]}
+
+
+def saved_store(tmp_path):
+    path = str(tmp_path / "settings.json")
+    store = SettingsStore(path, snapshot=True)
+    store.save(SETTINGS)
+    store.flush()
+    return path, store
+
+
+def reload(path):
+    store = SettingsStore(path, snapshot=True)
+    settings = store.load()
+    keys = store.take_search_keys()
+    store.close()
+    return settings, keys
+
+
+def test_snapshot_round_trip(tmp_path):
+    path, store = saved_store(tmp_path)
+    store.close()
+    assert os.path.exists(snapshot_path(path))
+
+    settings, keys = reload(path)
+    assert settings["apps"] == SETTINGS["apps"]
+    assert settings["theme"] == "dark"
+    # Search keys only come from the snapshot
+    assert keys[1][:3] == ("Editor", "/usr/bin/editor", ("text",))
+
+
+def test_snapshot_of_a_hand_edited_file_is_rejected(tmp_path):
+    path, store = saved_store(tmp_path)
+    store.close()
+    stat = os.stat(path)
+    with open(path) as f:
+        text = f.read()
+    # Same size, so only the modification time gives the edit away
+    with open(path, "w") as f:
+        f.write(text.replace('"Editor"', '"Writer"'))
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert os.path.getsize(path) == stat.st_size
+
+    settings, keys = reload(path)
+    assert settings["apps"][0]["name"] == "Writer"
+    assert keys == {}
+
+    # The snapshot was rebuilt from the edited file and is used again
+    settings, keys = reload(path)
+    assert settings["apps"][0]["name"] == "Writer"
+    assert keys[1][0] == "Writer"
+
+
+def test_snapshot_of_another_file_version_does_not_open(tmp_path):
+    path, store = saved_store(tmp_path)
+    store.close()
+    signature = source_signature(os.stat(path))
+    snapshot = CatalogSnapshot(snapshot_path(path))
+    assert snapshot.open(signature)
+    snapshot.close()
+    assert not snapshot.open((signature[0], signature[1] + 1))
+
+    with open(snapshot_path(path), "r+b") as f:
+        f.truncate(os.path.getsize(snapshot_path(path)) // 2)
+    assert not CatalogSnapshot(snapshot_path(path)).open(signature)
+    settings, _ = reload(path)
+    assert settings["apps"] == SETTINGS["apps"]
+
+
+def test_snapshot_is_removed_when_turned_off(tmp_path):
+    path, store = saved_store(tmp_path)
+    store.snapshot = False
+    store.save(dict(SETTINGS, catalog_snapshot=False))
+    store.close()
+    assert not os.path.exists(snapshot_path(path))
+    with open(path) as f:
+        assert json.load(f)["catalog_snapshot"] is False
@@ -0,0 +1,199 @@
+import json
+import os
+
+from PyQt5.QtGui import QColor, QPalette
+
+from icons import glyph_icon
+
+
+BUILTIN_THEMES = {
+    "light": {
+        "background": "rgba(245, 245, 245, 220)",
+        "text": "#333333",
+        "search_background": "rgba(255, 255, 255, 220)",
+        "dialog_background": "#f0f0f0",
+        "input_background": "white",
+        "input_border": "#ccc",
+        "button": "#e0e0e0",
+        "button_hover": "#d0d0d0",
+        "menu_background": "white",
+        "menu_text": "black",
+        "menu_border": "#ccc",
+        "menu_selected": "#d0d0d0",
+    },
+    "dark": {
+        "background": "rgba(50, 50, 50, 200)",
+        "text": "#d3d3d3",
+        "search_background": "rgba(60, 60, 60, 220)",
+        "dialog_background": "#2e2e2e",
+        "input_background": "#3e3e3e",
+        "input_border": "#555",
+        "button": "#555555",
+        "button_hover": "#666666",
+        "menu_background": "#2e2e2e",
+        "menu_text": "#d3d3d3",
+        "menu_border": "#555555",
+        "menu_selected": "#555555",
+    },
+}
+
+# Header glyphs, rendered in the theme's text color
+GLYPHS = {"theme": "fa.lightbulb-o", "close": "fa.close", "add": "fa.plus"}
+
+# One sheet for the whole window; menus and dialogs opened from it inherit it
+STYLESHEET = """
+* {{
+    background-color: {background};
+    border-radius: 15px;
+}}
+QLabel {{
+    color: {text};
+}}
+QLabel#title_label {{
+    background-color: transparent;
+}}
+QLineEdit#search_bar {{
+    padding: 10px;
+    font-size: 18px;
+    background-color: {search_background};
+    color: {text};
+    border-radius: 10px;
+}}
+#icon_scroll, #icon_viewport, #icon_container {{
+    background-color: transparent;
+}}
+QPushButton#header_button, AppIcon {{
+    background-color: transparent;
+    border: none;
+}}
+QMenu {{
+    background-color: {menu_background};
+    color: {menu_text};
+    border: 1px solid {menu_border};
+    border-radius: 0px;
+}}
+QMenu::item:selected {{
+    background-color: {menu_selected};
+}}
+QMenu::separator {{
+    height: 1px;
+    background-color: {menu_border};
+    margin-left: 5px;
+    margin-right: 5px;
+}}
+QDialog {{
+    background-color: {dialog_background};
+    color: {text};
+    border-radius: 10px;
+}}
+QDialog QLabel {{
+    color: {text};
+}}
+QDialog QLineEdit {{
+    background-color: {input_background};
+    color: {text};
+    border: 1px solid {input_border};
+    border-radius: 5px;
+    padding: 5px;
+}}
+QDialog QPushButton {{
+    background-color: {button};
+    color: {text};
+    border: none;
+    padding: 8px 16px;
+    border-radius: 5px;
+}}
+QDialog QPushButton:hover {{
+    background-color: {button_hover};
+}}
+"""
+
+
+class Theme:
+    """
+    A theme compiled once: its stylesheet, palette and header icons are built on first use
+    and then shared by every window, menu and dialog using it.
+    """
+
+    def __init__(self, name, colors):
+        self.name = name
+        self.colors = colors
+        self._stylesheet = None
+        self._palette = None
+        self._icons = None
+
+    @property
+    def stylesheet(self):
+        if self._stylesheet is None:
+            self._stylesheet = STYLESHEET.format(**self.colors)
+        return self._stylesheet
+
+    @property
+    def palette(self):
+        if self._palette is None:
+            palette = QPalette()
+            for role, key in ((QPalette.Window, "dialog_background"), (QPalette.WindowText, "text"),
+                              (QPalette.Base, "input_background"), (QPalette.Text, "text"),
+                              (QPalette.Button, "button"), (QPalette.ButtonText, "text"),
+                              (QPalette.Highlight, "menu_selected")):
+                color = QColor(self.colors[key])
+                if color.isValid():
+                    palette.setColor(role, color)
+            self._palette = palette
+        return self._palette
+
+    @property
+    def icons(self):
+        if self._icons is None:
+            self._icons = {key: glyph_icon(glyph, self.colors["text"]) for key, glyph in GLYPHS.items()}
+        return self._icons
+
+
+_themes = {name: Theme(name, colors) for name, colors in BUILTIN_THEMES.items()}
+
+
+def load_theme_files(directory):
+    """
+    Register the user themes found in `directory` (*.json); returns their names.
+
+    A theme file holds {"name": ..., "base": "dark", "colors": {...}}: colors it leaves out
+    come from the base theme (light by default), the name defaults to the file name.
+    """
+    names = []
+    try:
+        filenames = sorted(os.listdir(directory))
+    except OSError:
+        return names
+    for filename in filenames:
+        if not filename.endswith(".json"):
+            continue
+        try:
+            with open(os.path.join(directory, filename), "r", encoding="utf-8") as f:
+                data = json.load(f)
+            name = str(data.get("name") or filename[:-len(".json")])
+            colors = dict(BUILTIN_THEMES.get(data.get("base"), BUILTIN_THEMES["light"]))
+            colors.update({key: str(value) for key, value in (data.get("colors") or {}).items()
+                           if key in colors})
+        except (OSError, ValueError, AttributeError):
+            continue
+        if name in BUILTIN_THEMES:
+            continue
+        previous = _themes.get(name)
+        if previous is None or previous.colors != colors:
+            _themes[name] = Theme(name, colors)
+        names.append(name)
+    return names
+
+
+def theme_names():
+    return list(_themes)
+
+
+def get_theme(name):
+    """The compiled theme called `name`, falling back to the light theme."""
+    return _themes.get(name) or _themes["light"]
+
+
+def next_theme(name):
+    names = theme_names()
+    return names[(names.index(name) + 1) % len(names)] if name in names else names[0]
@@ -0,0 +1,174 @@
+import os
+import statistics
+import sys
+import threading
+import time
+
+from background import BackgroundJob
+from launch_engine import classify_command
+
+
+TOP_N = 5
+BUDGET_MB = 256
+
+
+def lower_thread_priority():
+    """Give the calling thread the lowest CPU priority, where threads have their own (Linux)."""
+    if sys.platform.startswith("linux"):
+        try:
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 19)
+        except (AttributeError, OSError):
+            pass
+
+
+def system_busy():
+    """Whether the machine has more runnable work than half its CPUs, where the load average is known."""
+    try:
+        return os.getloadavg()[0] > (os.cpu_count() or 1) / 2
+    except (AttributeError, OSError):
+        return False
+
+
+def warm_targets(command, icon):
+    """The files a launch of `command` reads first: the program itself and the icon file."""
+    paths = []
+    if command:
+        kind, target = classify_command(command)
+        if kind == "executable":
+            paths.append(target)
+    if icon and os.path.isfile(icon):
+        paths.append(icon)
+    return paths
+
+
+def record_warm_launch(app_info, result, warm):
+    """
+    Fold a spawn time into the warm or cold average of the app's "launch_stats" (replaced,
+    like record_launch does), so warmed launches can be compared with the others per app.
+    """
+    if not result.ok:
+        return
+    stats = dict(app_info.get("launch_stats") or {})
+    prefix = "warm" if warm else "cold"
+    count = stats.get(f"{prefix}_count", 0) + 1
+    average = stats.get(f"{prefix}_spawn_ms", result.spawn_ms)
+    stats[f"{prefix}_count"] = count
+    stats[f"{prefix}_spawn_ms"] = round(average + (result.spawn_ms - average) / count, 2)
+    app_info["launch_stats"] = stats
+
+
+def warmup_report(apps):
+    """
+    Compare warmed with cold launches over the apps that have both: returns a dict with the
+    per-app averages (most improved first) and the median saving in ms.
+    """
+    rows = []
+    for app_info in apps:
+        stats = app_info.get("launch_stats") or {}
+        if stats.get("warm_count") and stats.get("cold_count"):
+            rows.append({"name": app_info.get("name", ""), "cold_ms": stats["cold_spawn_ms"],
+                         "warm_ms": stats["warm_spawn_ms"], "cold_count": stats["cold_count"],
+                         "warm_count": stats["warm_count"],
+                         "saved_ms": round(stats["cold_spawn_ms"] - stats["warm_spawn_ms"], 2)})
+    rows.sort(key=lambda row: -row["saved_ms"])
+    return {"apps": rows, "median_saved_ms": statistics.median(row["saved_ms"] for row in rows) if rows else None}
+
+
+class WarmupService(BackgroundJob):
+    """
+    Pre-reads the files of the apps most likely to be launched next into the page cache.
+
+    `request(targets)` takes (command, icon) pairs, most likely first, and warms them on a
+    background thread at the lowest priority: with posix_fadvise(WILLNEED) where available,
+    else by reading the file. A pass reads at most `budget_mb`, throttled to RATE_MB_PER_S,
+    and is skipped while the machine is busy. Files warmed less than WARM_TTL ago (and not
+    modified since) are not read again, and `is_warm(command)` tells whether a launch of
+    `command` now would find its files warmed.
+    """
+
+    # Pieces a file is advised or read in, with a pause between them to keep to the rate
+    CHUNK_BYTES = 8 * 1024 * 1024
+    RATE_MB_PER_S = 64
+    # After this long the page cache may well have dropped a warmed file
+    WARM_TTL = 20 * 60
+    THREAD_NAME = "warmup"
+
+    def __init__(self, budget_mb=BUDGET_MB):
+        super().__init__()
+        self.budget_mb = budget_mb
+        self.warmed_bytes = 0  # read by the last pass
+        self._warmed_files = {}  # path -> (mtime, monotonic time warmed)
+        self._warmed_commands = {}  # command -> monotonic time all its files were warm
+        self._lock = threading.Lock()
+
+    def request(self, targets):
+        """Start a warm-up pass over `targets` unless one is running; returns whether one was started."""
+        with self._lock:
+            if self.running:
+                return False
+            self.start(list(targets))
+        return True
+
+    def is_warm(self, command):
+        warmed = self._warmed_commands.get(command)
+        return warmed is not None and time.monotonic() - warmed < self.WARM_TTL
+
+    def _run(self, targets):
+        lower_thread_priority()
+        if system_busy():
+            return
+        budget = self.budget_mb * 1024 * 1024
+        self.warmed_bytes = 0
+        for command, icon in targets:
+            if self._cancelled.is_set():
+                break
+            paths = warm_targets(command, icon)
+            complete = bool(paths)
+            for path in paths:
+                try:
+                    size = self._warm_file(path, budget - self.warmed_bytes)
+                except OSError:
+                    size = None
+                if size is None:
+                    complete = False
+                else:
+                    self.warmed_bytes += size
+            if complete:
+                self._warmed_commands[command] = time.monotonic()
+            if self.warmed_bytes >= budget:
+                break
+
+    def _warm_file(self, path, budget):
+        """Warm one file; returns the bytes read (0 if it was still warm), or None if it did not fit."""
+        stat = os.stat(path)
+        warmed = self._warmed_files.get(path)
+        if warmed is not None and warmed[0] == stat.st_mtime_ns and time.monotonic() - warmed[1] < self.WARM_TTL:
+            return 0
+        if stat.st_size > budget:
+            return None
+        with open(path, "rb") as f:
+            offset = 0
+            while offset < stat.st_size:
+                if self._cancelled.is_set():
+                    return None
+                length = min(self.CHUNK_BYTES, stat.st_size - offset)
+                if hasattr(os, "posix_fadvise"):
+                    os.posix_fadvise(f.fileno(), offset, length, os.POSIX_FADV_WILLNEED)
+                else:
+                    f.seek(offset)
+                    f.read(length)
+                offset += length
+                self._cancelled.wait(length / (self.RATE_MB_PER_S * 1024 * 1024))
+        self._warmed_files[path] = (stat.st_mtime_ns, time.monotonic())
+        return stat.st_size
+
+
+_shared_service = None
+
+
+def shared_warmup_service():
+    """One service for the whole process: the page cache and the disk are shared by every instance."""
+    global _shared_service
+    if _shared_service is None:
+        _shared_service = WarmupService()
+    return _shared_service